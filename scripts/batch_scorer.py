@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Batch Scorer - Score the whole catalog as columns instead of tool by tool
+Strings and dates are parsed once per distinct value and the arithmetic runs
+as NumPy array operations. Without NumPy the scorer stays on score_tool, which
+is faster than any pure-Python column pass. Results are identical to
+scorer.score_tool, down to int vs float.
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+try:
+    import numpy as np
+except ImportError:  # Only the batch path needs it; see HAVE_NUMPY
+    np = None
+
+import scorer
+from catalog import as_tool
+from signal_index import SignalIndex
+
+STATES = ("ACTIVE", "WATCHLIST", "GRAVEYARD")
+HAVE_NUMPY = np is not None   # scorer only batches when this is set
+
+class Columns:
+    """Per-tool scoring inputs, one list per attribute"""
+
+    def __init__(self, size=0):
+        self.has_repo = [False] * size
+        self.stars = [0] * size
+        self.recency = [0] * size     # +20 / +10 / 0 for repo updated_at
+        self.has_story = [False] * size
+        self.hn_score = [0] * size
+        self.commits = [0] * size     # Velocity over scorer.VELOCITY_WINDOW days
+        self.stars_gained = [0] * size
+        self.mentions = [0] * size
+        self.decay = [0] * size       # 50 / 25 / 0 for last_signal_date
+        self.relevance = [0] * size   # Already summed; relevance is all ints
+
+    def __len__(self):
+        return len(self.stars)
+
+def _memo(fn):
+    cache = {}
+    def lookup(value):
+        if value not in cache:
+            cache[value] = fn(value)
+        return cache[value]
+    return lookup
+
+def recency_points(now):
+    """Memoized repo updated_at -> recency bonus (20 / 10 / 0) as of now"""
+    def points(updated):
+        if not updated:
+            return 0
+        try:
+            updated_date = datetime.fromisoformat(updated.replace("Z", "+00:00"))
+        except ValueError:
+            return 0
+        reference = now.astimezone(updated_date.tzinfo) if updated_date.tzinfo else now.replace(tzinfo=None)
+        days_ago = (reference - updated_date).days
+        return 20 if days_ago < 7 else 10 if days_ago < 30 else 0
+    return _memo(points)
+
+def decay_points(now):
+    """Memoized last_signal_date -> inactivity penalty (50 / 25 / 0) as of now"""
+    def points(last_signal):
+        if not last_signal:
+            return 0
+        try:
+            last_date = datetime.fromisoformat(last_signal)
+            days_inactive = (now.replace(tzinfo=None) - last_date).days
+        except (TypeError, ValueError):
+            return 0
+        return 50 if days_inactive > 60 else 25 if days_inactive > 30 else 0
+    return _memo(points)
+
+def extract_columns(tools, index, now=None, velocity=None):
+    """Match signals and flatten every tool's scoring inputs into Columns
+
+    `velocity` is {tool id: SignalWindows.velocity()}; tools missing from it have none.
+    """
+    now = (now or datetime.now()).astimezone()
+    recency, decay = recency_points(now), decay_points(now)
+    high_value, hot_tags, pricing_points = set(scorer.HIGH_VALUE_CATEGORIES), set(scorer.HOT_TAGS), scorer.PRICING_POINTS
+
+    cols = Columns(len(tools))
+    for i, tool in enumerate(tools):
+        tool = as_tool(tool)
+        repo, _ = index.match_github(tool)
+        if repo is not None:
+            cols.has_repo[i] = True
+            cols.stars[i] = repo.get("stars", 0)
+            cols.recency[i] = recency(repo.get("updated_at", ""))
+        story, _ = index.match_hackernews(tool)
+        if story is not None:
+            cols.has_story[i] = True
+            cols.hn_score[i] = story.get("score", 0)
+        tool_velocity = velocity.get(tool.get("id")) if velocity else None
+        if tool_velocity:
+            cols.commits[i] = tool_velocity.get("commits", 0)
+            cols.stars_gained[i] = tool_velocity.get("stars_gained", 0)
+            cols.mentions[i] = tool_velocity.get("twitter_mentions", 0)
+        cols.decay[i] = decay(tool.get("last_signal_date"))
+
+        if tool.get("state") == "ACTIVE":
+            state_points = 25
+        else:
+            state_points = 0 if tool.waitlist else 20
+        cols.relevance[i] = min(100, (25 if tool.get("category") in high_value else 15)
+                                + pricing_points[tool.tier]
+                                + (10 if not hot_tags.isdisjoint(tool.get("tags", [])) else 0)
+                                + state_points)
+    return cols
+
+def score_columns(cols):
+    """[(activity, relevance, combined, state)] in column order; needs NumPy"""
+    has_repo = np.array(cols.has_repo, dtype=bool)
+    has_story = np.array(cols.has_story, dtype=bool)
+    star_points = np.array(cols.stars, dtype=np.float64) / 1000
+    hn_points = np.array(cols.hn_score, dtype=np.float64) / 10
+    commits = np.array(cols.commits, dtype=np.int64)
+    gained_points = np.array(cols.stars_gained, dtype=np.float64) / 100
+    mentions = np.array(cols.mentions, dtype=np.int64)
+
+    # Same operation order as calculate_activity_score, so floats match bit for bit
+    activity = (50.0 + np.where(has_repo, np.minimum(star_points, 25), 0.0)
+                + np.array(cols.recency, dtype=np.float64)
+                + np.where(has_story, np.minimum(hn_points, 35), 0.0)
+                + np.where(commits > 10, 25.0, np.where(commits > 0, commits * 2.5, 0.0))
+                + np.where(gained_points > 0, np.minimum(gained_points, 20), 0.0)
+                + np.where(mentions > 0, np.minimum(mentions * 15, 45), 0).astype(np.float64)
+                - np.array(cols.decay, dtype=np.float64))
+    # Python's min()/max() hand back the int bound when it wins (ties included)
+    is_int = ((~has_repo | (star_points > 25)) & (~has_story | (hn_points > 35))
+              & ((commits <= 0) | (commits > 10)) & ((gained_points <= 0) | (gained_points > 20))
+              | (activity >= 100) | (activity <= 0))
+    activity = np.clip(activity, 0, 100)
+
+    relevance = np.array(cols.relevance, dtype=np.int64)
+    combined = activity * 0.6 + relevance * 0.4
+    state = np.where(combined >= scorer.ACTIVE_THRESHOLD, 0,
+                     np.where(combined >= scorer.WATCHLIST_THRESHOLD, 1, 2))
+
+    activity_values = [int(a) if i else a for a, i in zip(activity.tolist(), is_int.tolist())]
+    return list(zip(activity_values, relevance.tolist(), combined.tolist(),
+                    [STATES[s] for s in state.tolist()]))
+
+def score_batch(tools, sources, index=None, now=None, velocity=None):
+    """Batch equivalent of [scorer.score_tool(t, sources, index, velocity[t["id"]]) for t in tools]"""
+    if index is None:
+        index = SignalIndex(tools, sources)
+    return score_columns(extract_columns(tools, index, now, velocity))
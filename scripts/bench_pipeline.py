@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Pipeline Benchmarks - Time catalog, scoring, history and search internals at scale
+One subcommand per area, on synthetic data; correctness checks live in tests/
+"""
+
+import argparse
+import gzip
+import json
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import batch_scorer
+import scorer
+from catalog import TOOLS_FILE, Catalog, normalize, parse_date, pricing_tier, registered_domain
+from fuzzy_index import load_aliases
+from generator_elite import CATEGORIES
+from history import HistoryStore
+from search_index import SEARCH_WORKER, build_index
+from signal_index import SignalIndex
+from signal_ledger import SignalLedger
+from signal_windows import SignalWindows
+from storage import SQLiteStorage
+from synthetic import synthetic_catalog, synthetic_data, synthetic_queries, synthetic_rows
+
+# Runs the worker's match() outside a browser and prints per-query times
+NODE_BENCH = """
+const fs = require('fs');
+const [src, indexPath, queriesPath] = process.argv.slice(2);
+const worker = new Function('fetch', 'postMessage', fs.readFileSync(src, 'utf8') + '\\nreturn { load, match };')();
+worker.load(JSON.parse(fs.readFileSync(indexPath, 'utf8')));
+const queries = JSON.parse(fs.readFileSync(queriesPath, 'utf8'));
+for (let i = 0; i < 3; i++) queries.forEach(q => worker.match(q));   // Warm up the JIT
+console.log(JSON.stringify(queries.map(q => {
+    const start = process.hrtime.bigint();
+    worker.match(q);
+    return Number(process.hrtime.bigint() - start) / 1e6;
+})));
+"""
+
+def bench_scoring(args):
+    """Per-tool scoring vs the batch engine, on the real catalog and a synthetic one"""
+    print(f"\n⏱  SCORING - {'numpy ' + batch_scorer.np.__version__ if batch_scorer.HAVE_NUMPY else 'no numpy'}")
+    print("=" * 50)
+    if not batch_scorer.HAVE_NUMPY:
+        print("  ⚠ NumPy not installed - timing per-tool scoring only")
+
+    tools, sources, velocity = synthetic_catalog(args.tools)
+    catalogs = [("catalog", scorer.load_tools().tools, scorer.load_sources(), {}),
+                ("synthetic", Catalog.from_dict({"tools": tools}).tools, sources, velocity)]
+    for label, tools, sources, velocity in catalogs:
+        index = SignalIndex(tools, sources, load_aliases() if label == "catalog" else None)
+        started = time.perf_counter()
+        for tool in tools:
+            scorer.score_tool(tool, sources, index, velocity.get(tool["id"]))
+        per_tool = time.perf_counter() - started
+        line = f"  {label} ({len(tools)} tools): per-tool {per_tool:.3f}s"
+        if batch_scorer.HAVE_NUMPY:
+            started = time.perf_counter()
+            cols = batch_scorer.extract_columns(tools, index, velocity=velocity)
+            extracted = time.perf_counter() - started
+            batch_scorer.score_columns(cols)
+            total = time.perf_counter() - started
+            line += f", batch {total:.3f}s (columns {extracted:.3f}s, arithmetic {total - extracted:.3f}s)"
+        print(line)
+
+def hot_loop_dicts(tools):
+    """What scorer and generators each redo per dict: rank, names, dates, domains, tiers"""
+    ranked = sorted(tools, key=lambda x: x.get("scores", {}).get("combined", 0), reverse=True)
+    for tool in ranked:
+        normalize(tool.get("name"))
+        tool.get("name", "").lower()
+        parse_date(tool.get("last_signal_date"))
+        registered_domain(tool.get("url") or "")
+        pricing_tier(tool.get("pricing", ""))
+
+def hot_loop_tools(tools):
+    ranked = sorted(tools, key=lambda x: x.combined, reverse=True)
+    for tool in ranked:
+        tool.name_key
+        tool.name_lower
+        tool.last_signal
+        tool.domain
+        tool.tier
+
+def measure(build):
+    tracemalloc.start()
+    started = time.perf_counter()
+    value = build()
+    elapsed = time.perf_counter() - started
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return value, elapsed, size
+
+def bench_catalog(args):
+    """Load time, memory and a scorer-like hot loop: plain dicts vs slotted Tools"""
+    print(f"\n⏱  CATALOG - {args.tools} tools, {args.passes} passes")
+    print("=" * 50)
+    raw = json.dumps(synthetic_data(args.tools))
+    dicts, dict_load, dict_mem = measure(lambda: json.loads(raw)["tools"])
+    catalog, tool_load, tool_mem = measure(lambda: Catalog.from_dict(json.loads(raw)))
+    print(f"  {'':<8}{'load s':>9}{'memory MB':>11}{'hot loop s':>12}")
+    for label, items, hot_loop, load, mem in (("dicts", dicts, hot_loop_dicts, dict_load, dict_mem),
+                                              ("Tool", catalog.tools, hot_loop_tools, tool_load, tool_mem)):
+        started = time.perf_counter()
+        for _ in range(args.passes):
+            hot_loop(items)
+        print(f"  {label:<8}{load:>9.2f}{mem / 1e6:>11.1f}{time.perf_counter() - started:>12.2f}")
+
+def bench_storage(args):
+    """Import into SQLite, then one-tool upserts with the tools.json export"""
+    print("\n⏱  STORAGE - sqlite")
+    print("=" * 50)
+    workdir = Path(tempfile.mkdtemp(prefix="catalog-db-"))
+    tools_file = workdir / "tools.json"
+    tools_file.write_text(TOOLS_FILE.read_text())
+    db = SQLiteStorage(workdir / "catalog.db", tools_file)
+    started = time.perf_counter()
+    db.save(db.load())
+    print(f"  ℹ Import + export: {(time.perf_counter() - started) * 1000:.1f}ms")
+    started = time.perf_counter()
+    for n in range(args.upserts):
+        catalog = db.load()
+        tool = catalog.tools[n % len(catalog.tools)]
+        tool["scores"] = dict(tool.get("scores") or {}, combined=99.9)
+        db.save(catalog, changed=[tool])
+    elapsed = (time.perf_counter() - started) / args.upserts
+    print(f"  ℹ One-tool upsert + export: {elapsed * 1000:.1f}ms")
+    db.close()
+
+def bench_history(args):
+    """Segment size and write time per day, then a snapshot and a one-tool series"""
+    print(f"\n📚 HISTORY - {args.tools} tools × {args.days} days")
+    print("=" * 50)
+    workdir = Path(tempfile.mkdtemp(prefix="history-"))
+    try:
+        store = HistoryStore(workdir)
+        days = [str(date(2026, 1, 1) + timedelta(days=n)) for n in range(args.days)]
+        size = 0
+        started = time.perf_counter()
+        for day in days:
+            rows = synthetic_rows(args.tools, day)
+            size += store.record(day, rows)
+        elapsed = time.perf_counter() - started
+        print(f"  ℹ Wrote {args.days} segments in {elapsed:.2f}s, "
+              f"{size / args.days / 1e6:.2f}MB per day (JSON: {len(json.dumps(rows)) / 1e6:.2f}MB)")
+
+        store = HistoryStore(workdir)
+        started = time.perf_counter()
+        store.snapshot(days[len(days) // 2])
+        print(f"  ℹ Snapshot of one day: {time.perf_counter() - started:.2f}s")
+        started = time.perf_counter()
+        series = store.series(f"tool-{args.tools * 2 // 3}")
+        print(f"  ℹ Series for one tool over {len(series)} days: {(time.perf_counter() - started) * 1000:.1f}ms")
+    finally:
+        shutil.rmtree(workdir)
+
+def bench_windows(args):
+    """Daily count updates for every tenth tool, then a 30-day velocity for each"""
+    print(f"\n📈 SIGNAL WINDOWS - {args.tools} tools, {args.days} days")
+    print("=" * 50)
+    rng = random.Random(7)
+    windows = SignalWindows(Path(tempfile.mkdtemp(prefix="windows-")) / "signal_windows.json")
+    active = [f"tool-{n}" for n in range(0, args.tools, 10)]
+    start = date(2026, 1, 1)
+    started = time.perf_counter()
+    for n in range(args.days):
+        windows.advance(start + timedelta(days=n))
+        for tool_id in active:
+            windows.set_count(tool_id, "commits", rng.randint(0, 5))
+    elapsed = time.perf_counter() - started
+    per_update = elapsed / (args.days * len(active)) * 1e6
+    print(f"  ℹ {args.days * len(active)} updates in {elapsed:.2f}s ({per_update:.2f}µs each)")
+
+    started = time.perf_counter()
+    for tool_id in active:
+        windows.velocity(tool_id)
+    print(f"  ℹ 30-day velocity for {len(active)} tools in {(time.perf_counter() - started) * 1000:.1f}ms")
+
+def bench_ledger(args):
+    """Daily runs that reopen the ledger, record a day's signals and flush (compacting as it goes)"""
+    print(f"\n🧾 SIGNAL LEDGER - {args.tools} tools, {args.days} days")
+    print("=" * 50)
+    workdir = Path(tempfile.mkdtemp(prefix="ledger-"))
+    path, index_path = workdir / "signals.jsonl", workdir / "signals_index.json"
+    rng = random.Random(3)
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    started = time.perf_counter()
+    for n in range(args.days):
+        now = start + timedelta(days=n)
+        ledger = SignalLedger(path, index_path)
+        for tool in rng.sample(range(args.tools), args.tools // 20):
+            at = (now - timedelta(hours=rng.randint(0, 48))).strftime("%Y-%m-%dT%H:%M:%SZ")
+            ledger.record(f"tool-{tool}", rng.choice(["github", "hackernews", "producthunt", "twitter"]), at)
+        ledger.flush(now)
+    elapsed = time.perf_counter() - started
+    print(f"  ℹ {args.days} daily runs in {elapsed:.2f}s, ledger {path.stat().st_size / 1e6:.1f}MB after compaction")
+    index_path.unlink()
+    started = time.perf_counter()
+    SignalLedger(path, index_path)
+    print(f"  ℹ Index rebuilt from the ledger in {(time.perf_counter() - started) * 1000:.0f}ms")
+    shutil.rmtree(workdir)
+
+def bench_search(args):
+    """Index build time and size, then the worker's per-keystroke query time under node"""
+    print(f"\n🔎 SEARCH INDEX - {args.tools} tools")
+    print("=" * 50)
+    tools = synthetic_data(args.tools)["tools"]
+    started = time.perf_counter()
+    index = build_index(tools, CATEGORIES)
+    text = json.dumps(index, separators=(",", ":"))
+    elapsed = time.perf_counter() - started
+    print(f"  ℹ Built in {elapsed * 1000:.0f}ms: {len(index['words'])} words, "
+          f"{len(text) / 1e6:.2f}MB ({len(gzip.compress(text.encode())) / 1e6:.2f}MB gzipped)")
+
+    node = shutil.which("node")
+    if node is None:
+        print("  ⚠ node not found - skipping the worker timing")
+        return
+    workdir = Path(tempfile.mkdtemp(prefix="search-"))
+    (workdir / "worker.js").write_text(SEARCH_WORKER)
+    (workdir / "index.json").write_text(text)
+    (workdir / "queries.json").write_text(json.dumps(synthetic_queries(tools, index["words"])))
+    (workdir / "bench.js").write_text(NODE_BENCH)
+    times = sorted(json.loads(subprocess.run(
+        [node, workdir / "bench.js", workdir / "worker.js", workdir / "index.json", workdir / "queries.json"],
+        capture_output=True, text=True, check=True).stdout))
+    shutil.rmtree(workdir)
+    print(f"  ℹ Worker query time: median {times[len(times) // 2]:.2f}ms, "
+          f"p99 {times[int(len(times) * 0.99)]:.2f}ms, worst {times[-1]:.2f}ms (budget 16ms)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pipeline internals on synthetic data")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    scoring = sub.add_parser("scoring", help="Per-tool vs batch scoring")
+    scoring.add_argument("--tools", type=int, default=100000, help="Synthetic catalog size")
+    scoring.set_defaults(run=bench_scoring)
+
+    catalog = sub.add_parser("catalog", help="Plain dicts vs slotted Tool records")
+    catalog.add_argument("--tools", type=int, default=100000)
+    catalog.add_argument("--passes", type=int, default=3, help="Hot-loop passes (pipeline stages)")
+    catalog.set_defaults(run=bench_catalog)
+
+    storage = sub.add_parser("storage", help="SQLite import and per-tool upserts")
+    storage.add_argument("--upserts", type=int, default=20)
+    storage.set_defaults(run=bench_storage)
+
+    history = sub.add_parser("history", help="Columnar history writes and reads")
+    history.add_argument("--tools", type=int, default=100000)
+    history.add_argument("--days", type=int, default=14)
+    history.set_defaults(run=bench_history)
+
+    windows = sub.add_parser("windows", help="Rolling signal window updates and reads")
+    windows.add_argument("--tools", type=int, default=100000)
+    windows.add_argument("--days", type=int, default=120)
+    windows.set_defaults(run=bench_windows)
+
+    ledger = sub.add_parser("ledger", help="Signal ledger daily runs and index rebuild")
+    ledger.add_argument("--tools", type=int, default=10000)
+    ledger.add_argument("--days", type=int, default=250)
+    ledger.set_defaults(run=bench_ledger)
+
+    search = sub.add_parser("search", help="Search index build and worker query time")
+    search.add_argument("--tools", type=int, default=10000)
+    search.set_defaults(run=bench_search)
+
+    args = parser.parse_args()
+    args.run(args)
+
+if __name__ == "__main__":
+    main()
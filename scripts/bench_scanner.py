@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Scanner Benchmark - Drive run_scan against the replay stand-in at scale
+Reports wall time, requests/s, retries and peak memory per source
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import github_client
+import manifest
+import scanner
+from http_cache import ResponseCache
+from rate_limit import RequestScheduler
+from replay import TAPE_FILE, Dataset, StandInServer, Tape
+from resilience import Resilience
+
+# Module settings the benchmark redirects; main() puts them back when it's done
+REDIRECTED = [(scanner, "SOURCES_DIR"), (scanner, "TOOLS_FILE"), (scanner, "HN_STORY_LIMIT"),
+              (scanner, "GITHUB_SEARCH_PAGES"), (scanner, "HN_API"), (scanner, "HN_SEARCH_API"),
+              (github_client, "GITHUB_API"), (manifest, "META_FILE")]
+
+def setup_workdir(server, scale):
+    """Scratch sources dir, meta.json and a catalog whose tools all have github repos"""
+    workdir = Path(tempfile.mkdtemp(prefix="bench-scan-"))
+    tools = [{"id": r["name"], "name": r["name"], "github": r["full_name"]} for r in server.repos()]
+    with open(workdir / "tools.json", "w") as f:
+        json.dump({"tools": tools, "graveyard": []}, f)
+    scanner.SOURCES_DIR = workdir / "sources"
+    scanner.SOURCES_DIR.mkdir()
+    scanner.TOOLS_FILE = workdir / "tools.json"
+    manifest.META_FILE = workdir / "meta.json"
+    scanner.HN_STORY_LIMIT = 500 * scale
+    scanner.GITHUB_SEARCH_PAGES = 3 * scale
+    return workdir
+
+def unlimited_scheduler(server):
+    """The stand-in has no quotas; don't let politeness limits skew timings"""
+    host = server.base_url.split("//")[1]
+    return RequestScheduler({(host, r): (1e9, 1e9) for r in ("core", "search", "graphql")})
+
+def bench_source(server, name):
+    """Run one source alone; returns (seconds, requests, peak bytes, retries)"""
+    workdir = setup_workdir(server, server.scale)
+    resilience = Resilience()
+    before = server.requests
+    tracemalloc.start()
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        scanner.SOURCES[name]["fetch"](cache=ResponseCache(workdir / "cache"), cancel=threading.Event(),
+                                       scheduler=unlimited_scheduler(server), resilience=resilience)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    resilience.close()
+    return elapsed, server.requests - before, peak, resilience.stats["retried"]
+
+def bench_scan(server, workdir):
+    """One full run_scan; returns (seconds, requests, resilience stats)"""
+    resilience = Resilience()
+    before = server.requests
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        scanner.run_scan(cache=ResponseCache(workdir / "cache"), scheduler=unlimited_scheduler(server),
+                         resilience=resilience)
+    elapsed = time.perf_counter() - started
+    resilience.close()
+    return elapsed, server.requests - before, resilience.stats
+
+def bench_scale(dataset, scale, args):
+    """Per-source and full-scan timings at one scale"""
+    server = StandInServer(dataset, latency=args.latency, jitter=args.jitter,
+                           error_rate=args.error_rate, scale=scale).start()
+    server.point_scanner()
+
+    print(f"\n  Scale {scale}x")
+    print(f"  {'source':<14}{'wall s':>9}{'requests':>10}{'req/s':>9}{'retries':>9}{'peak MB':>10}")
+    for name in scanner.SOURCES:
+        elapsed, requests, peak, retries = bench_source(server, name)
+        rate = requests / elapsed if elapsed else 0
+        print(f"  {name:<14}{elapsed:>9.2f}{requests:>10}{rate:>9.0f}{retries:>9}{peak / 1e6:>10.1f}")
+
+    workdir = setup_workdir(server, scale)
+    for label in ("cold", "warm"):
+        elapsed, requests, stats = bench_scan(server, workdir)
+        print(f"  run_scan {label:<5}{elapsed:>9.2f}{requests:>10}{requests / elapsed:>9.0f}"
+              f"{stats['retried']:>9}   hedged {stats['hedged']}")
+    server.shutdown()
+    server.server_close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark scanner.run_scan offline")
+    parser.add_argument("--tape", default=str(TAPE_FILE))
+    parser.add_argument("--synthetic", action="store_true")
+    parser.add_argument("--scales", default="1,10,100")
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--error-rate", type=float, default=0.01)
+    args = parser.parse_args()
+
+    if args.synthetic or not Path(args.tape).exists():
+        dataset, origin = Dataset.synthetic(), "synthetic data"
+    else:
+        dataset, origin = Dataset.from_tape(Tape.load(args.tape)), args.tape
+
+    print(f"\n⏱  SCANNER BENCHMARK - {origin}")
+    print(f"   latency {args.latency * 1000:.0f}ms ±{args.jitter * 1000:.0f}ms, "
+          f"error rate {args.error_rate:.0%}")
+    print("=" * 72)
+
+    saved = [(module, name, getattr(module, name)) for module, name in REDIRECTED]
+    try:
+        for scale in (int(s) for s in args.scales.split(",")):
+            bench_scale(dataset, scale, args)
+    finally:
+        for module, name, value in saved:
+            setattr(module, name, value)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Catalog - Slotted Tool records for tools.json, parsed once per run
+Derived fields (normalized names, domain, dates, pricing tier) are computed
+on first use and cached; to_dict() gives back the original JSON, key order included
+"""
+
+import json
+import re
+import sys
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from manifest import write_if_changed
+
+BASE_DIR = Path(__file__).parent.parent
+TOOLS_FILE = BASE_DIR / "data" / "tools.json"
+
+SECOND_LEVEL = {"co", "com", "org", "net", "ac", "gov", "edu"}
+BUDGET_PRICES = ["$10", "$15", "$20", "$25", "$29", "$30"]
+
+# Schema fields get a slot each; anything else lands in Tool.extra
+FIELDS = ("id", "name", "url", "category", "description", "pricing", "state", "tags",
+          "added_date", "last_signal_date", "scores", "github")
+FIELD_SET = frozenset(FIELDS)
+INTERNED = {"category", "pricing", "state"}   # Few distinct values across the catalog
+
+_key_orders = {}   # One shared tuple per distinct key order
+_MISSING = object()
+_UNSET = object()
+
+def normalize(name):
+    """Lowercase alphanumerics only: "Reclaim.ai" and "reclaim-ai" -> "reclaimai" """
+    return re.sub(r"[^a-z0-9]", "", (name or "").lower())
+
+def registered_domain(url):
+    """Registrable domain of a URL: "https://app.foo.co.uk/x" -> "foo.co.uk" """
+    host = urlsplit(url if "//" in (url or "") else f"//{url or ''}").hostname or ""
+    labels = host.lower().removeprefix("www.").split(".")
+    if len(labels) >= 3 and labels[-2] in SECOND_LEVEL and len(labels[-1]) == 2:
+        return ".".join(labels[-3:])
+    return ".".join(labels[-2:]) if len(labels) >= 2 else ""
+
+def github_full_name(url):
+    """owner/repo for a github.com repository URL, else None"""
+    if "github.com" not in (url or "").lower():
+        return None  # Skip the URL parse for the common case
+    parts = urlsplit(url or "")
+    if (parts.hostname or "").lower() not in ("github.com", "www.github.com"):
+        return None
+    segments = [s for s in parts.path.split("/") if s]
+    return "/".join(segments[:2]).lower() if len(segments) >= 2 else None
+
+def pricing_tier(pricing):
+    """"free", "budget", "enterprise" or "paid", as the relevance score reads pricing"""
+    pricing = (pricing or "").lower()
+    if "free" in pricing:
+        return "free"
+    if any(x in pricing for x in BUDGET_PRICES):
+        return "budget"
+    return "enterprise" if "enterprise" in pricing else "paid"
+
+def parse_date(value):
+    """datetime from an ISO date string, or None if absent or malformed"""
+    try:
+        return datetime.fromisoformat(value) if value else None
+    except (TypeError, ValueError):
+        return None
+
+class derived:
+    """Computed on first access and cached in the "_" + name slot (_UNSET until then)"""
+
+    def __init__(self, fn):
+        self.fn = fn
+        self.slot = "_" + fn.__name__
+        self.__doc__ = fn.__doc__
+
+    def __get__(self, tool, owner=None):
+        if tool is None:
+            return self
+        value = getattr(tool, self.slot)
+        if value is _UNSET:
+            value = self.fn(tool)
+            setattr(tool, self.slot, value)
+        return value
+
+class Tool:
+    """One catalog entry
+
+    Schema fields are attributes (unset when absent from the JSON); read
+    them as tool.name or, dict-style, tool.get("name"). Write with
+    tool["state"] = ..., which also drops cached derived fields.
+    """
+
+    DERIVED = ("name_key", "slug_key", "name_lower", "repo_full_name", "domain", "last_signal",
+               "added", "tier", "waitlist", "combined")
+    _DERIVED_SLOTS = tuple("_" + d for d in DERIVED)
+    __slots__ = FIELDS + ("extra", "_keys") + _DERIVED_SLOTS
+
+    @classmethod
+    def from_dict(cls, data):
+        tool = cls()
+        tool._reset()
+        extra = None
+        for key, value in data.items():
+            if key in FIELD_SET:
+                if key in INTERNED and isinstance(value, str):
+                    value = sys.intern(value)
+                setattr(tool, key, value)
+            else:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+        tool.extra = extra
+        keys = tuple(data)
+        tool._keys = _key_orders.setdefault(keys, keys)
+        return tool
+
+    def to_dict(self):
+        return {key: self[key] for key in self._keys}
+
+    def get(self, key, default=None):
+        if key in FIELD_SET:
+            return getattr(self, key, default)
+        return self.extra.get(key, default) if self.extra else default
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        if key not in self._keys:
+            keys = self._keys + (key,)
+            self._keys = _key_orders.setdefault(keys, keys)
+        if key in FIELD_SET:
+            setattr(self, key, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+        self._reset()
+
+    def _reset(self):
+        for slot in self._DERIVED_SLOTS:
+            setattr(self, slot, _UNSET)
+
+    def __contains__(self, key):
+        return key in self._keys
+
+    def keys(self):
+        return self._keys
+
+    def __repr__(self):
+        return f"Tool({self.get('id')!r})"
+
+    # Derived fields
+
+    @derived
+    def name_key(self):
+        """Normalized name, as matched against repo names"""
+        return normalize(getattr(self, "name", None))
+
+    @derived
+    def slug_key(self):
+        return normalize(getattr(self, "id", None))
+
+    @derived
+    def name_lower(self):
+        return (getattr(self, "name", None) or "").lower()
+
+    @derived
+    def repo_full_name(self):
+        """owner/repo from the github field or a github.com URL, lowercased; "" if neither"""
+        return (getattr(self, "github", None) or github_full_name(getattr(self, "url", None)) or "").lower()
+
+    @derived
+    def domain(self):
+        return registered_domain(getattr(self, "url", None) or "")
+
+    @derived
+    def last_signal(self):
+        return parse_date(getattr(self, "last_signal_date", None))
+
+    @derived
+    def added(self):
+        return parse_date(getattr(self, "added_date", None))
+
+    @derived
+    def tier(self):
+        """Pricing tier, see pricing_tier()"""
+        return pricing_tier(getattr(self, "pricing", ""))
+
+    @derived
+    def waitlist(self):
+        return "waitlist" in getattr(self, "description", "").lower()
+
+    @derived
+    def combined(self):
+        """Combined score, 0 before the first scoring run"""
+        return getattr(self, "scores", {}).get("combined", 0)
+
+def as_tool(tool):
+    """Tool for a Tool or a plain tools.json dict"""
+    return tool if isinstance(tool, Tool) else Tool.from_dict(tool)
+
+class Catalog:
+    """tools.json: Tool records plus the graveyard (kept as plain dicts)"""
+
+    __slots__ = ("tools", "graveyard", "extra", "_keys")
+
+    @classmethod
+    def from_dict(cls, data):
+        catalog = cls()
+        catalog.tools = [Tool.from_dict(t) for t in data.get("tools", [])]
+        catalog.graveyard = data.get("graveyard", [])
+        catalog.extra = {k: v for k, v in data.items() if k not in ("tools", "graveyard")}
+        catalog._keys = tuple(data) or ("tools", "graveyard")
+        return catalog
+
+    @classmethod
+    def load(cls, path=TOOLS_FILE):
+        path = Path(path)
+        if path.exists():
+            with open(path) as f:
+                return cls.from_dict(json.load(f))
+        return cls.from_dict({"tools": [], "graveyard": []})
+
+    def keys(self):
+        """Top-level keys in file order"""
+        return self._keys + tuple(k for k in ("tools", "graveyard") if k not in self._keys)
+
+    def to_dict(self):
+        parts = {"tools": [t.to_dict() for t in self.tools], "graveyard": self.graveyard}
+        return {key: parts[key] if key in parts else self.extra[key] for key in self.keys()}
+
+    def to_json(self):
+        """tools.json text, exactly as json.dump(..., indent=2) writes it"""
+        return json.dumps(self.to_dict(), indent=2)
+
+    def save(self, path=TOOLS_FILE):
+        """Write tools.json (left untouched if identical); returns its text"""
+        text = self.to_json()
+        write_if_changed(path, text)
+        return text
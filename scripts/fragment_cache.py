@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Fragment Cache - Rendered page fragments keyed by a hash of their inputs
+A fragment whose inputs (the values it renders, plus the template version)
+are unchanged since the last run is read back instead of rendered again
+"""
+
+import hashlib
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent.parent
+CACHE_DIR = BASE_DIR / "data" / "fragments"
+
+def template_version(*templates):
+    """Short hash of template sources; editing any template invalidates its fragments"""
+    return hashlib.sha1("\0".join(t.source for t in templates).encode()).hexdigest()[:12]
+
+class FragmentCache:
+    """One directory of <key>.html files per page
+
+    Call finish() after rendering: it drops fragments this run didn't use,
+    so the directory only ever holds the current page's pieces.
+    """
+
+    def __init__(self, page, version, root=CACHE_DIR):
+        self.dir = Path(root) / page
+        self.version = version
+        self.used = set()
+        self.hits = self.misses = 0
+
+    def key(self, inputs):
+        return hashlib.blake2b(repr((self.version, inputs)).encode(), digest_size=12).hexdigest()
+
+    def fragment(self, inputs, render):
+        """Cached text for `inputs`, else render() stored under their key"""
+        key = self.key(inputs)
+        self.used.add(key)
+        path = self.dir / f"{key}.html"
+        try:
+            text = path.read_text()
+            self.hits += 1
+            return text
+        except OSError:
+            pass
+        self.misses += 1
+        text = render()
+        self.dir.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(text)
+        tmp.replace(path)
+        return text
+
+    @property
+    def hit_ratio(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def finish(self):
+        """Remove fragments not used by this run"""
+        if self.dir.exists():
+            for path in self.dir.glob("*.html"):
+                if path.stem not in self.used:
+                    path.unlink()
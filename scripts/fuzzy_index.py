@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Fuzzy Index - Trigram similarity over normalized tool names and aliases
+Resolves a repo name, HN title or tweet to its best candidate tool
+"""
+
+import json
+import math
+import re
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent.parent
+ALIASES_FILE = BASE_DIR / "data" / "aliases.json"
+
+SIMILARITY_THRESHOLD = 0.7   # Jaccard similarity of padded trigram sets
+TEXT_THRESHOLD = 0.8         # Stricter for free text, where common words abound
+MIN_FUZZY_LENGTH = 5         # Shorter keys ("v0", "hex") only match exactly
+MAX_WINDOW = 3               # Words per free-text window
+TEXT_SOURCES = ("name", "alias")
+
+# Tokens dropped from either end of a name: "Reclaim.ai" -> "reclaim", "cursor-app" -> "cursor".
+# Package tokens (sdk, py, js, cli, api, client...) are never dropped: "notion-sdk-py" is a
+# library for Notion, not Notion AI, and "v0-sdk" is not v0 (list such repos in aliases.json).
+AFFIXES = {"ai", "app", "dev", "hq", "io", "official"}
+
+def load_aliases(path=ALIASES_FILE):
+    """{tool id: [alias, ...]} from the alias table next to tools.json"""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def trigrams(key):
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def variants(text):
+    """Normalized keys for a name: all tokens joined, then with affix tokens trimmed"""
+    tokens = re.findall(r"[a-z0-9]+", (text or "").lower())
+    keys = ["".join(tokens)]
+    core = tokens
+    while core and core[-1] in AFFIXES:
+        core = core[:-1]
+    while core and core[0] in AFFIXES:
+        core = core[1:]
+    if core and core != tokens:
+        keys.append("".join(core))
+    return [k for k in keys if k]
+
+class TrigramIndex:
+    """Inverted trigram index over tool keys
+
+    Lookups only visit tools sharing one of the query's rarest trigrams
+    (prefix filtering), so resolving N signals never scans all M tools.
+    """
+
+    def __init__(self, threshold=SIMILARITY_THRESHOLD):
+        self.threshold = threshold
+        self.entries = []   # (key, tool id, "name" | "slug" | "trimmed" | "alias")
+        self.grams = []
+        self.exact = {}
+        self.postings = {}
+
+    @classmethod
+    def from_tools(cls, tools, aliases=None, threshold=SIMILARITY_THRESHOLD):
+        index = cls(threshold)
+        for tool in tools:
+            index.add(tool.get("name"), tool["id"])
+            index.add(tool["id"], tool["id"], "slug")
+        for tool_id, names in (aliases or {}).items():
+            for name in names:
+                index.add(name, tool_id, "alias")
+        return index
+
+    def add(self, text, tool_id, source="name"):
+        for i, key in enumerate(variants(text)):
+            if key in self.exact:
+                continue  # First tool to claim a key keeps it
+            n = len(self.entries)
+            self.entries.append((key, tool_id, "trimmed" if i and source != "alias" else source))
+            self.exact[key] = n
+            grams = trigrams(key)
+            self.grams.append(grams)
+            if len(key) >= MIN_FUZZY_LENGTH:
+                for gram in grams:
+                    self.postings.setdefault(gram, []).append(n)
+
+    def lookup(self, key, min_length=1, threshold=None, sources=None):
+        """(entry number, similarity) of the closest key, or None below threshold
+
+        `sources` limits which kinds of key may match; free text skips slugs
+        and trimmed names ("resemble", "character") that are ordinary words.
+        """
+        threshold = threshold or self.threshold
+        n = self.exact.get(key)
+        if n is not None and (sources is None or self.entries[n][2] in sources):
+            return (n, 1.0) if len(key) >= min_length else None
+        if len(key) < max(MIN_FUZZY_LENGTH, min_length):
+            return None
+        grams = trigrams(key)
+        # A match shares >= ceil(t*|A|) trigrams, so it appears in one of the rarest |A| - that + 1
+        needed = math.ceil(threshold * len(grams))
+        rarest = sorted(grams, key=lambda g: len(self.postings.get(g, ())))[:len(grams) - needed + 1]
+        best = None
+        for n in sorted({n for g in rarest for n in self.postings.get(g, ())}):
+            if sources is not None and self.entries[n][2] not in sources:
+                continue
+            overlap = len(grams & self.grams[n])
+            similarity = overlap / (len(grams) + len(self.grams[n]) - overlap)
+            if similarity >= threshold and (best is None or similarity > best[1]):
+                best = (n, similarity)
+        return best
+
+    def _hit(self, found):
+        n, similarity = found
+        key, tool_id, source = self.entries[n]
+        return tool_id, similarity, "alias" if source == "alias" else "fuzzy"
+
+    def resolve(self, name, min_length=1, threshold=None, sources=None):
+        """(tool id, similarity, "fuzzy" | "alias") for a name such as a repo, or None"""
+        best = None
+        for key in variants(name):
+            found = self.lookup(key, min_length, threshold, sources)
+            if found and (best is None or found[1] > best[1]):
+                best = found
+        return self._hit(best) if best else None
+
+    def resolve_text(self, text, min_length=1):
+        """Best hit per tool over every 1..MAX_WINDOW word window of free text
+
+        Uses TEXT_THRESHOLD and full names or aliases only.
+        """
+        words = (text or "").split()
+        hits = {}
+        for start in range(len(words)):
+            for end in range(start + 1, min(start + MAX_WINDOW, len(words)) + 1):
+                hit = self.resolve(" ".join(words[start:end]), min_length, TEXT_THRESHOLD, TEXT_SOURCES)
+                if hit and (hit[0] not in hits or hit[1] > hits[hit[0]][1]):
+                    hits[hit[0]] = hit
+        return list(hits.values())
@@ -3,10 +3,14 @@
 Generator - Build HTML pages from tools database
 """
 
-import json
 from datetime import datetime
 from pathlib import Path
 
+from manifest import touch
+from search_index import SEARCH_SCRIPT, write_search_index
+from storage import get_storage
+from templates import Template, write_stream
+
 BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / "data"
 TOOLS_FILE = DATA_DIR / "tools.json"
@@ -34,80 +38,36 @@ CATEGORIES = {
     "3d": ("🎮", "3D & Game Dev")
 }
 
-def load_tools():
-    if TOOLS_FILE.exists():
-        with open(TOOLS_FILE) as f:
-            return json.load(f)
-    return {"tools": [], "graveyard": []}
+# Page templates, compiled once at import
 
-def generate_html():
-    print(f"\n🎨 GENERATOR - {datetime.now().strftime('%Y-%m-%d %H:%M')}")
-    print("=" * 50)
-    
-    db = load_tools()
-    tools = [t for t in db.get("tools", []) if t.get("state") != "GRAVEYARD"]
-    graveyard = db.get("graveyard", [])
-    
-    # Group by category
-    by_category = {}
-    for tool in tools:
-        cat = tool.get("category", "other")
-        if cat not in by_category:
-            by_category[cat] = []
-        by_category[cat].append(tool)
-    
-    # Hot tools (top 10 by score)
-    hot_tools = sorted(tools, key=lambda x: x.get("scores", {}).get("combined", 0), reverse=True)[:10]
-    hot_html = ""
-    for tool in hot_tools:
-        score = tool.get("scores", {}).get("combined", 0)
-        hot_html += f'''                <div class="hot-tool">
-                    <a href="{tool['url']}" target="_blank">{tool['name']}</a>
+HOT_TOOL = Template('''                <div class="hot-tool">
+                    <a href="{url}" target="_blank">{name}</a>
                     <div class="hot-score">Score: {score:.0f}</div>
                 </div>
-'''
-    
-    # Categories HTML
-    cat_html = ""
-    for cat_id, (icon, cat_name) in CATEGORIES.items():
-        cat_tools = by_category.get(cat_id, [])
-        if not cat_tools:
-            continue
-        
-        tools_html = ""
-        for tool in sorted(cat_tools, key=lambda x: x.get("scores", {}).get("combined", 0), reverse=True):
-            score = tool.get("scores", {}).get("combined", 0)
-            is_hot = score >= 75
-            hot_class = " tool-hot" if is_hot else ""
-            
-            tools_html += f'''                    <div class="tool{hot_class}">
-                        <a href="{tool['url']}" target="_blank">{tool['name']}</a>
-                        <div class="tool-desc">{tool.get('description', '')}</div>
+''')
+
+TOOL_CARD = Template('''                    <div class="tool{hot_class}" data-id="{id}">
+                        <a href="{url}" target="_blank">{name}</a>
+                        <div class="tool-desc">{description}</div>
                         <div class="tool-meta">
-                            <span class="tool-tag">{tool.get('pricing', 'Free')}</span>
+                            <span class="tool-tag">{pricing}</span>
                         </div>
                         <span class="tool-score">{score:.0f}</span>
                     </div>
-'''
-        
-        cat_html += f'''            <div class="category" data-category="{cat_id}">
+''')
+
+CATEGORY = Template('''            <div class="category" data-category="{cat_id}">
                 <div class="category-header">
                     <span class="category-icon">{icon}</span>
-                    <h2>{cat_name}</h2>
-                    <span class="category-count">{len(cat_tools)} tools</span>
+                    <h2>{name}</h2>
+                    <span class="category-count">{count} tools</span>
                 </div>
                 <div class="tools-grid">
-{tools_html}                </div>
+{tools}                </div>
             </div>
-'''
-    
-    updated_date = datetime.now().strftime("%B %d, %Y")
-    tool_count = len(tools)
-    category_count = len([c for c in by_category if by_category[c]])
-    graveyard_count = len(graveyard)
-    
-    # Build final HTML using string concatenation instead of .format()
-    html = f'''<!DOCTYPE html>
+''')
+
+PAGE = Template('''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -163,7 +123,6 @@ def generate_html():
         footer a {{ color: #FFF67F; text-decoration: none; }}
         .graveyard-link {{ margin-top: 20px; }}
         .graveyard-link a {{ color: #666; font-size: 0.9rem; }}
-        .hidden {{ display: none !important; }}
         .how-we-curate {{ background: linear-gradient(135deg, #111 0%, #0a0a0a 100%); border-top: 1px solid #222; border-bottom: 1px solid #222; padding: 60px 0; margin-top: 40px; }}
         .how-we-curate h3 {{ text-align: center; color: #FFF67F; font-size: 1.5rem; margin-bottom: 40px; }}
         .curate-grid {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(250px, 1fr)); gap: 24px; }}
@@ -179,13 +138,13 @@ def generate_html():
         <div class="container">
             <h1>200 AI Tools for Builders</h1>
             <p>Daily-updated directory of AI tools that actually work. Dead tools get removed. Only what builders are using right now.</p>
-            <span class="updated">Updated {updated_date}<span class="live-badge">LIVE</span></span>
+            <span class="updated">Updated <span id="updated-date">daily</span><span class="live-badge">LIVE</span></span>
         </div>
     </header>
     
     <div class="search-box">
         <div class="container">
-            <input type="text" id="search" placeholder="Search tools..." autocomplete="off">
+            <input type="text" id="search" placeholder="Search tools..." autocomplete="off" data-index="{search_index}">
         </div>
     </div>
     
@@ -199,12 +158,12 @@ def generate_html():
         <div class="hot-section">
             <h3>🔥 Hot This Week</h3>
             <div class="hot-grid">
-{hot_html}
+{hot_tools}
             </div>
         </div>
         
         <div class="categories">
-{cat_html}
+{categories}
         </div>
     </main>
     
@@ -251,50 +210,28 @@ def generate_html():
     </footer>
     
     <script>
-        const search = document.getElementById('search');
-        const categories = document.querySelectorAll('.category');
-        search.addEventListener('input', (e) => {{
-            const q = e.target.value.toLowerCase();
-            categories.forEach(cat => {{
-                let visible = 0;
-                cat.querySelectorAll('.tool').forEach(tool => {{
-                    const match = tool.textContent.toLowerCase().includes(q);
-                    tool.classList.toggle('hidden', !match);
-                    if (match) visible++;
-                }});
-                cat.classList.toggle('hidden', visible === 0);
-            }});
-        }});
+        // The date lives in meta.json, so a day with no changes leaves this page untouched
+        fetch('meta.json').then(r => r.json()).then(meta => {{
+            if (meta.updated_at) {{
+                document.getElementById('updated-date').textContent = new Date(meta.updated_at)
+                    .toLocaleDateString('en-US', {{ month: 'long', day: 'numeric', year: 'numeric' }});
+            }}
+        }}).catch(() => {{}});
     </script>
+    {search_script}
 </body>
-</html>'''
-    
-    # Write index.html
-    with open(BASE_DIR / "index.html", "w") as f:
-        f.write(html)
-    
-    print(f"  ✓ Generated index.html with {len(tools)} tools")
-    
-    # Generate graveyard
-    generate_graveyard(graveyard)
-    
-    return True
+</html>''')
 
-def generate_graveyard(graveyard):
-    """Generate graveyard.html"""
-    if not graveyard:
-        graveyard_html = "<p>No tools in the graveyard yet. We remove tools that go inactive or shut down.</p>"
-    else:
-        graveyard_html = ""
-        for tool in graveyard:
-            graveyard_html += f'''<div class="graveyard-tool">
-                <h4>{tool['name']}</h4>
-                <p class="reason">{tool.get('reason', 'INACTIVITY')}: {tool.get('reason_detail', 'No activity detected')}</p>
-                <p class="dates">Removed: {tool.get('removed_date', 'Unknown')}</p>
+GRAVEYARD_TOOL = Template('''<div class="graveyard-tool">
+                <h4>{name}</h4>
+                <p class="reason">{reason}: {reason_detail}</p>
+                <p class="dates">Removed: {removed_date}</p>
             </div>
-'''
-    
-    html = f'''<!DOCTYPE html>
+''')
+
+GRAVEYARD_EMPTY = "<p>No tools in the graveyard yet. We remove tools that go inactive or shut down.</p>"
+
+GRAVEYARD_PAGE = Template('''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -319,13 +256,83 @@ def generate_graveyard(graveyard):
         <a href="index.html" class="back">← Back to Active Tools</a>
         <h1>☠️ The Graveyard</h1>
         <p class="subtitle">Tools that didn't make it. Gone but not forgotten.</p>
-        {graveyard_html}
+        {tools}
     </div>
 </body>
-</html>'''
+</html>''')
+
+def hot_tools_stream(tools):
+    for tool in tools:
+        yield HOT_TOOL.render(url=tool['url'], name=tool['name'], score=tool.combined)
+
+def categories_stream(by_category):
+    """Category sections in CATEGORIES order, cards in score order"""
+    for cat_id, (icon, cat_name) in CATEGORIES.items():
+        cat_tools = by_category.get(cat_id, [])
+        if not cat_tools:
+            continue
+        cards = (TOOL_CARD.render(
+            hot_class=" tool-hot" if tool.combined >= 75 else "",
+            id=tool['id'],
+            url=tool['url'],
+            name=tool['name'],
+            description=tool.get('description', ''),
+            pricing=tool.get('pricing', 'Free'),
+            score=tool.combined
+        ) for tool in cat_tools)
+        yield from CATEGORY.stream(cat_id=cat_id, icon=icon, name=cat_name, count=len(cat_tools), tools=cards)
+
+def generate_html(ctx=None):
+    """Render the site from catalog storage (the run's, when given a PipelineContext)"""
+    print(f"\n🎨 GENERATOR - {datetime.now().strftime('%Y-%m-%d %H:%M')}")
+    print("=" * 50)
+    
+    storage = ctx.storage if ctx is not None else get_storage()
+    tools = storage.active()   # Ranked by combined score
+    graveyard = storage.graveyard()
+    
+    # Group by category, keeping score order
+    by_category = {}
+    for tool in tools:
+        cat = tool.get("category", "other")
+        if cat not in by_category:
+            by_category[cat] = []
+        by_category[cat].append(tool)
+    
+    # Stream index.html: hot tools (top 10 by score), then every category;
+    # search runs against a prebuilt index written next to it
+    changed = write_stream(BASE_DIR / "index.html", PAGE.stream(
+        search_index=write_search_index(tools, CATEGORIES, stem="search-basic"),
+        search_script=SEARCH_SCRIPT,
+        tool_count=len(tools),
+        category_count=len([c for c in by_category if by_category[c]]),
+        graveyard_count=len(graveyard),
+        hot_tools=hot_tools_stream(tools[:10]),
+        categories=categories_stream(by_category)
+    ))
+    
+    if changed:
+        touch("updated_at")
+    print(f"  ✓ Generated index.html with {len(tools)} tools" + ("" if changed else " (unchanged, not rewritten)"))
+    
+    # Generate graveyard
+    generate_graveyard(graveyard)
+    
+    return True
+
+def generate_graveyard(graveyard):
+    """Generate graveyard.html"""
+    if not graveyard:
+        tools = GRAVEYARD_EMPTY
+    else:
+        tools = (GRAVEYARD_TOOL.render(
+            name=tool['name'],
+            reason=tool.get('reason', 'INACTIVITY'),
+            reason_detail=tool.get('reason_detail', 'No activity detected'),
+            removed_date=tool.get('removed_date', 'Unknown')
+        ) for tool in graveyard)
     
-    with open(BASE_DIR / "graveyard.html", "w") as f:
-        f.write(html)
+    write_stream(BASE_DIR / "graveyard.html", GRAVEYARD_PAGE.stream(tools=tools))
     
     print(f"  ✓ Generated graveyard.html with {len(graveyard)} tools")
 
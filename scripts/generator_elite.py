@@ -8,10 +8,19 @@ import json
 from datetime import datetime
 from pathlib import Path
 
+from fragment_cache import FragmentCache, template_version
+from manifest import touch, write_hashed
+from search_index import ASSETS_DIR, SEARCH_SCRIPT, write_search_index
+from storage import get_storage
+from templates import Template, write_stream
+
 BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / "data"
 TOOLS_FILE = DATA_DIR / "tools.json"
 
+INLINE_CARDS = 12   # Per category in the page; the rest load from the category's shards
+SHARD_ROWS = 500    # Tools per shard, so a long category loads only the part scrolled to
+
 CATEGORIES = {
     "coding": ("💻", "Code & Ship"),
     "agents": ("🤖", "AI Agents"),
@@ -35,101 +44,57 @@ CATEGORIES = {
     "3d": ("🎮", "3D & Gaming")
 }
 
-def load_tools():
-    if TOOLS_FILE.exists():
-        with open(TOOLS_FILE) as f:
-            return json.load(f)
-    return {"tools": [], "graveyard": []}
+# Page templates, compiled once at import
 
-def generate_elite_html():
-    print(f"\n✨ ELITE GENERATOR - {datetime.now().strftime('%Y-%m-%d %H:%M')}")
-    print("=" * 50)
-    
-    db = load_tools()
-    tools = [t for t in db.get("tools", []) if t.get("state") != "GRAVEYARD"]
-    graveyard = db.get("graveyard", [])
-    
-    # Sort by score
-    tools_sorted = sorted(tools, key=lambda x: x.get("scores", {}).get("combined", 0), reverse=True)
-    
-    # Top 6 for hero bento
-    hero_tools = tools_sorted[:6]
-    
-    # Rest grouped by category
-    by_category = {}
-    for tool in tools_sorted[6:]:
-        cat = tool.get("category", "other")
-        if cat not in by_category:
-            by_category[cat] = []
-        by_category[cat].append(tool)
-    
-    # Build hero bento HTML
-    hero_html = ""
-    for i, tool in enumerate(hero_tools):
-        score = tool.get("scores", {}).get("combined", 0)
-        size_class = "bento-large" if i < 2 else "bento-medium" if i < 4 else "bento-small"
-        hero_html += f'''
-            <a href="{tool['url']}" target="_blank" class="bento-card {size_class}" data-tilt>
+HERO_CARD = Template('''
+            <a href="{url}" target="_blank" class="bento-card {size_class}" data-tilt data-id="{id}">
                 <div class="card-glow"></div>
                 <div class="card-content">
-                    <div class="card-rank">#{i+1}</div>
-                    <h3>{tool['name']}</h3>
-                    <p>{tool.get('description', '')}</p>
+                    <div class="card-rank">#{rank}</div>
+                    <h3>{name}</h3>
+                    <p>{description}</p>
                     <div class="card-meta">
-                        <span class="card-score">{score:.0f}</span>
-                        <span class="card-tag">{tool.get('pricing', 'Free')}</span>
+                        <span class="card-score">{score}</span>
+                        <span class="card-tag">{pricing}</span>
                     </div>
                 </div>
                 <div class="activity-pulse"></div>
-            </a>'''
-    
-    # Build category sections
-    cat_html = ""
-    for cat_id, (icon, cat_name) in CATEGORIES.items():
-        cat_tools = by_category.get(cat_id, [])
-        if not cat_tools:
-            continue
-        
-        tools_html = ""
-        for tool in cat_tools[:12]:  # Max 12 per category
-            score = tool.get("scores", {}).get("combined", 0)
-            hot_class = " is-hot" if score >= 85 else ""
-            tools_html += f'''
-                    <a href="{tool['url']}" target="_blank" class="tool-card{hot_class}" data-tilt data-tilt-scale="1.02">
-                        <div class="tool-name">{tool['name']}</div>
-                        <div class="tool-desc">{tool.get('description', '')[:60]}...</div>
+            </a>''')
+
+TOOL_CARD = Template('''
+                    <a href="{url}" target="_blank" class="tool-card{hot_class}" data-tilt data-tilt-scale="1.02" data-id="{id}">
+                        <div class="tool-name">{name}</div>
+                        <div class="tool-desc">{description}...</div>
                         <div class="tool-footer">
-                            <span class="tool-score">{score:.0f}</span>
-                            <span class="tool-price">{tool.get('pricing', '')}</span>
+                            <span class="tool-score">{score}</span>
+                            <span class="tool-price">{pricing}</span>
                         </div>
-                    </a>'''
-        
-        cat_html += f'''
+                    </a>''')
+
+CATEGORY = Template('''
             <section class="category-section" data-category="{cat_id}">
                 <div class="category-header">
                     <span class="category-icon">{icon}</span>
-                    <h2>{cat_name}</h2>
-                    <span class="category-count">{len(cat_tools)}</span>
+                    <h2>{name}</h2>
+                    <span class="category-count">{count}</span>
                 </div>
                 <div class="tools-row">
-                    {tools_html}
-                </div>
-            </section>'''
-    
-    # Graveyard preview
-    graveyard_html = ""
-    for tool in graveyard[:4]:
-        graveyard_html += f'''
+                    {tools}
+                </div>{more}
+            </section>''')
+
+# The rest of a category, past the inline cards, loads from its shards on demand
+MORE = Template('''
+                <div class="tools-window" hidden><div class="tools-spacer"><div class="tools-row"></div></div></div>
+                <button class="show-more" data-shards="{shards}" data-rest="{rest}" data-chunk="{chunk}">Show all {count}</button>''')
+
+GRAVE_CARD = Template('''
                 <div class="grave-card">
-                    <div class="grave-name">{tool['name']}</div>
-                    <div class="grave-reason">{tool.get('reason', 'INACTIVE')}</div>
-                </div>'''
-    
-    updated_date = datetime.now().strftime("%B %d, %Y")
-    tool_count = len(tools)
-    graveyard_count = len(graveyard)
-    
-    html = f'''<!DOCTYPE html>
+                    <div class="grave-name">{name}</div>
+                    <div class="grave-reason">{reason}</div>
+                </div>''')
+
+PAGE = Template('''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -549,6 +514,46 @@ def generate_elite_html():
             color: var(--text-dim);
         }}
         
+        /* Rest of a category: a windowed list, only rows in view are in the DOM */
+        .tools-window {{
+            max-height: 480px;
+            overflow-y: auto;
+            margin-top: 8px;
+        }}
+        
+        .tools-window[hidden] {{ display: none; }}
+        
+        .tools-spacer {{ position: relative; }}
+        
+        .tools-spacer .tools-row {{
+            position: absolute;
+            top: 0;
+            left: 0;
+            right: 0;
+        }}
+        
+        .tools-window .tool-card {{
+            height: 92px;   /* Fixed, so a row is 100px with the gap (ROW in the script) */
+            overflow: hidden;
+        }}
+        
+        .show-more {{
+            margin-top: 10px;
+            padding: 6px 14px;
+            background: var(--bg-elevated);
+            border: 1px solid var(--border);
+            border-radius: 20px;
+            color: var(--text-dim);
+            font: inherit;
+            font-size: 0.7rem;
+            cursor: pointer;
+        }}
+        
+        .show-more:hover {{
+            border-color: var(--yellow-dim);
+            color: var(--text);
+        }}
+        
         /* Graveyard section */
         .graveyard-section {{
             padding: 30px 0;
@@ -733,7 +738,7 @@ def generate_elite_html():
             </div>
             
             <div class="search-wrap">
-                <input type="text" id="search" placeholder="Search the stack...">
+                <input type="text" id="search" placeholder="Search the stack..." data-index="{search_index}" data-skip="{search_skip}">
             </div>
         </div>
     </header>
@@ -743,7 +748,7 @@ def generate_elite_html():
             <div class="container">
                 <div class="section-label">🔥 Top Performers This Week</div>
                 <div class="bento-grid">
-                    {hero_html}
+                    {hero}
                 </div>
             </div>
         </section>
@@ -751,7 +756,7 @@ def generate_elite_html():
         <section class="categories-wrap">
             <div class="container">
                 <div class="section-label">📦 The Full Stack</div>
-                {cat_html}
+                {categories}
             </div>
         </section>
         
@@ -762,7 +767,7 @@ def generate_elite_html():
                     <a href="graveyard.html" class="graveyard-link">View all {graveyard_count} →</a>
                 </div>
                 <div class="graveyard-grid">
-                    {graveyard_html}
+                    {graveyard}
                 </div>
             </div>
         </section>
@@ -807,32 +812,131 @@ def generate_elite_html():
         </div>
     </footer>
     
+    {search_script}
     <script>
-        // Search functionality
-        const search = document.getElementById('search');
-        const categories = document.querySelectorAll('.category-section');
-        const bentoCards = document.querySelectorAll('.bento-card');
-        
-        search.addEventListener('input', (e) => {{
-            const q = e.target.value.toLowerCase();
+        // Category shards: the first is fetched when a section nears the viewport;
+        // "Show all" opens a windowed list that renders only the rows in view and
+        // fetches the shards behind them as they scroll in
+        (() => {{
+            const ROW = 100, OVERSCAN = 2;   // Card height (92px, see .tools-window) plus the 8px gap
+            const escape = s => String(s).replace(/[&<>"]/g, c => ({{ '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;' }})[c]);
+            const card = t => t ? `<a href="${{escape(t[2])}}" target="_blank" class="tool-card${{t[6] ? ' is-hot' : ''}}" data-id="${{escape(t[0])}}">` +
+                `<div class="tool-name">${{escape(t[1])}}</div><div class="tool-desc">${{escape(t[3])}}...</div>` +
+                `<div class="tool-footer"><span class="tool-score">${{escape(t[4])}}</span>` +
+                `<span class="tool-price">${{escape(t[5])}}</span></div></a>` : '<div class="tool-card"></div>';
+            const shards = new Map();
+            const load = url => {{
+                if (!shards.has(url)) shards.set(url, fetch(url).then(r => r.json()));
+                return shards.get(url);
+            }};
+            let found = null, counts = null;
+            
+            class WindowedList {{
+                constructor(el, urls, total, chunk) {{
+                    this.el = el;
+                    this.slice = el.querySelector('.tools-row');
+                    this.urls = urls;
+                    this.total = total;
+                    this.chunk = chunk;
+                    this.chunks = [];
+                    this.matches = null;   // Rows matching the search, once every shard is in
+                    this.version = 0;
+                    el.addEventListener('scroll', () => this.schedule(), {{ passive: true }});
+                    window.addEventListener('resize', () => this.schedule());
+                    this.filter();
+                }}
+                filter() {{
+                    const version = ++this.version;
+                    this.el.scrollTop = 0;
+                    this.matches = null;
+                    this.key = null;
+                    if (!found) return this.render();
+                    this.matches = [];
+                    Promise.all(this.urls.map(load)).then(chunks => {{
+                        if (version !== this.version) return;   // Another search came in meanwhile
+                        this.matches = chunks.flat().filter(t => found.has(t[0]));
+                        this.key = null;
+                        this.render();
+                    }});
+                }}
+                row(i) {{
+                    if (this.matches) return this.matches[i];
+                    const n = Math.floor(i / this.chunk);
+                    if (!this.chunks[n]) {{
+                        this.chunks[n] = [];
+                        load(this.urls[n]).then(rows => {{ this.chunks[n] = rows; this.key = null; this.schedule(); }});
+                    }}
+                    return this.chunks[n][i % this.chunk];
+                }}
+                schedule() {{
+                    if (this.pending) return;
+                    this.pending = true;
+                    requestAnimationFrame(() => {{ this.pending = false; this.render(); }});
+                }}
+                render() {{
+                    if (this.el.hidden) return;
+                    const count = this.matches ? this.matches.length : this.total;
+                    const cols = getComputedStyle(this.slice).gridTemplateColumns.split(' ').length;
+                    const rows = Math.ceil(count / cols);
+                    const first = Math.max(0, Math.floor(this.el.scrollTop / ROW) - OVERSCAN);
+                    const last = Math.min(rows, Math.ceil((this.el.scrollTop + this.el.clientHeight) / ROW) + OVERSCAN);
+                    const key = `${{cols}}:${{first}}:${{last}}`;
+                    if (key === this.key) return;
+                    this.key = key;
+                    this.slice.parentElement.style.height = `${{rows * ROW}}px`;
+                    this.slice.style.transform = `translateY(${{first * ROW}}px)`;
+                    const html = [];
+                    for (let i = first * cols; i < Math.min(count, last * cols); i++) html.push(card(this.row(i)));
+                    this.slice.innerHTML = html.join('');
+                }}
+            }}
             
-            // Filter bento cards
-            bentoCards.forEach(card => {{
-                const match = card.textContent.toLowerCase().includes(q);
-                card.style.display = match ? '' : 'none';
+            const sections = Array.from(document.querySelectorAll('.show-more'), button => {{
+                const section = button.closest('[data-category]');
+                return {{
+                    button,
+                    category: section.dataset.category,
+                    el: section.querySelector('.tools-window'),
+                    urls: button.dataset.shards.split(' '),
+                    inline: Array.from(section.querySelectorAll(':scope > .tools-row > [data-id]'), el => el.dataset.id),
+                    list: null,
+                    label: button.textContent
+                }};
             }});
+            const hiddenMatches = s => (counts[s.category] || 0) - s.inline.filter(id => found.has(id)).length;
+            const label = s => !s.el.hidden ? 'Show less' : found ? `Show ${{hiddenMatches(s)}} more` : s.label;
             
-            // Filter category cards
-            categories.forEach(cat => {{
-                let visible = 0;
-                cat.querySelectorAll('.tool-card').forEach(tool => {{
-                    const match = tool.textContent.toLowerCase().includes(q);
-                    tool.style.display = match ? '' : 'none';
-                    if (match) visible++;
+            const observer = 'IntersectionObserver' in window && new IntersectionObserver(entries => {{
+                for (const entry of entries) {{
+                    if (entry.isIntersecting) {{
+                        load(entry.target.dataset.shards.split(' ')[0]);
+                        observer.unobserve(entry.target);
+                    }}
+                }}
+            }}, {{ rootMargin: '600px' }});
+            
+            sections.forEach(s => {{
+                if (observer) observer.observe(s.button);
+                s.button.addEventListener('click', () => {{
+                    s.el.hidden = !s.el.hidden;
+                    if (!s.el.hidden) {{
+                        if (!s.list) s.list = new WindowedList(s.el, s.urls, Number(s.button.dataset.rest), Number(s.button.dataset.chunk));
+                        else s.list.filter();
+                    }}
+                    s.button.textContent = label(s);
                 }});
-                cat.style.display = visible === 0 && q ? 'none' : '';
             }});
-        }});
+            
+            document.addEventListener('search', e => {{
+                found = e.detail.found;
+                counts = e.detail.sections;
+                sections.forEach(s => {{
+                    if (s.list && !s.el.hidden) s.list.filter();
+                    s.button.style.display = !found || !s.el.hidden || hiddenMatches(s) > 0 ? '' : 'none';
+                    s.button.textContent = label(s);
+                }});
+            }});
+        }})();
         
         // Simple tilt effect
         document.querySelectorAll('[data-tilt]').forEach(card => {{
@@ -853,15 +957,118 @@ def generate_elite_html():
         }});
     </script>
 </body>
-</html>'''
+</html>''')
+
+# Fragments (hero, each category section, graveyard preview) are cached by
+# the values they render; bump nothing by hand, editing a template changes this
+FRAGMENT_VERSION = template_version(HERO_CARD, TOOL_CARD, CATEGORY, MORE, GRAVE_CARD)
+
+def hero_stream(hero_tools, cache):
+    cards = [dict(
+        id=tool['id'],
+        url=tool['url'],
+        size_class="bento-large" if i < 2 else "bento-medium" if i < 4 else "bento-small",
+        rank=i + 1,
+        name=tool['name'],
+        description=tool.get('description', ''),
+        score=f"{tool.combined:.0f}",
+        pricing=tool.get('pricing', 'Free')
+    ) for i, tool in enumerate(hero_tools)]
+    yield cache.fragment(("hero", cards), lambda: "".join(HERO_CARD.render(**card) for card in cards))
+
+def tool_card(tool):
+    return dict(
+        id=tool['id'],
+        url=tool['url'],
+        hot_class=" is-hot" if tool.combined >= 85 else "",
+        name=tool['name'],
+        description=tool.get('description', '')[:60],
+        score=f"{tool.combined:.0f}",
+        pricing=tool.get('pricing', '')
+    )
+
+def write_shards(cat_id, cat_tools):
+    """The category's tools past the inline ones, SHARD_ROWS rows per file, for the page's windowed list"""
+    urls = []
+    for n, start in enumerate(range(0, len(cat_tools), SHARD_ROWS)):
+        rows = []
+        for tool in cat_tools[start:start + SHARD_ROWS]:
+            card = tool_card(tool)
+            rows.append([card['id'], card['name'], card['url'], card['description'], card['score'],
+                         card['pricing'], 1 if card['hot_class'] else 0])
+        name = write_hashed(ASSETS_DIR, f"cat-{cat_id}-{n}", json.dumps(rows, separators=(",", ":")))
+        urls.append(f"{ASSETS_DIR.name}/{name}")
+    return urls
+
+def categories_stream(by_category, cache):
+    """Category sections in CATEGORIES order: INLINE_CARDS cards each, the rest in a shard"""
+    shards = set()
+    for cat_id, (icon, cat_name) in CATEGORIES.items():
+        cat_tools = by_category.get(cat_id, [])
+        if not cat_tools:
+            continue
+        section = dict(cat_id=cat_id, icon=icon, name=cat_name, count=len(cat_tools))
+        cards = [tool_card(tool) for tool in cat_tools[:INLINE_CARDS]]
+        more = ""
+        if len(cat_tools) > INLINE_CARDS:
+            urls = write_shards(cat_id, cat_tools[INLINE_CARDS:])
+            shards.update(Path(url).name for url in urls)
+            more = MORE.render(shards=" ".join(urls), rest=len(cat_tools) - INLINE_CARDS, chunk=SHARD_ROWS,
+                               count=len(cat_tools))
+        yield cache.fragment(("category", section, cards, more), lambda: "".join(CATEGORY.stream(
+            **section, tools=(TOOL_CARD.render(**card) for card in cards), more=more)))
+    
+    # Shards no longer used (a category shrank or stopped overflowing)
+    for path in ASSETS_DIR.glob("cat-*.json"):
+        if path.name not in shards:
+            path.unlink()
+
+def graveyard_stream(graveyard, cache):
+    cards = [dict(name=tool['name'], reason=tool.get('reason', 'INACTIVE')) for tool in graveyard]
+    yield cache.fragment(("graveyard", cards), lambda: "".join(GRAVE_CARD.render(**card) for card in cards))
+
+def generate_elite_html(ctx=None):
+    """Render the site from catalog storage (the run's, when given a PipelineContext)"""
+    print(f"\n✨ ELITE GENERATOR - {datetime.now().strftime('%Y-%m-%d %H:%M')}")
+    print("=" * 50)
+    
+    storage = ctx.storage if ctx is not None else get_storage()
+    tools = storage.active()   # Ranked by combined score
+    graveyard = storage.graveyard()
+    
+    # Top 6 for hero bento
+    hero_tools = tools[:6]
+    
+    # Rest grouped by category
+    by_category = {}
+    for tool in tools[6:]:
+        cat = tool.get("category", "other")
+        if cat not in by_category:
+            by_category[cat] = []
+        by_category[cat].append(tool)
     
-    # Write elite index
-    with open(BASE_DIR / "index.html", "w") as f:
-        f.write(html)
+    # Stream the elite index: hero bento, category sections, graveyard preview;
+    # fragments whose inputs haven't changed since the last run come from cache.
+    # Search runs against a prebuilt index of every active tool, written next to it.
+    cache = FragmentCache("elite", FRAGMENT_VERSION)
+    changed = write_stream(BASE_DIR / "index.html", PAGE.stream(
+        search_index=write_search_index(tools, CATEGORIES),
+        search_skip=len(hero_tools),
+        search_script=SEARCH_SCRIPT,
+        tool_count=len(tools),
+        graveyard_count=len(graveyard),
+        hero=hero_stream(hero_tools, cache),
+        categories=categories_stream(by_category, cache),
+        graveyard=graveyard_stream(graveyard[:4], cache)
+    ))
+    cache.finish()
+    if changed:
+        touch("updated_at")
     
-    print(f"  ✓ Generated elite index.html with {len(tools)} tools")
+    print(f"  ✓ Generated elite index.html with {len(tools)} tools" + ("" if changed else " (unchanged, not rewritten)"))
     print(f"  ✓ Hero section: {len(hero_tools)} top tools")
     print(f"  ✓ Categories: {len([c for c in by_category if by_category[c]])} active")
+    print(f"  ✓ Fragments: {cache.hits}/{cache.hits + cache.misses} from cache ({cache.hit_ratio:.0%})")
     
     return True
 
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+GitHub Client - In-process REST search and batched GraphQL repo lookups
+Replaces one `gh api` process per call with pooled HTTP requests
+"""
+
+import json
+import os
+import re
+import subprocess
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlencode
+
+from http_client import ConnectionPool
+from rate_limit import PRIORITY_CATALOG, PRIORITY_DEFAULT, PRIORITY_DISCOVERY
+
+GITHUB_API = os.environ.get("GITHUB_API_URL", "https://api.github.com")
+GRAPHQL_BATCH = 50      # Repositories per GraphQL query
+SEARCH_PAGE_SIZE = 100  # GitHub's maximum per_page
+TIMEOUT = 20
+
+class GitHubError(Exception):
+    pass
+
+def github_token():
+    """Token from GITHUB_TOKEN/GH_TOKEN, else from the gh CLI login (one spawn)"""
+    token = os.environ.get("GITHUB_TOKEN") or os.environ.get("GH_TOKEN")
+    if token:
+        return token
+    try:
+        result = subprocess.run(["gh", "auth", "token"], capture_output=True, text=True, timeout=10)
+        if result.returncode == 0:
+            return result.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        pass
+    return None
+
+def next_link(link_header):
+    """URL of rel="next" in a Link header, if any"""
+    for part in (link_header or "").split(","):
+        match = re.search(r'<([^>]+)>;\s*rel="next"', part)
+        if match:
+            return match.group(1)
+    return None
+
+class GitHubClient:
+    """Pooled GitHub API access; base_url can point at a local stand-in"""
+
+    def __init__(self, token=None, base_url=None, pool=None, cache=None, timeout=TIMEOUT,
+                 scheduler=None, resilience=None, cancel=None):
+        self.token = token if token is not None else github_token()
+        self.base_url = (base_url or GITHUB_API).rstrip("/")
+        self.pool = pool or ConnectionPool(timeout=timeout, scheduler=scheduler, resilience=resilience,
+                                           cancel=cancel)
+        self.cache = cache
+        self.requests = 0
+
+    def _headers(self):
+        headers = {"Accept": "application/vnd.github+json"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        return headers
+
+    def get(self, url, priority=PRIORITY_DEFAULT):
+        """GET an absolute URL or an API path; returns (response, decoded JSON)"""
+        if not url.startswith("http"):
+            url = f"{self.base_url}/{url.lstrip('/')}"
+        self.requests += 1
+        resp = self.pool.get(url, cache=self.cache, headers=self._headers(), priority=priority)
+        if resp.status != 200:
+            raise GitHubError(f"GET {url} returned HTTP {resp.status}")
+        return resp, resp.json()
+
+    def search_repositories(self, query, sort="stars", order="desc", max_pages=1, cancel=None):
+        """Search repositories, following Link: rel="next" up to max_pages
+
+        Setting the optional cancel event stops before the next page.
+        """
+        params = {"q": query, "sort": sort, "order": order, "per_page": SEARCH_PAGE_SIZE}
+        url = f"search/repositories?{urlencode(params)}"
+        items = []
+        for _ in range(max_pages):
+            if cancel is not None and cancel.is_set():
+                break
+            resp, data = self.get(url, priority=PRIORITY_DISCOVERY)
+            items.extend(data.get("items", []))
+            url = next_link(resp.headers.get("link"))
+            if not url:
+                break
+        return items
+
+    def graphql(self, query, variables=None, priority=PRIORITY_CATALOG):
+        self.requests += 1
+        headers = self._headers()
+        headers["Content-Type"] = "application/json"
+        body = json.dumps({"query": query, "variables": variables or {}}).encode()
+        # GraphQL queries are reads, so they are safe to retry and hedge
+        resp = self.pool.request(f"{self.base_url}/graphql", method="POST", body=body, headers=headers,
+                                 priority=priority, idempotent=True)
+        if resp.status != 200:
+            raise GitHubError(f"GraphQL returned HTTP {resp.status}")
+        data = resp.json()
+        if data.get("errors") and not data.get("data"):
+            raise GitHubError(data["errors"][0].get("message", "GraphQL error"))
+        return data.get("data") or {}
+
+    def repo_signals(self, full_names, days=30, cancel=None):
+        """Stars, forks, last push and commits in the last `days` for many repos
+
+        Repos are looked up GRAPHQL_BATCH at a time as aliased fields of one
+        query. Repos that do not exist are left out of the result. Setting the
+        optional cancel event stops before the next batch.
+        """
+        since = (datetime.now(timezone.utc) - timedelta(days=days)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        signals = {}
+        full_names = list(dict.fromkeys(full_names))
+        for i in range(0, len(full_names), GRAPHQL_BATCH):
+            if cancel is not None and cancel.is_set():
+                break
+            batch = full_names[i:i + GRAPHQL_BATCH]
+            fields = []
+            for n, full_name in enumerate(batch):
+                owner, _, name = full_name.partition("/")
+                fields.append(
+                    f"r{n}: repository(owner: {json.dumps(owner)}, name: {json.dumps(name)}) {{ "
+                    "nameWithOwner stargazerCount forkCount pushedAt "
+                    "defaultBranchRef { target { ... on Commit { history(since: $since) { totalCount } } } } }"
+                )
+            query = "query($since: GitTimestamp!) {\n  " + "\n  ".join(fields) + "\n}"
+            data = self.graphql(query, {"since": since})
+            for n, full_name in enumerate(batch):
+                repo = data.get(f"r{n}")
+                if not repo:
+                    continue
+                target = (repo.get("defaultBranchRef") or {}).get("target") or {}
+                signals[full_name] = {
+                    "full_name": repo.get("nameWithOwner", full_name),
+                    "stars": repo.get("stargazerCount", 0),
+                    "forks": repo.get("forkCount", 0),
+                    "pushed_at": repo.get("pushedAt"),
+                    f"commits_{days}d": (target.get("history") or {}).get("totalCount", 0)
+                }
+        return signals
+
+    def close(self):
+        self.pool.close()
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+History - Append-only columnar store of daily scores, states and signals
+One segment per day under data/history/, plus a dictionary of tool ids;
+segments are memory-mapped and only the blocks a query needs are decoded
+"""
+
+import json
+import mmap
+import struct
+import sys
+from bisect import bisect_right
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from catalog import Catalog
+from manifest import write_if_changed
+
+BASE_DIR = Path(__file__).parent.parent
+HISTORY_DIR = BASE_DIR / "data" / "history"
+DICTIONARY = "tools.dict"   # One tool id per line; a tool's code is its line number
+SUFFIX = ".seg"
+
+MAGIC = b"TDH1"
+HEADER = struct.Struct("<4sIIHH")   # magic, rows, block size, columns, meta length
+BLOCK_SIZE = 128                    # Rows per block; every block restarts its deltas
+STATES = ("ACTIVE", "WATCHLIST", "GRAVEYARD")
+ABSENT = -1                         # Signal value when nothing matched
+
+# Scores are stored in tenths; the rest as-is. Every column is delta + zigzag varint coded.
+SCORES = ("activity", "relevance", "combined")
+SIGNALS = ("stars", "forks", "hn_score")
+COLUMNS = ("tool", "state") + SCORES + SIGNALS
+
+def _put_varint(out, value):
+    value = (value << 1) if value >= 0 else ((-value) << 1) - 1   # zigzag
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def _varints(buf, pos, end, count=None):
+    """Decode zigzag varints from buf[pos:end], at most `count` of them"""
+    values = []
+    while pos < end and (count is None or len(values) < count):
+        value = shift = 0
+        while True:
+            byte = buf[pos]
+            pos += 1
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                break
+            shift += 7
+        values.append((value >> 1) ^ -(value & 1))
+    return values
+
+def _undelta(deltas):
+    values, last = [], 0
+    for delta in deltas:
+        last += delta
+        values.append(last)
+    return values
+
+def _encode_column(values, block_size):
+    """(column bytes, byte offset of each block)"""
+    out = bytearray()
+    offsets = []
+    for start in range(0, len(values), block_size):
+        offsets.append(len(out))
+        last = 0
+        for value in values[start:start + block_size]:
+            _put_varint(out, value - last)
+            last = value
+    return bytes(out), offsets
+
+def row_for(tool, repo=None, story=None):
+    """History row for a scored Tool and the repo / HN story it matched"""
+    scores = tool.get("scores", {})
+    return {
+        "id": tool["id"],
+        "state": tool.get("state", "ACTIVE"),
+        **{name: scores.get(name, 0) for name in SCORES},
+        "stars": repo.get("stars", ABSENT) if repo is not None else ABSENT,
+        "forks": repo.get("forks", ABSENT) if repo is not None else ABSENT,
+        "hn_score": story.get("score", ABSENT) if story is not None else ABSENT,
+    }
+
+class Segment:
+    """One day's rows, memory-mapped
+
+    Layout: header, meta JSON (date, columns, states), column lengths,
+    block index (first tool code, then each column's block offset), columns.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count, self.block_size, ncols, meta_len = HEADER.unpack_from(self.buf, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path}: not a history segment")
+        pos = HEADER.size
+        self.meta = json.loads(self.buf[pos:pos + meta_len])
+        pos += meta_len
+        lengths = struct.unpack_from(f"<{ncols}I", self.buf, pos)
+        pos += 4 * ncols
+        nblocks = -(-self.count // self.block_size)
+        index = struct.unpack_from(f"<{nblocks * (ncols + 1)}I", self.buf, pos)
+        pos += 4 * len(index)
+        self.firsts = index[::ncols + 1]
+        self.blocks = [index[n * (ncols + 1) + 1:(n + 1) * (ncols + 1)] for n in range(nblocks)]
+        self.columns = {}
+        for name, length in zip(self.meta["columns"], lengths):
+            self.columns[name] = (pos, pos + length)
+            pos += length
+
+    def _block(self, name, n, count=None):
+        start, end = self.columns[name]
+        col = self.meta["columns"].index(name)
+        block_end = start + self.blocks[n + 1][col] if n + 1 < len(self.blocks) else end
+        return _undelta(_varints(self.buf, start + self.blocks[n][col], block_end, count))
+
+    def _value(self, name, value):
+        if name == "state":
+            return self.meta["states"][value]
+        return value / 10 if name in SCORES else value
+
+    def rows(self, ids):
+        """Every row, decoded column by column"""
+        names = self.meta["columns"]
+        decoded = {name: [] for name in names}
+        for n in range(len(self.blocks)):
+            for name in names:
+                decoded[name].extend(self._block(name, n))
+        return [{"id": ids[code], **{name: self._value(name, decoded[name][k]) for name in names[1:]}}
+                for k, code in enumerate(decoded["tool"])]
+
+    def find(self, code, ids):
+        """The row for tool `code`, decoding only the block that holds it"""
+        n = bisect_right(self.firsts, code) - 1
+        if n < 0:
+            return None
+        codes = self._block("tool", n)
+        try:
+            k = codes.index(code)
+        except ValueError:
+            return None
+        # Deltas restart per block, so decoding stops at row k of each column
+        return {"id": ids[code], **{name: self._value(name, self._block(name, n, k + 1)[k])
+                                    for name in self.meta["columns"][1:]}}
+
+    def close(self):
+        self.buf.close()
+
+class HistoryStore:
+    """data/history: tools.dict plus one YYYY-MM-DD.seg segment per day"""
+
+    def __init__(self, root=HISTORY_DIR, block_size=BLOCK_SIZE):
+        self.root = Path(root)
+        self.block_size = block_size
+        self.ids = []
+        self.codes = {}
+        dictionary = self.root / DICTIONARY
+        if dictionary.exists():
+            self.ids = dictionary.read_text().splitlines()
+            self.codes = {tool_id: n for n, tool_id in enumerate(self.ids)}
+
+    def days(self):
+        """Recorded dates, oldest first"""
+        return sorted(p.stem for p in self.root.glob(f"*{SUFFIX}"))
+
+    def _path(self, day):
+        return self.root / f"{day}{SUFFIX}"
+
+    def _code(self, tool_id, new):
+        code = self.codes.get(tool_id)
+        if code is None:
+            code = self.codes[tool_id] = len(self.ids)
+            self.ids.append(tool_id)
+            new.append(tool_id)
+        return code
+
+    def record(self, day, rows):
+        """Write the segment for `day` (YYYY-MM-DD), replacing one recorded earlier that day"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        new = []
+        coded = sorted(((self._code(row["id"], new), row) for row in rows), key=lambda r: r[0])
+        states = list(STATES) + sorted({row["state"] for _, row in coded} - set(STATES))
+        state_codes = {state: n for n, state in enumerate(states)}
+        values = {
+            "tool": [code for code, _ in coded],
+            "state": [state_codes[row["state"]] for _, row in coded],
+            **{name: [round(row[name] * 10) for _, row in coded] for name in SCORES},
+            **{name: [row[name] for _, row in coded] for name in SIGNALS},
+        }
+        encoded = [_encode_column(values[name], self.block_size) for name in COLUMNS]
+        meta = json.dumps({"date": day, "columns": COLUMNS, "states": states}).encode()
+
+        out = bytearray(HEADER.pack(MAGIC, len(coded), self.block_size, len(COLUMNS), len(meta)))
+        out += meta
+        out += struct.pack(f"<{len(COLUMNS)}I", *(len(data) for data, _ in encoded))
+        for n in range(len(encoded[0][1])):
+            out += struct.pack(f"<{len(COLUMNS) + 1}I", values["tool"][n * self.block_size],
+                               *(offsets[n] for _, offsets in encoded))
+        for data, _ in encoded:
+            out += data
+
+        # Dictionary first: a segment must never reference codes that aren't on disk
+        if new:
+            with open(self.root / DICTIONARY, "a") as f:
+                f.write("".join(f"{tool_id}\n" for tool_id in new))
+        write_if_changed(self._path(day), out)
+        return len(out)
+
+    def segment(self, day):
+        path = self._path(day)
+        return Segment(path) if path.exists() else None
+
+    def snapshot(self, day):
+        """(date recorded, {tool id: row}) for the latest day on or before `day`"""
+        recorded = [d for d in self.days() if d <= str(day)]
+        if not recorded:
+            return None, {}
+        segment = self.segment(recorded[-1])
+        try:
+            return recorded[-1], {row["id"]: row for row in segment.rows(self.ids)}
+        finally:
+            segment.close()
+
+    def catalog_as_of(self, day, catalog):
+        """Copy of `catalog` with the tools, ranking, scores and states recorded as of `day`
+
+        Tools no longer in the catalog come back with just their id.
+        """
+        _, rows = self.snapshot(day)
+        current = {t["id"]: t for t in catalog.tools}
+        data = catalog.to_dict()
+        tools = []
+        for tool_id, row in sorted(rows.items(), key=lambda r: r[1]["combined"], reverse=True):
+            tool = current[tool_id].to_dict() if tool_id in current else {"id": tool_id}
+            tool["state"] = row["state"]
+            tool["scores"] = {name: row[name] for name in SCORES}
+            tools.append(tool)
+        data["tools"] = tools
+        return Catalog.from_dict(data)
+
+    def series(self, tool_id, start=None, end=None):
+        """[(date, row)] for one tool, oldest first; days it wasn't recorded are skipped"""
+        code = self.codes.get(tool_id)
+        if code is None:
+            return []
+        points = []
+        for day in self.days():
+            if (start and day < str(start)) or (end and day > str(end)):
+                continue
+            segment = self.segment(day)
+            try:
+                row = segment.find(code, self.ids)
+            finally:
+                segment.close()
+            if row is not None:
+                points.append((day, row))
+        return points
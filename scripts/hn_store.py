@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+HN Store - Persistent HackerNews item store
+Items are fetched once; later runs only refresh score and comment counts.
+Stories that drop off every list are kept for RETENTION_DAYS after posting.
+"""
+
+import json
+import time
+from pathlib import Path
+
+from manifest import write_if_changed
+
+BASE_DIR = Path(__file__).parent.parent
+STORE_FILE = BASE_DIR / "data" / "sources" / "hn_items.json"
+
+RETENTION_DAYS = 30   # Unranked stories older than this are dropped
+
+class HNItemStore:
+    """AI stories keyed by id, plus ids already seen and rejected"""
+
+    def __init__(self, path=STORE_FILE):
+        self.path = Path(path)
+        self.items = {}
+        self.skipped = set()
+        if self.path.exists():
+            try:
+                with open(self.path) as f:
+                    data = json.load(f)
+                self.items = {int(k): v for k, v in data.get("items", {}).items()}
+                self.skipped = set(data.get("skipped", []))
+            except (OSError, ValueError):
+                pass
+
+    def unseen(self, ids):
+        """Ids never fetched before, in the order given"""
+        return [i for i in ids if i not in self.items and i not in self.skipped]
+
+    def add(self, item, keep):
+        """Record a freshly fetched item; non-AI items only remember their id"""
+        story_id = item["id"]
+        if not keep:
+            self.skipped.add(story_id)
+            return
+        self.items[story_id] = {
+            "id": story_id,
+            "title": item.get("title"),
+            "url": item.get("url"),
+            "score": item.get("score", 0),
+            "descendants": item.get("descendants", 0),
+            "time": item.get("time"),
+            "lists": []
+        }
+
+    def update_counts(self, story_id, score, descendants):
+        item = self.items.get(story_id)
+        if item is not None:
+            item["score"] = score
+            item["descendants"] = descendants
+
+    def prune(self, ranked):
+        """Forget rejected ids no longer listed and stale unranked stories"""
+        self.skipped.intersection_update(ranked)
+        cutoff = time.time() - RETENTION_DAYS * 86400
+        for story_id in list(self.items):
+            if story_id not in ranked and (self.items[story_id].get("time") or 0) < cutoff:
+                del self.items[story_id]
+
+    def stories(self, ranked):
+        """Ranked stories in rank order, then the rest by score"""
+        listed = [self.items[i] for i in ranked if i in self.items]
+        rest = sorted(
+            (item for i, item in self.items.items() if i not in ranked),
+            key=lambda x: x.get("score", 0), reverse=True
+        )
+        return listed + rest
+
+    def save(self):
+        """Write the store; a run that changed nothing leaves the file untouched"""
+        write_if_changed(self.path, json.dumps({
+            "items": {str(k): v for k, v in sorted(self.items.items())},
+            "skipped": sorted(self.skipped)
+        }))
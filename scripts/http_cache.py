@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+HTTP Cache - On-disk response cache with ETag / Last-Modified revalidation
+Shared by every scanner source
+"""
+
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent.parent
+CACHE_DIR = BASE_DIR / "data" / "sources" / "cache"
+
+MAX_CACHE_BYTES = 64 * 1024 * 1024   # Evict least recently used beyond this
+MAX_CACHE_AGE_DAYS = 14              # Evict entries unused for this long
+
+def parse_cache_control(value):
+    """Parse a Cache-Control header into {directive: value or True}"""
+    directives = {}
+    for part in (value or "").split(","):
+        part = part.strip().lower()
+        if not part:
+            continue
+        name, _, arg = part.partition("=")
+        directives[name.strip()] = arg.strip().strip('"') or True
+    return directives
+
+class ResponseCache:
+    """Bodies stored as files, validators and freshness in index.json"""
+
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=MAX_CACHE_BYTES, max_age_days=MAX_CACHE_AGE_DAYS):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.max_age = max_age_days * 86400
+        self._lock = threading.Lock()
+        self._index = {}
+        self.stats = {"fresh": 0, "revalidated": 0, "miss": 0, "stale": 0}
+        index_file = self.cache_dir / "index.json"
+        if index_file.exists():
+            try:
+                with open(index_file) as f:
+                    self._index = json.load(f)
+            except (OSError, ValueError):
+                self._index = {}
+
+    def count(self, outcome):
+        with self._lock:
+            self.stats[outcome] += 1
+
+    def _body_path(self, key):
+        return self.cache_dir / (hashlib.sha1(key.encode()).hexdigest() + ".body")
+
+    def lookup(self, key):
+        """Return (entry, body) for a cached key, or (None, None)"""
+        with self._lock:
+            entry = self._index.get(key)
+        if entry is None:
+            return None, None
+        try:
+            body = self._body_path(key).read_bytes()
+        except OSError:
+            with self._lock:
+                self._index.pop(key, None)
+            return None, None
+        return entry, body
+
+    def is_fresh(self, entry):
+        return time.time() - entry["stored_at"] < entry.get("max_age", 0)
+
+    def conditional_headers(self, entry):
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, key, headers, body):
+        """Save a 200 response; responses marked no-store are skipped"""
+        cc = parse_cache_control(headers.get("cache-control"))
+        if "no-store" in cc:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._body_path(key).write_bytes(body)
+        now = time.time()
+        with self._lock:
+            self._index[key] = {
+                "etag": headers.get("etag"),
+                "last_modified": headers.get("last-modified"),
+                "max_age": self._max_age(cc),
+                "stored_at": now,
+                "used_at": now,
+                "size": len(body)
+            }
+
+    def refresh(self, key, headers):
+        """Record a 304: the cached body is valid for another max-age"""
+        cc = parse_cache_control(headers.get("cache-control"))
+        now = time.time()
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None:
+                return
+            entry["etag"] = headers.get("etag") or entry.get("etag")
+            entry["last_modified"] = headers.get("last-modified") or entry.get("last_modified")
+            entry["max_age"] = self._max_age(cc)
+            entry["stored_at"] = now
+            entry["used_at"] = now
+
+    def mark_used(self, key):
+        with self._lock:
+            if key in self._index:
+                self._index[key]["used_at"] = time.time()
+
+    def _max_age(self, cc):
+        if "no-cache" in cc:
+            return 0
+        try:
+            return int(cc.get("max-age", 0))
+        except (TypeError, ValueError):
+            return 0
+
+    def evict(self):
+        """Drop entries unused for max_age_days, then LRU down to max_bytes"""
+        now = time.time()
+        with self._lock:
+            doomed = {k for k, e in self._index.items() if now - e.get("used_at", 0) > self.max_age}
+            total = sum(e.get("size", 0) for k, e in self._index.items() if k not in doomed)
+            if total > self.max_bytes:
+                by_use = sorted(
+                    (k for k in self._index if k not in doomed),
+                    key=lambda k: self._index[k].get("used_at", 0)
+                )
+                for k in by_use:
+                    if total <= self.max_bytes:
+                        break
+                    total -= self._index[k].get("size", 0)
+                    doomed.add(k)
+            for k in doomed:
+                self._index.pop(k, None)
+                try:
+                    self._body_path(k).unlink()
+                except OSError:
+                    pass
+        return len(doomed)
+
+    def save(self):
+        """Evict and persist the index"""
+        evicted = self.evict()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            with open(self.cache_dir / "index.json", "w") as f:
+                json.dump(self._index, f)
+        return evicted
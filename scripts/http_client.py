@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+HTTP Client - Pooled keep-alive connections and concurrent fetching
+Shared by the scanner sources
+"""
+
+import http.client
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from rate_limit import PRIORITY_DEFAULT
+from resilience import TRANSIENT_ERRORS, CircuitOpenError
+
+DEFAULT_CONCURRENCY = 16
+DEFAULT_TIMEOUT = 10
+USER_AGENT = "ai-tools-curator/1.0"
+
+# Errors that mean a kept-alive connection was dropped by the server
+STALE_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    http.client.BadStatusLine,
+    BrokenPipeError,
+    ConnectionResetError,
+)
+
+class Response:
+    """Status, lowercased headers and raw body of a completed request"""
+    __slots__ = ("url", "status", "headers", "body", "cache_status")
+
+    def __init__(self, url, status, headers, body, cache_status=None):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.cache_status = cache_status  # None, "miss", "fresh", "revalidated" or "stale"
+
+    def json(self):
+        return json.loads(self.body.decode())
+
+class ConnectionPool:
+    """Keep-alive connections, one per (thread, host)
+
+    With a RequestScheduler, every request first waits for a slot in its
+    host's token bucket and reports rate limit headers back afterwards.
+    With a Resilience policy, requests are retried, hedged and circuit broken.
+    Setting the optional cancel event stops requests still waiting for a slot.
+    """
+
+    # Called as recorder(method, url, request_body, response) after every
+    # exchange; set by replay.py to capture traffic
+    recorder = None
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, scheduler=None, resilience=None, cancel=None):
+        self.timeout = timeout
+        self.scheduler = scheduler
+        self.resilience = resilience
+        self.cancel = cancel
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._open = []
+
+    def _connection(self, scheme, netloc, timeout):
+        conns = getattr(self._local, "conns", None)
+        if conns is None:
+            conns = self._local.conns = {}
+        conn = conns.get((scheme, netloc))
+        if conn is None:
+            cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            conn = cls(netloc, timeout=timeout)
+            conns[(scheme, netloc)] = conn
+            with self._lock:
+                self._open.append(conn)
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        return conn
+
+    def _discard(self, scheme, netloc):
+        conn = self._local.conns.pop((scheme, netloc), None)
+        if conn is not None:
+            conn.close()
+            with self._lock:
+                if conn in self._open:
+                    self._open.remove(conn)
+
+    def request(self, url, headers=None, timeout=None, method="GET", body=None, priority=PRIORITY_DEFAULT,
+                idempotent=None):
+        """Send one request, under the resilience policy if the pool has one"""
+        def send():
+            return self._send(url, headers, timeout, method, body, priority)
+        if self.resilience is None:
+            return send()
+        if idempotent is None:
+            idempotent = method in ("GET", "HEAD")
+        return self.resilience.call(url, send, idempotent=idempotent, timeout=timeout or self.timeout)
+
+    def _send(self, url, headers, timeout, method, body, priority):
+        """Send one request over this thread's connection to the host"""
+        parts = urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        req_headers = {"User-Agent": USER_AGENT}
+        req_headers.update(headers or {})
+        timeout = timeout or self.timeout
+        if self.scheduler is not None:
+            self.scheduler.acquire(url, priority, self.cancel)
+
+        # A reused connection may have been closed server-side; reconnect once
+        for attempt in range(2):
+            conn = self._connection(parts.scheme, parts.netloc, timeout)
+            reused = conn.sock is not None
+            try:
+                conn.request(method, path, body=body, headers=req_headers)
+                resp = conn.getresponse()
+                data = resp.read()
+            except STALE_ERRORS:
+                self._discard(parts.scheme, parts.netloc)
+                if attempt or not reused:
+                    raise
+                continue
+            except Exception:
+                self._discard(parts.scheme, parts.netloc)
+                raise
+            if resp.will_close:
+                self._discard(parts.scheme, parts.netloc)
+            resp_headers = {k.lower(): v for k, v in resp.getheaders()}
+            if self.scheduler is not None:
+                self.scheduler.observe(url, resp.status, resp_headers)
+            response = Response(url, resp.status, resp_headers, data)
+            if self.recorder is not None:
+                self.recorder(method, url, body, response)
+            return response
+
+    def get(self, url, cache=None, headers=None, timeout=None, priority=PRIORITY_DEFAULT):
+        """GET through an optional ResponseCache, revalidating stale entries"""
+        if cache is None:
+            return self.request(url, headers=headers, timeout=timeout, priority=priority)
+
+        entry, cached_body = cache.lookup(url)
+        if entry is not None and cache.is_fresh(entry):
+            cache.mark_used(url)
+            cache.count("fresh")
+            return Response(url, 200, {}, cached_body, cache_status="fresh")
+
+        req_headers = dict(headers or {})
+        if entry is not None:
+            req_headers.update(cache.conditional_headers(entry))
+        try:
+            resp = self.request(url, headers=req_headers, timeout=timeout, priority=priority)
+        except (CircuitOpenError,) + TRANSIENT_ERRORS:
+            if entry is None:
+                raise
+            resp = None
+        if entry is not None and (resp is None or resp.status >= 500):
+            # Host is down or its circuit is open: serve what we have
+            cache.count("stale")
+            return Response(url, 200, {}, cached_body, cache_status="stale")
+
+        if resp.status == 304 and entry is not None:
+            cache.refresh(url, resp.headers)
+            cache.count("revalidated")
+            return Response(url, 200, resp.headers, cached_body, cache_status="revalidated")
+        if resp.status == 200:
+            cache.store(url, resp.headers, resp.body)
+        cache.count("miss")
+        resp.cache_status = "miss"
+        return resp
+
+    def close(self):
+        with self._lock:
+            for conn in self._open:
+                conn.close()
+            self._open = []
+
+def fetch_many(urls, pool=None, concurrency=DEFAULT_CONCURRENCY, timeout=None, cache=None, cancel=None,
+               priority=PRIORITY_DEFAULT):
+    """Fetch URLs concurrently; returns Responses (None on failure) in input order
+
+    Setting the optional cancel event skips every request not yet started.
+    """
+    own_pool = pool is None
+    pool = pool or ConnectionPool()
+
+    def fetch(url):
+        if cancel is not None and cancel.is_set():
+            return None
+        try:
+            return pool.get(url, cache=cache, timeout=timeout, priority=priority)
+        except Exception:
+            return None
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(urls)))) as ex:
+            return list(ex.map(fetch, urls))
+    finally:
+        if own_pool:
+            pool.close()
+
+def fetch_json_many(urls, pool=None, concurrency=DEFAULT_CONCURRENCY, timeout=None, cache=None, cancel=None,
+                    priority=PRIORITY_DEFAULT):
+    """Like fetch_many, but decodes 200 responses as JSON (None otherwise)"""
+    results = []
+    for resp in fetch_many(urls, pool=pool, concurrency=concurrency, timeout=timeout, cache=cache, cancel=cancel,
+                           priority=priority):
+        try:
+            results.append(resp.json() if resp is not None and resp.status == 200 else None)
+        except ValueError:
+            results.append(None)
+    return results
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Manifest - Content hashes of what each pipeline stage read and wrote
+A stage whose inputs hash the same as last run, with its outputs still on
+disk as it left them, is skipped. Files are only rewritten when their bytes
+change, and when things changed goes in meta.json rather than the pages.
+"""
+
+import ast
+import filecmp
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent.parent
+MANIFEST_FILE = BASE_DIR / "data" / "manifest.json"
+META_FILE = BASE_DIR / "meta.json"
+
+_meta_lock = threading.Lock()   # Scanner sources stamp from their own threads
+
+def digest(*parts):
+    """Hash of plain values (strings, numbers, file digests, config dicts)"""
+    return hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+
+def file_digest(path):
+    """Hash of a file's bytes, or None if it doesn't exist"""
+    try:
+        with open(path, "rb") as f:
+            return hashlib.file_digest(f, lambda: hashlib.blake2b(digest_size=16)).hexdigest()
+    except OSError:
+        return None
+
+def source_files(path):
+    """`path` and every module beside it that it imports, directly or through others, sorted
+
+    A stage's code inputs: editing any module it runs changes their digests.
+    """
+    path = Path(path)
+    found = set()
+    pending = [path]
+    while pending:
+        current = pending.pop()
+        if current in found:
+            continue
+        found.add(current)
+        for node in ast.walk(ast.parse(current.read_text())):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and not node.level and node.module:
+                names = [node.module]
+            else:
+                continue
+            for name in names:
+                module = path.parent / f"{name.split('.')[0]}.py"
+                if module.exists():
+                    pending.append(module)
+    return sorted(found)
+
+def write_if_changed(path, text):
+    """Write `text` (str or bytes) unless the file already holds exactly it; True if written"""
+    path = Path(path)
+    data = text.encode() if isinstance(text, str) else bytes(text)
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except OSError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+    return True
+
+def write_hashed(directory, stem, text, suffix=".json"):
+    """Write `text` as <stem>-<content hash><suffix>, dropping older versions; returns the file name
+
+    The name changes exactly when the content does, so a page can point at
+    it and let browsers cache it for good.
+    """
+    directory = Path(directory)
+    name = f"{stem}-{hashlib.blake2b(text.encode(), digest_size=5).hexdigest()}{suffix}"
+    write_if_changed(directory / name, text)
+    for old in directory.glob(f"{stem}-{'?' * 10}{suffix}"):
+        if old.name != name:
+            old.unlink()
+    return name
+
+def replace_if_changed(tmp, path):
+    """Move a freshly written `tmp` over `path`, or drop it if the bytes match; True if replaced"""
+    if Path(path).exists() and filecmp.cmp(tmp, path, shallow=False):
+        os.unlink(tmp)
+        return False
+    os.replace(tmp, path)
+    return True
+
+def touch(key, path=None):
+    """Stamp meta.json[key] with the current time; call it only when `key`'s content changed"""
+    path = path or META_FILE    # Looked up per call, so tools can point it at a scratch dir
+    with _meta_lock:
+        try:
+            with open(path) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            meta = {}
+        meta[key] = datetime.now().isoformat(timespec="seconds")
+        write_if_changed(path, json.dumps(meta, indent=2, sort_keys=True) + "\n")
+
+class BuildManifest:
+    """data/manifest.json: stage -> {"inputs": digest, "outputs": {path: digest}}
+
+    Paths are relative to the repo root. A missing or unreadable manifest
+    just means every stage runs.
+    """
+
+    def __init__(self, path=MANIFEST_FILE):
+        self.path = Path(path)
+        self.stages = {}
+        try:
+            with open(self.path) as f:
+                self.stages = json.load(f).get("stages", {})
+        except (OSError, ValueError):
+            pass
+
+    def fresh(self, stage, inputs):
+        """True if `stage` last ran on these inputs and its outputs are untouched since"""
+        last = self.stages.get(stage)
+        return (last is not None and last["inputs"] == inputs and
+                all(file_digest(BASE_DIR / path) == value for path, value in last["outputs"].items()))
+
+    def record(self, stage, inputs, outputs):
+        """Store this run's inputs and output digests; a directory in `outputs` stands for its files"""
+        files = []
+        for path in map(Path, outputs):
+            files.extend(sorted(p for p in path.rglob("*") if p.is_file()) if path.is_dir() else [path])
+        self.stages[stage] = {
+            "inputs": inputs,
+            "outputs": {str(p.resolve().relative_to(BASE_DIR.resolve())): file_digest(p) for p in files}
+        }
+
+    def save(self):
+        write_if_changed(self.path, json.dumps({"stages": self.stages}, indent=2) + "\n")
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Matcher - Compiled whole-word keyword matching with relevance weights
+One alternation regex per table, one pass per text
+"""
+
+import re
+
+# AI relevance keywords -> weight
+AI_KEYWORDS = {
+    "ai": 1.0,
+    "llm": 1.0,
+    "gpt": 1.0,
+    "chatgpt": 1.0,
+    "openai": 1.0,
+    "anthropic": 1.0,
+    "claude": 1.0,
+    "copilot": 0.8,
+    "agent": 0.6,
+    "model": 0.4,
+}
+
+class KeywordMatcher:
+    """Finds whole-word (optionally plural) keyword hits in text
+
+    "model" matches "Models" and "model-based" but not "remodel";
+    "ai" matches "AI-powered" but not "said"; "gpt" matches "GPT4".
+    """
+
+    def __init__(self, weights=None, plurals=True):
+        weights = AI_KEYWORDS if weights is None else weights
+        self.weights = {k.lower(): w for k, w in weights.items()}
+        # Longest first so "chatgpt" wins over "gpt" at the same position
+        terms = sorted(self.weights, key=len, reverse=True)
+        alternation = "|".join(re.escape(t) for t in terms) or "(?!)"
+        suffix = "(?:s|es)?" if plurals else ""
+        # Letters only at the edges, so "GPT4" and "AI-powered" still match
+        self.pattern = re.compile(rf"(?<![a-z])({alternation}){suffix}(?![a-z])", re.IGNORECASE)
+
+    def terms(self, text):
+        """Distinct keywords found in text, in order of first appearance"""
+        found = {}
+        for match in self.pattern.finditer(text or ""):
+            found.setdefault(match.group(1).lower(), None)
+        return list(found)
+
+    def match(self, text):
+        """(matched terms, relevance weight = sum of distinct term weights)"""
+        terms = self.terms(text)
+        return terms, sum(self.weights[t] for t in terms)
+
+    def matches(self, text):
+        return self.pattern.search(text or "") is not None
+
+    def match_many(self, texts):
+        return [self.match(text) for text in texts]
+
+AI_MATCHER = KeywordMatcher()
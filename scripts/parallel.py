@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Parallel - Fork a process pool over contiguous chunks of a list
+Workers inherit read-only state (indexes, the catalog) from the parent at
+fork time; only chunk bounds go out, and results come back in input order
+"""
+
+import multiprocessing
+import os
+
+CHUNKS_PER_WORKER = 4   # Smaller chunks even out slow ones
+
+_shared = None   # Set in the parent just before forking; each child sees its copy
+
+def can_fork():
+    return "fork" in multiprocessing.get_all_start_methods()
+
+def pool_size(size, workers=None, min_size=5000):
+    """Worker count for `size` items: `workers` if given, else every core once size >= min_size"""
+    if workers is None:
+        workers = (os.cpu_count() or 1) if size >= min_size else 1
+    return max(1, workers) if can_fork() else 1
+
+def _run(task):
+    fn, start, end = task
+    return fn(_shared, start, end)
+
+def fork_map(fn, size, workers, shared):
+    """fn(shared, start, end) over [0, size) in chunks; per-item results, concatenated in order
+
+    `fn` must be a module-level function returning one result per item in
+    its range. With one worker it runs in this process over the whole range.
+    """
+    global _shared
+    if workers <= 1 or size < 2:
+        return fn(shared, 0, size)
+    step = max(1, -(-size // (workers * CHUNKS_PER_WORKER)))
+    tasks = [(fn, start, min(start + step, size)) for start in range(0, size, step)]
+    _shared = shared
+    try:
+        with multiprocessing.get_context("fork").Pool(workers) as pool:
+            parts = pool.map(_run, tasks, chunksize=1)
+    finally:
+        _shared = None
+    return [result for part in parts for result in part]
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+Pipeline - In-memory state handed from stage to stage in run_daily
+Each stage still writes its files under data/ as a checkpoint, but nothing
+written during a run is read back by a later stage of the same run
+"""
+
+from storage import get_storage
+
+class PipelineContext:
+    """What SCAN, SCORE, GENERATE and PUBLISH pass along
+
+    scan:    run_scan() results          (set by SCAN)
+    sources: {source: {payload key: items}}, as scorer.load_sources() returns (SCAN)
+    storage: the catalog backend (see storage.get_storage)
+    catalog: the Catalog, loaded once from storage on first use, updated by SCORE
+    scores:  the scores.json summary      (set by SCORE)
+    """
+
+    def __init__(self, storage=None):
+        self.storage = storage or get_storage()
+        self.scan = None
+        self.sources = None
+        self.scores = None
+
+    @property
+    def catalog(self):
+        return self.storage.load()
@@ -12,13 +12,23 @@ BASE_DIR = Path(__file__).parent.parent
 CHANGELOG_FILE = BASE_DIR / "changelog.md"
 SCORES_FILE = BASE_DIR / "data" / "scores.json"
 
-def update_changelog():
-    """Add today's changes to changelog"""
+# Run state that moves on every day (a new history segment, windows advanced)
+# whether or not anything on the site changed; alone, it isn't worth a commit
+RUN_STATE = ["data/history", "data/signal_windows.json", "data/signals.jsonl", "data/signals_index.json",
+             "data/score_state.json"]
+
+def update_changelog(scores=None):
+    """Add today's changes to changelog
+
+    `scores` is the scorer's summary; read from scores.json when not given.
+    """
     today = datetime.now().strftime("%Y-%m-%d")
     
     # Load score changes
     changes = []
-    if SCORES_FILE.exists():
+    if scores is not None:
+        changes = scores.get("state_changes", [])
+    elif SCORES_FILE.exists():
         with open(SCORES_FILE) as f:
             data = json.load(f)
             changes = data.get("state_changes", [])
@@ -48,13 +58,31 @@ def update_changelog():
     
     return len(changes)
 
-def git_push():
-    """Commit and push changes"""
+def has_changes():
+    """True if a tracked file other than RUN_STATE (the site, catalog, sources) differs from the last commit
+
+    Run state is committed along with the next real change.
+    """
+    result = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no", "--", "."] +
+                            [f":(exclude){path}" for path in RUN_STATE],
+                            cwd=BASE_DIR, capture_output=True, text=True, check=True)
+    return bool(result.stdout.strip())
+
+def git_push(ctx=None):
+    """Commit and push changes; an idle day gets no changelog entry and no commit"""
     print(f"\n📤 PUBLISHER - {datetime.now().strftime('%Y-%m-%d %H:%M')}")
     print("=" * 50)
     
+    try:
+        if not has_changes():
+            print("  ℹ Nothing changed since the last commit - no changelog entry, no commit")
+            return True
+    except subprocess.CalledProcessError as e:
+        print(f"  ✗ Git error: {e}")
+        return False
+    
     # Update changelog
-    changes = update_changelog()
+    changes = update_changelog(ctx.scores if ctx is not None else None)
     print(f"  ✓ Updated changelog ({changes} state changes)")
     
     try:
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Rate Limit - Per-host token buckets and a priority request scheduler
+Adapts to X-RateLimit-* / Retry-After headers so runs never trip a limit
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from urllib.parse import urlsplit
+
+# Request priorities, lowest first
+PRIORITY_CATALOG = 0     # Signals for tools already in the catalog
+PRIORITY_DEFAULT = 1
+PRIORITY_DISCOVERY = 2   # Trending / front-page discovery
+
+# (host, resource) -> (requests per second, burst)
+LIMITS = {
+    ("api.github.com", "core"): (5000 / 3600, 10),
+    ("api.github.com", "search"): (30 / 60, 5),
+    ("api.github.com", "graphql"): (5000 / 3600, 5),
+    ("hacker-news.firebaseio.com", "core"): (100, 100),
+    ("hn.algolia.com", "core"): (10000 / 3600, 10),
+}
+DEFAULT_LIMIT = (100, 100)
+CANCEL_POLL = 0.1   # Seconds between checks of a waiting request's cancel event
+
+class RequestCancelled(Exception):
+    """Raised by acquire() when the request's cancel event is set while it waits"""
+
+def bucket_key(url):
+    """(host, resource) a request counts against"""
+    parts = urlsplit(url)
+    path = parts.path
+    if path.startswith("/api/v3"):
+        path = path[len("/api/v3"):]
+    if path.startswith("/search/"):
+        return parts.netloc, "search"
+    if path.rstrip("/").endswith("/graphql"):
+        return parts.netloc, "graphql"
+    return parts.netloc, "core"
+
+class TokenBucket:
+    """Refills at `rate` tokens/s up to `capacity`; can be paused until a time
+
+    A rate the server's headers imply replaces the configured one only until
+    that rate limit window resets.
+    """
+
+    def __init__(self, rate, capacity):
+        self.configured_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0
+        self.observed_until = 0   # When an observed rate expires
+        self.waiting = []   # heap of (priority, seq)
+
+    def _refill(self, now):
+        if self.observed_until and now >= self.observed_until:
+            self.rate = self.configured_rate
+            self.observed_until = 0
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, now):
+        """Seconds until a token is available (0 if one is now)"""
+        self._refill(now)
+        if now < self.paused_until:
+            return self.paused_until - now
+        if self.tokens >= 1:
+            return 0
+        return (1 - self.tokens) / self.rate
+
+    def take(self):
+        self.tokens -= 1
+
+    def observe(self, remaining, reset_in, retry_after):
+        """Adjust to what the server says is left in the current window"""
+        now = time.monotonic()
+        self._refill(now)
+        if retry_after is not None:
+            self.paused_until = max(self.paused_until, now + retry_after)
+        if remaining is not None:
+            self.tokens = min(self.tokens, remaining)
+            if reset_in is not None and reset_in > 0:
+                # Spread what is left evenly over the rest of the window, then go back to the configured rate
+                self.rate = min(self.configured_rate, max(remaining, 1) / reset_in)
+                self.observed_until = now + reset_in
+                if remaining == 0:
+                    self.paused_until = max(self.paused_until, now + reset_in)
+
+class RequestScheduler:
+    """Grants request slots per bucket in priority order
+
+    Priorities only order requests waiting on the same bucket: buckets are
+    independent limits, so a low-priority request to one host never waits
+    behind a high-priority one to another.
+    """
+
+    def __init__(self, limits=None):
+        self.limits = dict(LIMITS)
+        self.limits.update(limits or {})
+        self.buckets = {}
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self.waited = 0.0
+        self.throttled = 0
+
+    def _bucket(self, key):
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = TokenBucket(*self.limits.get(key, DEFAULT_LIMIT))
+        return bucket
+
+    def acquire(self, url, priority=PRIORITY_DEFAULT, cancel=None):
+        """Block until this request may be sent
+
+        Raises RequestCancelled if the optional cancel event is set first.
+        """
+        started = time.monotonic()
+        poll = CANCEL_POLL if cancel is not None else None
+        with self._cond:
+            bucket = self._bucket(bucket_key(url))
+            ticket = (priority, next(self._seq))
+            heapq.heappush(bucket.waiting, ticket)
+            try:
+                while True:
+                    if cancel is not None and cancel.is_set():
+                        bucket.waiting.remove(ticket)
+                        heapq.heapify(bucket.waiting)
+                        self._cond.notify_all()
+                        raise RequestCancelled(f"cancelled while waiting for {bucket_key(url)}")
+                    if bucket.waiting[0] == ticket:
+                        delay = bucket.wait_time(time.monotonic())
+                        if delay <= 0:
+                            heapq.heappop(bucket.waiting)
+                            bucket.take()
+                            self._cond.notify_all()
+                            break
+                        self._cond.wait(min(delay, poll or delay))
+                    else:
+                        self._cond.wait(poll)
+            finally:
+                self.waited += time.monotonic() - started
+
+    def observe(self, url, status, headers):
+        """Feed rate limit headers from a response back into its bucket"""
+        remaining = headers.get("x-ratelimit-remaining")
+        reset = headers.get("x-ratelimit-reset")
+        retry_after = headers.get("retry-after")
+        if remaining is None and retry_after is None and status not in (403, 429):
+            return
+        try:
+            remaining = int(remaining) if remaining is not None else None
+            reset_in = int(reset) - time.time() if reset is not None else None
+            retry_after = float(retry_after) if retry_after is not None else None
+        except ValueError:
+            return
+        if status in (403, 429) and retry_after is None and remaining != 0:
+            retry_after = 60  # Secondary limit without a hint: back off a minute
+        key = bucket_key(url)
+        resource = headers.get("x-ratelimit-resource")
+        if resource in ("core", "search", "graphql"):
+            key = (key[0], resource)
+        with self._cond:
+            if status in (403, 429):
+                self.throttled += 1
+            self._bucket(key).observe(remaining, reset_in, retry_after)
+            self._cond.notify_all()
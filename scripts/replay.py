@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Replay - Record scanner traffic once, then serve it from a local stand-in
+The stand-in speaks the HN, HN search and GitHub endpoints the scanner uses,
+with configurable latency, jitter, error rate and data scale
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import github_client
+import manifest
+import scanner
+from http_client import ConnectionPool
+
+BASE_DIR = Path(__file__).parent.parent
+REPLAY_DIR = BASE_DIR / "data" / "replay"
+TAPE_FILE = REPLAY_DIR / "scan_tape.json"
+
+ID_STRIDE = 10 ** 9    # Synthetic copy k of story id i is i + k * ID_STRIDE
+PAGE_SIZE = 100
+
+class Tape:
+    """Recorded request/response exchanges"""
+
+    def __init__(self, entries=None):
+        self.entries = entries or []
+        self._lock = threading.Lock()
+
+    def add(self, method, url, request_body, response):
+        with self._lock:
+            self.entries.append({
+                "method": method,
+                "url": url,
+                "status": response.status,
+                "headers": response.headers,
+                "body": response.body.decode("utf-8", "replace")
+            })
+
+    def save(self, path=TAPE_FILE):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({"recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "entries": self.entries}, f)
+
+    @classmethod
+    def load(cls, path=TAPE_FILE):
+        with open(path) as f:
+            return cls(json.load(f).get("entries", []))
+
+# Module paths record() points at a scratch directory for the length of the scan
+REDIRECTED = [(scanner, "SOURCES_DIR"), (scanner, "TOOLS_FILE"), (manifest, "META_FILE")]
+
+def record(path=TAPE_FILE):
+    """Run one real scan into a scratch directory, capturing every response"""
+    tape = Tape()
+    saved = [(module, name, getattr(module, name)) for module, name in REDIRECTED]
+    workdir = Path(tempfile.mkdtemp(prefix="scan-record-"))
+    if scanner.TOOLS_FILE.exists():
+        shutil.copy(scanner.TOOLS_FILE, workdir / "tools.json")
+    ConnectionPool.recorder = tape.add
+    try:
+        scanner.SOURCES_DIR = workdir / "sources"
+        scanner.SOURCES_DIR.mkdir()
+        scanner.TOOLS_FILE = workdir / "tools.json"
+        manifest.META_FILE = workdir / "meta.json"
+        scanner.run_scan()
+    finally:
+        ConnectionPool.recorder = None
+        for module, name, value in saved:
+            setattr(module, name, value)
+    tape.save(path)
+    print(f"  ✓ Recorded {len(tape.entries)} exchanges to {path}")
+    return tape
+
+class Dataset:
+    """HN lists/items and GitHub repos the stand-in serves"""
+
+    def __init__(self, hn_lists, hn_items, repos):
+        self.hn_lists = hn_lists
+        self.hn_items = hn_items
+        self.repos = repos
+        self.repos_by_name = {r["full_name"]: r for r in repos}
+
+    @classmethod
+    def from_tape(cls, tape):
+        hn_lists, hn_items, repos = {}, {}, []
+        for entry in tape.entries:
+            if entry["status"] != 200:
+                continue
+            path = urlsplit(entry["url"]).path
+            try:
+                body = json.loads(entry["body"])
+            except ValueError:
+                continue
+            match = re.search(r"/v0/(\w+stories)\.json$", path)
+            if match:
+                hn_lists[match.group(1)] = body
+            elif re.search(r"/v0/item/\d+\.json$", path) and body:
+                hn_items[body["id"]] = body
+            elif path.endswith("/search/repositories"):
+                repos.extend(body.get("items", []))
+        return cls(hn_lists, hn_items, repos)
+
+    @classmethod
+    def synthetic(cls, stories=500, repos=300, seed=7):
+        """Deterministic data shaped like the real APIs, for use without a tape"""
+        rng = random.Random(seed)
+        words = ["AI", "LLM", "agent", "GPT", "Rust", "database", "Show HN:", "Claude", "compiler",
+                 "startup", "model", "editor", "OpenAI", "Linux", "copilot", "browser"]
+        base_id = 47000000
+        items = {}
+        for n in range(stories):
+            story_id = base_id + n
+            items[story_id] = {
+                "id": story_id,
+                "type": "story",
+                "title": " ".join(rng.choice(words) for _ in range(rng.randint(3, 8))),
+                "url": f"https://example{n % 97}.com/post/{n}",
+                "score": rng.randint(1, 800),
+                "descendants": rng.randint(0, 300),
+                "time": int(time.time()) - rng.randint(0, 86400 * 3)
+            }
+        ids = list(items)
+        hn_lists = {
+            "topstories": rng.sample(ids, min(500, len(ids))),
+            "newstories": sorted(ids, reverse=True)[:500],
+            "showstories": rng.sample(ids, min(200, len(ids))),
+            "beststories": rng.sample(ids, min(500, len(ids)))
+        }
+        repo_list = []
+        for n in range(repos):
+            name = f"tool-{n}"
+            repo_list.append({
+                "name": name,
+                "full_name": f"org{n % 40}/{name}",
+                "html_url": f"https://github.com/org{n % 40}/{name}",
+                "description": " ".join(rng.choice(words) for _ in range(6)),
+                "stargazers_count": rng.randint(1000, 90000),
+                "forks_count": rng.randint(10, 9000),
+                "updated_at": "2026-02-27T06:00:00Z",
+                "topics": ["ai", "machine-learning"]
+            })
+        return cls(hn_lists, items, repo_list)
+
+class StandInServer(ThreadingHTTPServer):
+    """Local HTTP stand-in for the scanner's upstream APIs
+
+    Routes: /hn/v0/..., /hn-search/api/v1/search, /github/search/repositories
+    and POST /github/graphql. `scale` multiplies stories and repos.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, dataset, port=0, latency=0.0, jitter=0.0, error_rate=0.0, scale=1, seed=0):
+        super().__init__(("127.0.0.1", port), StandInHandler)
+        self.dataset = dataset
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.scale = scale
+        self.rng = random.Random(seed)
+        self.requests = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def point_scanner(self):
+        """Aim the scanner and GitHub client at this stand-in"""
+        scanner.HN_API = f"{self.base_url}/hn/v0"
+        scanner.HN_SEARCH_API = f"{self.base_url}/hn-search/api/v1"
+        github_client.GITHUB_API = f"{self.base_url}/github"
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def next_delay_and_error(self):
+        with self._lock:
+            self.requests += 1
+            delay = max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter))
+            failed = self.rng.random() < self.error_rate
+            if failed:
+                self.errors += 1
+        return delay, failed
+
+    # Scaled views of the dataset
+
+    def hn_list(self, name):
+        ids = self.dataset.hn_lists.get(name, [])
+        return [i + k * ID_STRIDE for k in range(self.scale) for i in ids]
+
+    def hn_item(self, story_id):
+        k, base = divmod(story_id, ID_STRIDE)
+        item = self.dataset.hn_items.get(base)
+        if item is None or k >= self.scale:
+            return None
+        if k:
+            item = dict(item, id=story_id, title=f"{item.get('title', '')} #{k}")
+        return item
+
+    def repos(self):
+        repos = self.dataset.repos
+        scaled = list(repos)
+        for k in range(1, self.scale):
+            for repo in repos:
+                scaled.append(dict(repo, name=f"{repo['name']}-{k}", full_name=f"{repo['full_name']}-{k}"))
+        return scaled
+
+    def repo_node(self, full_name):
+        base, _, k = full_name.rpartition("-")
+        repo = self.dataset.repos_by_name.get(full_name) or self.dataset.repos_by_name.get(base)
+        digest = int(hashlib.sha1(full_name.encode()).hexdigest()[:8], 16)
+        return {
+            "nameWithOwner": full_name,
+            "stargazerCount": repo["stargazers_count"] if repo else digest % 50000,
+            "forkCount": repo["forks_count"] if repo else digest % 5000,
+            "pushedAt": repo["updated_at"] if repo else "2026-02-27T06:00:00Z",
+            "defaultBranchRef": {"target": {"history": {"totalCount": digest % 200}}}
+        }
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body=None, headers=None):
+        data = b"" if body is None else json.dumps(body).encode()
+        etag = '"' + hashlib.sha1(data).hexdigest() + '"'
+        if status == 200 and self.headers.get("If-None-Match") == etag:
+            status, data = 304, b""
+        self.send_response(status)
+        if status in (200, 304):
+            self.send_header("ETag", etag)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _begin(self):
+        delay, failed = self.server.next_delay_and_error()
+        if delay:
+            time.sleep(delay)
+        if failed:
+            self._send(503, {"message": "injected failure"})
+        return not failed
+
+    def do_GET(self):
+        if not self._begin():
+            return
+        parts = urlsplit(self.path)
+        path, query = parts.path, parse_qs(parts.query)
+        server = self.server
+
+        match = re.fullmatch(r"/hn/v0/(\w+stories)\.json", path)
+        if match:
+            return self._send(200, server.hn_list(match.group(1)))
+        match = re.fullmatch(r"/hn/v0/item/(\d+)\.json", path)
+        if match:
+            return self._send(200, server.hn_item(int(match.group(1))))
+        if path == "/hn-search/api/v1/search":
+            tags = query.get("tags", [""])[0].strip("()").split(",")
+            hits = []
+            for tag in tags:
+                item = server.hn_item(int(tag.split("_")[1])) if tag.startswith("story_") else None
+                if item:
+                    hits.append({"objectID": str(item["id"]), "points": item.get("score", 0),
+                                 "num_comments": item.get("descendants", 0)})
+            return self._send(200, {"hits": hits})
+        if path == "/github/search/repositories":
+            repos = server.repos()
+            page = int(query.get("page", ["1"])[0])
+            per_page = int(query.get("per_page", [PAGE_SIZE])[0])
+            items = repos[(page - 1) * per_page:page * per_page]
+            headers = {}
+            if page * per_page < len(repos):
+                params = {k: v[0] for k, v in query.items()}
+                params["page"] = page + 1
+                headers["Link"] = f'<{server.base_url}{path}?{urlencode(params)}>; rel="next"'
+            return self._send(200, {"total_count": len(repos), "items": items}, headers)
+        self._send(404, {"message": "Not Found"})
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if not self._begin():
+            return
+        if urlsplit(self.path).path != "/github/graphql":
+            return self._send(404, {"message": "Not Found"})
+        query = json.loads(body).get("query", "")
+        data = {}
+        for alias, owner, name in re.findall(r'(\w+): repository\(owner: "([^"]*)", name: "([^"]*)"\)', query):
+            data[alias] = self.server.repo_node(f"{owner}/{name}")
+        self._send(200, {"data": data})
+
+def main():
+    parser = argparse.ArgumentParser(description="Record or replay scanner traffic")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rec = sub.add_parser("record", help="Run a real scan and save its traffic")
+    rec.add_argument("--tape", default=str(TAPE_FILE))
+    serve = sub.add_parser("serve", help="Serve a tape (or synthetic data) locally")
+    serve.add_argument("--tape", default=str(TAPE_FILE))
+    serve.add_argument("--synthetic", action="store_true", help="Ignore the tape, generate data")
+    serve.add_argument("--port", type=int, default=8700)
+    serve.add_argument("--latency", type=float, default=0.05, help="Seconds per response")
+    serve.add_argument("--jitter", type=float, default=0.02)
+    serve.add_argument("--error-rate", type=float, default=0.0)
+    serve.add_argument("--scale", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.command == "record":
+        record(args.tape)
+        return
+
+    if args.synthetic or not Path(args.tape).exists():
+        dataset = Dataset.synthetic()
+    else:
+        dataset = Dataset.from_tape(Tape.load(args.tape))
+    server = StandInServer(dataset, port=args.port, latency=args.latency, jitter=args.jitter,
+                           error_rate=args.error_rate, scale=args.scale)
+    print(f"🎞  Serving stand-in on {server.base_url} (scale {args.scale}x)")
+    server.serve_forever()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Resilience - Retries, hedged requests and per-host circuit breakers
+Wraps every scanner HTTP call made through a ConnectionPool
+"""
+
+import http.client
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, TimeoutError as FutureTimeout, wait
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+TRANSIENT_ERRORS = (OSError, http.client.HTTPException)
+
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5        # Seconds before the first retry
+BACKOFF_CAP = 8           # Longest wait between retries
+RETRY_AFTER_CAP = 60      # A longer Retry-After gives up instead of waiting
+REQUEST_TIMEOUT = 10      # Bound on waiting for a hedged pair when the caller gives none
+HEDGE_PER_HOST = 8        # Hedge-pool workers one host may hold at once
+HEDGE_MIN_SAMPLES = 20    # Latencies needed before hedging kicks in
+LATENCY_WINDOW = 200      # Recent latencies kept per host
+BREAKER_THRESHOLD = 5     # Consecutive failures that open a circuit
+BREAKER_COOLDOWN = 30     # Seconds an open circuit rejects calls
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a host whose circuit is open"""
+
+class CircuitBreaker:
+    """Closed -> open after repeated failures -> half-open trial after cooldown"""
+
+    def __init__(self, threshold=BREAKER_THRESHOLD, cooldown=BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.trial = False
+
+    def allow(self, now):
+        if self.opened_at is None:
+            return True
+        if now - self.opened_at >= self.cooldown and not self.trial:
+            self.trial = True  # Let a single call probe the host
+            return True
+        return False
+
+    def success(self):
+        self.failures = 0
+        self.opened_at = None
+        self.trial = False
+
+    def failure(self, now):
+        self.failures += 1
+        if self.trial or self.failures >= self.threshold:
+            self.opened_at = now
+            self.trial = False
+
+def retry_after(resp):
+    """Seconds a 429/503 response asks us to wait (Retry-After: seconds or HTTP date), else None"""
+    value = resp.headers.get("retry-after") if resp is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class Resilience:
+    """Retry, hedging and circuit breaking policy shared by all pools
+
+    Hedged requests run on one shared pool; each host may hold at most
+    hedge_per_host of its workers, so one slow host can't starve the rest.
+    A request that finds its host at the limit is sent inline, unhedged.
+    """
+
+    def __init__(self, max_retries=MAX_RETRIES, hedge=True, hedge_workers=64, hedge_per_host=HEDGE_PER_HOST):
+        self.max_retries = max_retries
+        self.hedge = hedge
+        self.hedge_per_host = hedge_per_host
+        self._lock = threading.Lock()
+        self._breakers = {}
+        self._latencies = {}
+        self._slots = {}
+        self._executor = ThreadPoolExecutor(max_workers=hedge_workers) if hedge else None
+        self.stats = {"requests": 0, "retried": 0, "hedged": 0, "short_circuited": 0}
+
+    def _count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def p95(self, host):
+        """95th percentile latency for a host, once enough samples exist"""
+        with self._lock:
+            samples = sorted(self._latencies.get(host, ()))
+        if len(samples) < HEDGE_MIN_SAMPLES:
+            return None
+        return samples[int(len(samples) * 0.95) - 1]
+
+    def _timed(self, host, send):
+        started = time.monotonic()
+        resp = send()
+        with self._lock:
+            self._latencies.setdefault(host, deque(maxlen=LATENCY_WINDOW)).append(time.monotonic() - started)
+        return resp
+
+    def _submit(self, host, send):
+        """Run send() on the hedge pool if the host has a free slot there, else None"""
+        with self._lock:
+            slot = self._slots.setdefault(host, threading.BoundedSemaphore(self.hedge_per_host))
+        if not slot.acquire(blocking=False):
+            return None
+        future = self._executor.submit(self._timed, host, send)
+        future.add_done_callback(lambda _: slot.release())
+        return future
+
+    def _hedged(self, host, send, timeout):
+        """Send, and race a duplicate if the first exceeds the host's p95
+
+        Waits are bounded by `timeout`; past it, or when both copies fail,
+        the error goes back to call() and its retry loop.
+        """
+        threshold = self.p95(host) if self.hedge else None
+        first = self._submit(host, send) if threshold is not None else None
+        if first is None:
+            return self._timed(host, send)
+        done, _ = wait([first], timeout=threshold)
+        if done:
+            return first.result()
+        second = self._submit(host, send)
+        if second is None:
+            return first.result(timeout=timeout)
+        self._count("hedged")
+        done, _ = wait([first, second], timeout=timeout, return_when=FIRST_COMPLETED)
+        if not done:
+            raise TimeoutError(f"no response from {host} within {timeout}s")
+        winner = done.pop()
+        if winner.exception() is None:
+            return winner.result()
+        # The other may still succeed, within what's left of the timeout
+        other = second if winner is first else first
+        try:
+            return other.result(timeout=timeout)
+        except FutureTimeout:
+            raise winner.exception()
+
+    def call(self, url, send, idempotent=True, timeout=None):
+        """Run send() under the policy; only idempotent calls are retried or hedged
+
+        Retries back off exponentially with jitter, or wait as long as a
+        429/503's Retry-After asks (giving up past RETRY_AFTER_CAP).
+        """
+        timeout = timeout or REQUEST_TIMEOUT
+        host = urlsplit(url).netloc
+        with self._lock:
+            self.stats["requests"] += 1
+            breaker = self._breakers.setdefault(host, CircuitBreaker())
+            allowed = breaker.allow(time.monotonic())
+        if not allowed:
+            self._count("short_circuited")
+            raise CircuitOpenError(f"circuit open for {host}")
+
+        attempts = self.max_retries + 1 if idempotent else 1
+        for attempt in range(attempts):
+            resp, error = None, None
+            try:
+                resp = self._hedged(host, send, timeout) if idempotent else self._timed(host, send)
+            except TRANSIENT_ERRORS as e:
+                error = e
+            if error is None and resp.status not in RETRY_STATUSES:
+                with self._lock:
+                    breaker.success()
+                return resp
+            with self._lock:
+                breaker.failure(time.monotonic())
+                allowed = breaker.allow(time.monotonic())
+            if attempt == attempts - 1 or not allowed:
+                break
+            delay = min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt) * random.uniform(0.5, 1.5)
+            asked = retry_after(resp) if error is None else None
+            if asked is not None:
+                if asked > RETRY_AFTER_CAP:
+                    break
+                delay = max(delay, asked)
+            self._count("retried")
+            time.sleep(delay)
+
+        if error is not None:
+            raise error
+        return resp
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
@@ -4,18 +4,43 @@ Daily Curator Pipeline
 Runs: SCAN → SCORE → GENERATE → PUBLISH
 """
 
+import json
 import sys
-from datetime import datetime
+from datetime import date, datetime
+from functools import partial
 from pathlib import Path
 
 # Add scripts dir to path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from scanner import run_scan
-from scorer import score_all_tools
+from scorer import SCORES_FILE, SCORING_CONFIG, SOURCE_NAMES, SOURCES_DIR, score_all_tools
 from generator_elite import generate_elite_html as generate_html
+from manifest import BASE_DIR, BuildManifest, digest, file_digest, source_files
+from pipeline import PipelineContext
+from search_index import ASSETS_DIR
 from publisher import git_push
 
+def score_inputs(ctx):
+    """SCORE reads the sources and aliases under today's decay and recency, and runs scorer plus its imports
+
+    tools.json is also its output.
+    """
+    files = [SOURCES_DIR / f"{name}.json" for name in SOURCE_NAMES] + [BASE_DIR / "data" / "aliases.json"]
+    code = source_files(Path(__file__).parent / "scorer.py")
+    return digest(date.today().isoformat(), SCORING_CONFIG, *(file_digest(f) for f in files + code))
+
+def scores_unchanged(ctx):
+    """A skipped SCORE moved no tool: keep the last scores, but none of their state changes"""
+    with open(SCORES_FILE) as f:
+        ctx.scores = json.load(f)
+    ctx.scores["state_changes"] = []
+
+def generate_inputs(ctx):
+    """GENERATE reads the catalog and runs generator_elite plus every module it imports"""
+    code = source_files(Path(__file__).parent / "generator_elite.py")
+    return digest(file_digest(ctx.storage.tools_file), *(file_digest(f) for f in code))
+
 def run_daily_update():
     """Run the full daily update pipeline"""
     print("\n" + "=" * 60)
@@ -23,17 +48,35 @@ def run_daily_update():
     print(f"   {datetime.now().strftime('%Y-%m-%d %H:%M:%S PST')}")
     print("=" * 60)
     
+    # Stages hand data along in memory; their files on disk are checkpoints.
+    # SCORE and GENERATE are skipped when the manifest shows nothing they
+    # read has changed and what they wrote is still on disk as they left it.
+    ctx = PipelineContext()
+    manifest = BuildManifest()
+    # (name, stage, its input key, its outputs, what to do instead when skipped)
     steps = [
-        ("SCAN", run_scan),
-        ("SCORE", score_all_tools),
-        ("GENERATE", generate_html),
-        ("PUBLISH", git_push)
+        ("SCAN", partial(run_scan, ctx=ctx), None, [], None),
+        ("SCORE", partial(score_all_tools, ctx=ctx), score_inputs, [ctx.storage.tools_file, SCORES_FILE],
+         scores_unchanged),
+        ("GENERATE", partial(generate_html, ctx=ctx), generate_inputs, [BASE_DIR / "index.html", ASSETS_DIR],
+         None),
+        ("PUBLISH", partial(git_push, ctx=ctx), None, [], None)
     ]
     
     results = {}
-    for name, func in steps:
+    for name, func, inputs, outputs, skipped in steps:
         try:
+            key = inputs(ctx) if inputs is not None else None
+            if key is not None and manifest.fresh(name, key):
+                print(f"\n⏭  {name} - inputs unchanged, skipped")
+                if skipped is not None:
+                    skipped(ctx)
+                results[name] = "✓"
+                continue
             result = func()
+            if key is not None:
+                manifest.record(name, key, outputs)
+                manifest.save()
             results[name] = "✓"
         except Exception as e:
             print(f"\n❌ {name} FAILED: {e}")
@@ -9,151 +9,344 @@ import os
 import sys
 from datetime import datetime, timedelta
 from pathlib import Path
-import subprocess
+from urllib.parse import urlencode
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout, wait
+
+from github_client import GitHubClient
+from hn_store import RETENTION_DAYS, HNItemStore
+from http_cache import ResponseCache
+from http_client import ConnectionPool, fetch_json_many
+from manifest import touch, write_if_changed
+from matcher import AI_MATCHER
+from rate_limit import PRIORITY_CATALOG, PRIORITY_DISCOVERY, RequestScheduler
+from resilience import Resilience
 
 # Paths
 BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / "data"
 SOURCES_DIR = DATA_DIR / "sources"
+TOOLS_FILE = DATA_DIR / "tools.json"
+
+# GitHub
+GITHUB_QUERY = "topic:ai topic:machine-learning stars:>1000 pushed:>2026-01-01"
+GITHUB_SEARCH_PAGES = 3  # 100 repos per page
+
+# HackerNews
+HN_API = "https://hacker-news.firebaseio.com/v0"
+HN_SEARCH_API = "https://hn.algolia.com/api/v1"
+HN_LISTS = ["topstories", "newstories", "showstories", "beststories"]
+HN_STORY_LIMIT = 500    # Ids to inspect per list
+HN_CONCURRENCY = 16     # Parallel item requests
+HN_TIMEOUT = 10         # Seconds per request
+HN_REFRESH_BATCH = 100  # Stories per bulk score refresh
+
+# Source registry: name -> fetcher, payload key in <name>.json, time budget (s)
+SOURCES = {}
+CANCEL_GRACE = 10       # Seconds to let cancelled sources wind down after their budget
+
+def register_source(name, payload_key, budget, catalog=False):
+    """Register a fetcher to run concurrently in run_scan
+
+    catalog=True fetchers also get the run's Catalog as `catalog`. A fetcher
+    raises when its source fails, so run_scan can fall back to the last good
+    data, and checks `cancel` between requests so it stops once over budget.
+    """
+    def decorator(func):
+        SOURCES[name] = {"fetch": func, "key": payload_key, "budget": budget, "catalog": catalog}
+        return func
+    return decorator
 
-def fetch_github_trending():
+def cancelled(cancel):
+    return cancel is not None and cancel.is_set()
+
+def load_last_good(name):
+    """Last payload a source wrote successfully, used when it fails or runs over budget"""
+    src = SOURCES[name]
+    src_file = SOURCES_DIR / f"{name}.json"
+    if src_file.exists():
+        try:
+            with open(src_file) as f:
+                return json.load(f).get(src["key"], [])
+        except (OSError, ValueError):
+            pass
+    return []
+
+@register_source("github", "repos", budget=60)
+def fetch_github_trending(cache=None, cancel=None, scheduler=None, resilience=None, client=None):
     """Fetch GitHub trending repos for AI/ML"""
     print("📡 Fetching GitHub trending...")
     
-    # Use gh CLI to search for trending AI repos
+    own_client = client is None
+    client = client or GitHubClient(cache=cache, scheduler=scheduler, resilience=resilience, cancel=cancel)
     try:
-        result = subprocess.run([
-            "gh", "api", "search/repositories",
-            "-X", "GET",
-            "-f", "q=topic:ai topic:machine-learning stars:>1000 pushed:>2026-01-01",
-            "-f", "sort=stars",
-            "-f", "order=desc",
-            "-f", "per_page=100"
-        ], capture_output=True, text=True)
+        items = client.search_repositories(GITHUB_QUERY, max_pages=GITHUB_SEARCH_PAGES, cancel=cancel)
+        if cancelled(cancel):
+            raise RuntimeError("cancelled, over time budget")
+        if not items:
+            print("  ⚠ Search returned no repos")
+            return []
+        
+        repos = []
+        for item in items:
+            repos.append({
+                "name": item["name"],
+                "full_name": item["full_name"],
+                "url": item["html_url"],
+                "description": item.get("description", ""),
+                "stars": item["stargazers_count"],
+                "forks": item["forks_count"],
+                "updated_at": item["updated_at"],
+                "topics": item.get("topics", [])
+            })
+        
+        if write_if_changed(SOURCES_DIR / "github.json", json.dumps({"repos": repos}, indent=2)):
+            touch("github_fetched_at")
         
-        if result.returncode == 0:
-            data = json.loads(result.stdout)
-            repos = []
-            for item in data.get("items", [])[:100]:
-                repos.append({
-                    "name": item["name"],
-                    "full_name": item["full_name"],
-                    "url": item["html_url"],
-                    "description": item.get("description", ""),
-                    "stars": item["stargazers_count"],
-                    "forks": item["forks_count"],
-                    "updated_at": item["updated_at"],
-                    "topics": item.get("topics", [])
-                })
-            
-            with open(SOURCES_DIR / "github.json", "w") as f:
-                json.dump({"fetched_at": datetime.now().isoformat(), "repos": repos}, f, indent=2)
-            
-            print(f"  ✓ Found {len(repos)} trending repos")
-            return repos
-    except Exception as e:
-        print(f"  ✗ GitHub fetch failed: {e}")
+        print(f"  ✓ Found {len(repos)} trending repos")
+        return repos
+    finally:
+        if own_client:
+            client.close()
+
+@register_source("github_repos", "repos", budget=60, catalog=True)
+def fetch_github_repo_signals(cache=None, cancel=None, scheduler=None, resilience=None, client=None,
+                              catalog=None):
+    """Fetch per-tool repo signals for catalog tools with a `github` repo
+
+    Reads tools.json unless the run's Catalog is passed in.
+    """
+    print("📡 Fetching GitHub repo signals...")
     
-    return []
+    own_client = client is None
+    client = client or GitHubClient(cache=cache, scheduler=scheduler, resilience=resilience, cancel=cancel)
+    try:
+        full_names = []
+        if catalog is not None:
+            full_names = [t.get("github") for t in catalog.tools if t.get("github")]
+        elif TOOLS_FILE.exists():
+            with open(TOOLS_FILE) as f:
+                full_names = [t["github"] for t in json.load(f).get("tools", []) if t.get("github")]
+        if not full_names:
+            print("  ⚠ No catalog tools have a github repo set")
+            return []
+        
+        # Commits over one day; signal_windows sums them into 30/90-day figures
+        repos = list(client.repo_signals(full_names, days=1, cancel=cancel).values())
+        if cancelled(cancel):
+            raise RuntimeError("cancelled, over time budget")
+        
+        if write_if_changed(SOURCES_DIR / "github_repos.json", json.dumps({"repos": repos}, indent=2)):
+            touch("github_repos_fetched_at")
+        
+        print(f"  ✓ Enriched {len(repos)}/{len(full_names)} repos in {client.requests} requests")
+        return repos
+    finally:
+        if own_client:
+            client.close()
+
+def refresh_hn_counts(store, story_ids, pool, cancel=None):
+    """Refresh score/descendants of known stories in bulk via HN search"""
+    refreshed = 0
+    for i in range(0, len(story_ids), HN_REFRESH_BATCH):
+        if cancelled(cancel):
+            break
+        batch = story_ids[i:i + HN_REFRESH_BATCH]
+        tags = "(" + ",".join(f"story_{story_id}" for story_id in batch) + ")"
+        url = f"{HN_SEARCH_API}/search?" + urlencode({"tags": tags, "hitsPerPage": len(batch)})
+        try:
+            hits = pool.request(url, priority=PRIORITY_CATALOG).json().get("hits", [])
+        except Exception:
+            continue
+        for hit in hits:
+            store.update_counts(int(hit["objectID"]), hit.get("points") or 0, hit.get("num_comments") or 0)
+            refreshed += 1
+    return refreshed
 
-def fetch_hackernews():
-    """Fetch HN front page and search for AI tools"""
+@register_source("hackernews", "stories", budget=120)
+def fetch_hackernews(limit=None, concurrency=None, timeout=None,
+                     cache=None, cancel=None, scheduler=None, resilience=None):
+    """Fetch HN story lists and search for AI tools, fetching only unseen items
+
+    hackernews.json lists the AI stories currently on a list, in rank order,
+    then unranked ones still in the store (up to hn_store.RETENTION_DAYS
+    old) by score.
+    """
     print("📡 Fetching HackerNews...")
     
+    limit = limit or HN_STORY_LIMIT
+    concurrency = concurrency or HN_CONCURRENCY
+    timeout = timeout or HN_TIMEOUT
+    pool = ConnectionPool(timeout=timeout, scheduler=scheduler, resilience=resilience, cancel=cancel)
+    store = HNItemStore(SOURCES_DIR / "hn_items.json")
     try:
-        import urllib.request
+        # Story lists, merged in rank order; id -> lists it appears in
+        lists = fetch_json_many([f"{HN_API}/{name}.json" for name in HN_LISTS],
+                                pool=pool, concurrency=concurrency, timeout=timeout, cache=cache, cancel=cancel,
+                                priority=PRIORITY_DISCOVERY)
+        if not any(lists):
+            raise RuntimeError("no story lists could be loaded")
+        ranked = {}
+        for name, ids in zip(HN_LISTS, lists):
+            for story_id in (ids or [])[:limit]:
+                ranked.setdefault(story_id, []).append(name)
+        
+        # Only ids never seen before need an item request
+        unseen = store.unseen(ranked)
+        unseen_ids = set(unseen)
+        items = fetch_json_many(
+            [f"{HN_API}/item/{story_id}.json" for story_id in unseen],
+            pool=pool, concurrency=concurrency, timeout=timeout, cache=cache, cancel=cancel,
+            priority=PRIORITY_DISCOVERY
+        )
         
-        # Get top stories
-        with urllib.request.urlopen("https://hacker-news.firebaseio.com/v0/topstories.json") as resp:
-            top_ids = json.loads(resp.read().decode())[:50]
+        # Whole-word AI keyword matching, one pass per title
+        fetched = [story for story in items if story and "id" in story]
+        for story, (terms, _) in zip(fetched, AI_MATCHER.match_many(s.get("title") for s in fetched)):
+            store.add(story, keep=bool(terms))
         
-        stories = []
-        ai_keywords = ['ai', 'gpt', 'llm', 'claude', 'openai', 'anthropic', 'chatgpt', 'copilot', 'agent', 'model']
+        # Known stories still ranked only need their counts refreshed
+        known = [story_id for story_id in ranked if story_id in store.items and story_id not in unseen_ids]
+        refreshed = refresh_hn_counts(store, known, pool, cancel)
+        if cancelled(cancel):
+            raise RuntimeError("cancelled, over time budget")
         
-        for story_id in top_ids[:30]:
-            try:
-                with urllib.request.urlopen(f"https://hacker-news.firebaseio.com/v0/item/{story_id}.json") as resp:
-                    story = json.loads(resp.read().decode())
-                    title = story.get("title", "").lower()
-                    if any(kw in title for kw in ai_keywords):
-                        stories.append({
-                            "id": story_id,
-                            "title": story.get("title"),
-                            "url": story.get("url"),
-                            "score": story.get("score", 0),
-                            "time": story.get("time")
-                        })
-            except:
-                continue
+        for story_id, item in store.items.items():
+            item["lists"] = ranked.get(story_id, [])
+        store.prune(ranked)
+        store.save()
         
-        with open(SOURCES_DIR / "hackernews.json", "w") as f:
-            json.dump({"fetched_at": datetime.now().isoformat(), "stories": stories}, f, indent=2)
+        stories = [
+            {
+                "id": item["id"],
+                "title": item["title"],
+                "url": item["url"],
+                "score": item["score"],
+                "time": item["time"]
+            }
+            for item in store.stories(ranked)
+        ]
         
-        print(f"  ✓ Found {len(stories)} AI-related stories")
+        failed = sum(1 for item in items if item is None)
+        listed = sum(1 for story_id in ranked if story_id in store.items)
+        
+        if write_if_changed(SOURCES_DIR / "hackernews.json", json.dumps({"stories": stories}, indent=2)):
+            touch("hackernews_fetched_at")
+        
+        print(f"  ✓ Tracking {len(stories)} AI-related stories: {listed} on a list now, "
+              f"{len(stories) - listed} unranked from the last {RETENTION_DAYS} days")
+        print(f"  ✓ Fetched {len(unseen)} unseen of {len(ranked)} listed ids, refreshed {refreshed}")
+        if failed:
+            print(f"  ⚠ {failed} items failed to load")
         return stories
-    except Exception as e:
-        print(f"  ✗ HN fetch failed: {e}")
-    
-    return []
+    finally:
+        pool.close()
 
-def fetch_producthunt():
+@register_source("producthunt", "products", budget=30)
+def fetch_producthunt(cache=None, cancel=None, scheduler=None, resilience=None):
     """Fetch recent Product Hunt AI launches"""
     print("📡 Fetching Product Hunt...")
     
     # For now, we'll use web scraping via the existing web_fetch capability
     # In production, would use PH API with proper auth
     
-    try:
-        # Placeholder - would need PH API key for real implementation
-        # For now, return empty and rely on manual additions
-        print("  ⚠ Product Hunt API not configured - using cached data")
-        
-        # Check if we have cached data
-        ph_file = SOURCES_DIR / "producthunt.json"
-        if ph_file.exists():
-            with open(ph_file) as f:
-                return json.load(f).get("products", [])
-    except Exception as e:
-        print(f"  ✗ PH fetch failed: {e}")
-    
-    return []
+    # Placeholder - would need PH API key for real implementation
+    # For now, return empty and rely on manual additions
+    print("  ⚠ Product Hunt API not configured - using cached data")
+    return load_last_good("producthunt")
 
-def fetch_twitter_mentions():
+@register_source("twitter", "mentions", budget=30)
+def fetch_twitter_mentions(cache=None, cancel=None, scheduler=None, resilience=None):
     """Fetch AI tool mentions from builder accounts"""
     print("📡 Fetching X/Twitter mentions...")
     
     # This would use the existing X API credentials
     # For now, placeholder
-    try:
-        print("  ⚠ Using cached Twitter data")
-        tw_file = SOURCES_DIR / "twitter.json"
-        if tw_file.exists():
-            with open(tw_file) as f:
-                return json.load(f).get("mentions", [])
-    except Exception as e:
-        print(f"  ✗ Twitter fetch failed: {e}")
-    
-    return []
+    print("  ⚠ Using cached Twitter data")
+    return load_last_good("twitter")
 
-def run_scan():
-    """Run full scan of all sources"""
+def scan_sources(results):
+    """Scan results shaped like scorer.load_sources(): {source: {payload key: items}}
+
+    A source that came back empty without writing its file still has
+    last run's data on disk, which is what the scorer would have read.
+    """
+    return {name: {src["key"]: results.get(name) or load_last_good(name)} for name, src in SOURCES.items()}
+
+def run_scan(cache=None, scheduler=None, resilience=None, ctx=None):
+    """Run full scan of all sources
+
+    The response cache, rate limit scheduler and retry policy are shared by
+    every source; pass them in to inspect their stats afterwards. With a
+    PipelineContext, results and sources are also left on it for SCORE.
+    """
     print(f"\n🔍 SCANNER - {datetime.now().strftime('%Y-%m-%d %H:%M')}")
     print("=" * 50)
     
     # Ensure directories exist
     SOURCES_DIR.mkdir(parents=True, exist_ok=True)
     
-    results = {
-        "timestamp": datetime.now().isoformat(),
-        "github": fetch_github_trending(),
-        "hackernews": fetch_hackernews(),
-        "producthunt": fetch_producthunt(),
-        "twitter": fetch_twitter_mentions()
-    }
-    
-    # Save combined results
-    with open(SOURCES_DIR / "latest_scan.json", "w") as f:
-        json.dump(results, f, indent=2)
+    own_resilience = resilience is None
+    cache = cache or ResponseCache(SOURCES_DIR / "cache")
+    scheduler = scheduler or RequestScheduler()
+    resilience = resilience or Resilience()
+    
+    results = {}
+    
+    # Run every registered source at once, each against its own time budget
+    start = time.monotonic()
+    executor = ThreadPoolExecutor(max_workers=len(SOURCES))
+    running = {}
+    for name, src in SOURCES.items():
+        cancel = threading.Event()
+        extra = {"catalog": ctx.catalog} if src["catalog"] and ctx is not None else {}
+        running[name] = (executor.submit(src["fetch"], cache=cache, cancel=cancel,
+                                         scheduler=scheduler, resilience=resilience, **extra), cancel)
+    
+    stale = []
+    for name, (future, cancel) in running.items():
+        remaining = start + SOURCES[name]["budget"] - time.monotonic()
+        try:
+            results[name] = future.result(timeout=max(0, remaining))
+        except FutureTimeout:
+            cancel.set()
+            results[name] = load_last_good(name)
+            stale.append(name)
+            print(f"  ✗ {name} exceeded its {SOURCES[name]['budget']}s budget - "
+                  f"using last good data ({len(results[name])} items)")
+        except Exception as e:
+            results[name] = load_last_good(name)
+            stale.append(name)
+            print(f"  ✗ {name} failed: {e} - using last good data ({len(results[name])} items)")
+    
+    # Cancelled sources stop at their next check; wait a bounded time for them to unwind
+    late = [future for future, _ in running.values() if not future.done()]
+    if late:
+        _, still_running = wait(late, timeout=CANCEL_GRACE)
+        if still_running:
+            print(f"  ⚠ {len(still_running)} cancelled sources still running after {CANCEL_GRACE}s")
+    executor.shutdown(wait=False, cancel_futures=True)
+    results["stale"] = stale
+    
+    evicted = cache.save()
+    stats = cache.stats
+    print(f"\n  ℹ Cache: {stats['fresh']} fresh, {stats['revalidated']} revalidated (304), "
+          f"{stats['miss']} downloaded, {stats['stale']} served stale, {evicted} evicted")
+    print(f"  ℹ Rate limits: waited {scheduler.waited:.1f}s for slots, {scheduler.throttled} throttled responses")
+    rs = resilience.stats
+    print(f"  ℹ Requests: {rs['requests']} sent, {rs['retried']} retried, {rs['hedged']} hedged, "
+          f"{rs['short_circuited']} short-circuited")
+    if own_resilience:
+        resilience.close()
+    
+    # Save combined results; when they last changed is in meta.json, not the file
+    if write_if_changed(SOURCES_DIR / "latest_scan.json", json.dumps(results, indent=2)):
+        touch("scanned_at")
+    
+    if ctx is not None:
+        ctx.scan = results
+        ctx.sources = scan_sources(results)
     
     print("\n✅ Scan complete")
     return results
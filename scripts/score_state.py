@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Score State - Per-tool input fingerprints from the last scoring run
+A tool is rescored only when its inputs or its time-decay bucket changed
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+from manifest import write_if_changed
+
+BASE_DIR = Path(__file__).parent.parent
+STATE_FILE = BASE_DIR / "data" / "score_state.json"
+
+def fingerprint(tool, repo, story, config, velocity=None):
+    """Short stable hash of everything score_tool reads, except the clock"""
+    inputs = (
+        config,
+        sorted((velocity or {}).items()),
+        None if repo is None else (repo.get("stars", 0), repo.get("updated_at", "")),
+        None if story is None else story.get("score", 0),
+        tool.get("last_signal_date"),
+        tool.get("pricing", ""),
+        tool.get("tags", []),
+        tool.get("category"),
+        tool.get("state"),
+        "waitlist" in tool.get("description", "").lower(),
+    )
+    return hashlib.blake2b(repr(inputs).encode(), digest_size=8).hexdigest()
+
+class ScoreState:
+    """tool id -> [fingerprint, recency bucket, decay bucket]"""
+
+    def __init__(self, config, path=STATE_FILE):
+        self.path = Path(path)
+        self.config = config
+        self.tools = {}
+        if self.path.exists():
+            try:
+                with open(self.path) as f:
+                    data = json.load(f)
+                # Different scoring rules invalidate every stored fingerprint
+                if data.get("config") == config:
+                    self.tools = data.get("tools", {})
+            except (OSError, ValueError):
+                pass
+        self.stats = {"new": 0, "changed": 0, "decayed": 0, "skipped": 0}
+
+    def check(self, tool, entry):
+        """True if the tool must be rescored; counts why"""
+        stored = self.tools.get(tool["id"])
+        if stored is None or "scores" not in tool:
+            reason = "new"
+        elif stored[0] != entry[0]:
+            reason = "changed"
+        elif stored[1:] != entry[1:]:
+            reason = "decayed"
+        else:
+            reason = "skipped"
+        self.stats[reason] += 1
+        return reason != "skipped"
+
+    def save(self, entries):
+        """Replace the stored state with this run's entries (drops removed tools)"""
+        self.tools = entries
+        write_if_changed(self.path, json.dumps({"config": self.config, "tools": entries}))
@@ -3,72 +3,114 @@
 Scorer - Calculate activity and relevance scores for tools
 """
 
+import hashlib
 import json
+import sys
 from datetime import datetime, timedelta
 from pathlib import Path
 
+from catalog import BUDGET_PRICES
+from fuzzy_index import load_aliases
+from parallel import fork_map, pool_size
+from history import HistoryStore, row_for
+from manifest import touch, write_if_changed
+from score_state import ScoreState, fingerprint
+from signal_index import SignalIndex
+from signal_ledger import SignalLedger, signal_time
+from signal_windows import SignalWindows
+from storage import get_storage
+
 BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / "data"
 TOOLS_FILE = DATA_DIR / "tools.json"
 SCORES_FILE = DATA_DIR / "scores.json"
 SOURCES_DIR = DATA_DIR / "sources"
+SOURCE_NAMES = ["github", "github_repos", "hackernews", "producthunt", "twitter"]
+
+# Relevance inputs, shared with the batch engine (pricing tiers: catalog.pricing_tier)
+HIGH_VALUE_CATEGORIES = ["coding", "automation", "agents", "productivity"]
+PRICING_POINTS = {"free": 20, "budget": 15, "enterprise": 5, "paid": 10}
+HOT_TAGS = ["hot", "trending", "new", "ai-native"]
+
+# Combined score thresholds
+ACTIVE_THRESHOLD = 40
+WATCHLIST_THRESHOLD = 25
+
+# Catalogs smaller than this score faster than a process pool starts
+PARALLEL_MIN_TOOLS = 5000
 
-def load_tools():
-    """Load tools database"""
-    if TOOLS_FILE.exists():
-        with open(TOOLS_FILE) as f:
-            return json.load(f)
-    return {"tools": [], "graveyard": []}
+# Days of commits, stars gained and mentions counted as velocity (see signal_windows)
+VELOCITY_WINDOW = 30
+
+# Bump when the scoring math changes; stored fingerprints from another config are ignored
+SCORING_VERSION = 2
+SCORING_CONFIG = hashlib.sha1(repr((
+    SCORING_VERSION, HIGH_VALUE_CATEGORIES, BUDGET_PRICES, PRICING_POINTS, HOT_TAGS,
+    ACTIVE_THRESHOLD, WATCHLIST_THRESHOLD, VELOCITY_WINDOW
+)).encode()).hexdigest()[:12]
+
+def load_tools(storage=None):
+    """Load tools database as a Catalog"""
+    return (storage or get_storage()).load()
 
 def load_sources():
     """Load latest scan data"""
     sources = {}
-    for src in ["github", "hackernews", "producthunt", "twitter"]:
+    for src in SOURCE_NAMES:
         src_file = SOURCES_DIR / f"{src}.json"
         if src_file.exists():
             with open(src_file) as f:
                 sources[src] = json.load(f)
     return sources
 
-def calculate_activity_score(tool, sources):
-    """Calculate activity score based on signals"""
+def calculate_activity_score(tool, sources, index=None, velocity=None):
+    """Calculate activity score based on signals
+
+    Pass a SignalIndex built once for the whole catalog; without one, a
+    single-tool index is built from `sources`. `velocity` is the tool's
+    SignalWindows.velocity() over VELOCITY_WINDOW days, if tracked.
+    """
     score = 50  # Base score
     
-    tool_name = tool.get("name", "").lower()
-    tool_url = tool.get("url", "").lower()
+    if index is None:
+        index = SignalIndex([tool], sources)
     
     # GitHub signals
-    github_data = sources.get("github", {}).get("repos", [])
-    for repo in github_data:
-        repo_name = repo.get("name", "").lower()
-        if tool_name in repo_name or repo_name in tool_name:
-            # Found matching repo
-            stars = repo.get("stars", 0)
-            score += min(stars / 1000, 25)  # Max 25 points from stars
-            
-            # Recent activity bonus
-            updated = repo.get("updated_at", "")
-            if updated:
-                try:
-                    updated_date = datetime.fromisoformat(updated.replace("Z", "+00:00"))
-                    days_ago = (datetime.now(updated_date.tzinfo) - updated_date).days
-                    if days_ago < 7:
-                        score += 20
-                    elif days_ago < 30:
-                        score += 10
-                except:
-                    pass
-            break
+    repo, _ = index.match_github(tool)
+    if repo is not None:
+        stars = repo.get("stars", 0)
+        score += min(stars / 1000, 25)  # Max 25 points from stars
+        
+        # Recent activity bonus
+        updated = repo.get("updated_at", "")
+        if updated:
+            try:
+                updated_date = datetime.fromisoformat(updated.replace("Z", "+00:00"))
+                days_ago = (datetime.now(updated_date.tzinfo) - updated_date).days
+                if days_ago < 7:
+                    score += 20
+                elif days_ago < 30:
+                    score += 10
+            except:
+                pass
     
     # HackerNews signals
-    hn_data = sources.get("hackernews", {}).get("stories", [])
-    for story in hn_data:
-        title = story.get("title", "").lower()
-        url = story.get("url", "") or ""
-        if tool_name in title or tool_url in url.lower():
-            hn_score = story.get("score", 0)
-            score += min(hn_score / 10, 35)  # Max 35 points
-            break
+    story, _ = index.match_hackernews(tool)
+    if story is not None:
+        hn_score = story.get("score", 0)
+        score += min(hn_score / 10, 35)  # Max 35 points
+    
+    # Velocity over the last VELOCITY_WINDOW days
+    if velocity:
+        commits = velocity.get("commits", 0)
+        if commits > 0:
+            score += 25 if commits > 10 else commits * 2.5
+        stars_gained = velocity.get("stars_gained", 0)
+        if stars_gained > 0:
+            score += min(stars_gained / 100, 20)  # Max 20 points
+        mentions = velocity.get("twitter_mentions", 0)
+        if mentions > 0:
+            score += min(mentions * 15, 45)  # Max 45 points
     
     # Check for inactivity
     last_signal = tool.get("last_signal_date")
@@ -90,8 +132,7 @@ def calculate_relevance_score(tool):
     score = 0
     
     # Builder utility (based on category and tags)
-    high_value_categories = ["coding", "automation", "agents", "productivity"]
-    if tool.get("category") in high_value_categories:
+    if tool.get("category") in HIGH_VALUE_CATEGORIES:
         score += 25
     else:
         score += 15
@@ -100,7 +141,7 @@ def calculate_relevance_score(tool):
     pricing = tool.get("pricing", "").lower()
     if "free" in pricing:
         score += 20
-    elif any(x in pricing for x in ["$10", "$15", "$20", "$25", "$29", "$30"]):
+    elif any(x in pricing for x in BUDGET_PRICES):
         score += 15
     elif "enterprise" in pricing:
         score += 5
@@ -108,9 +149,8 @@ def calculate_relevance_score(tool):
         score += 10
     
     # Tags bonus
-    hot_tags = ["hot", "trending", "new", "ai-native"]
     for tag in tool.get("tags", []):
-        if tag in hot_tags:
+        if tag in HOT_TAGS:
             score += 10
             break
     
@@ -122,32 +162,115 @@ def calculate_relevance_score(tool):
     
     return max(0, min(100, score))
 
-def score_all_tools():
-    """Score all tools and update database"""
+def determine_state(combined):
+    if combined >= ACTIVE_THRESHOLD:
+        return "ACTIVE"
+    if combined >= WATCHLIST_THRESHOLD:
+        return "WATCHLIST"
+    return "GRAVEYARD"
+
+def score_tool(tool, sources, index=None, velocity=None):
+    """(activity, relevance, combined, state) for one tool, unrounded"""
+    activity = calculate_activity_score(tool, sources, index, velocity)
+    relevance = calculate_relevance_score(tool)
+    combined = (activity * 0.6) + (relevance * 0.4)
+    return activity, relevance, combined, determine_state(combined)
+
+def _match_chunk(shared, start, end):
+    """{source: (position in index.signals[source] or None, rule)} for tools[start:end]"""
+    tools, index, positions = shared
+    return [{src: (None if item is None else positions[src][id(item)], rule)
+             for src, (item, rule) in index.match(tool).items()} for tool in tools[start:end]]
+
+def _score_chunk(shared, start, end):
+    dirty, sources, index, now, velocity, batch = shared
+    if batch:
+        from batch_scorer import score_batch
+        return score_batch(dirty[start:end], sources, index, now, velocity)
+    return [score_tool(tool, sources, index, velocity[tool["id"]]) for tool in dirty[start:end]]
+
+def score_all_tools(batch=None, full=False, ctx=None, workers=None):
+    """Score all tools and update database
+
+    batch=True scores the whole catalog as columns (see batch_scorer);
+    results are identical to scoring tool by tool. It needs NumPy, so the
+    default (None) batches only when NumPy is installed. Only tools whose
+    inputs or decay buckets changed since the last run are rescored (see
+    score_state); full=True rescores everything.
+    
+    Signal resolution, matching and scoring run on `workers` forked
+    processes (default: every core once the catalog has PARALLEL_MIN_TOOLS
+    tools). Workers inherit the index and catalog and only hand back
+    positions and scores, merged in catalog order, so the output is the
+    same as a serial run's.
+    
+    With a PipelineContext, the catalog and sources come from earlier stages
+    and the summary is left on ctx.scores; files are written either way.
+    """
+    from batch_scorer import HAVE_NUMPY, decay_points, recency_points
+    
+    if batch is None:
+        batch = HAVE_NUMPY
+    
     print(f"\n📊 SCORER - {datetime.now().strftime('%Y-%m-%d %H:%M')}")
     print("=" * 50)
     
-    db = load_tools()
-    sources = load_sources()
+    storage = ctx.storage if ctx is not None else get_storage()
+    catalog = storage.load()
+    sources = ctx.sources if ctx is not None and ctx.sources is not None else load_sources()
+    tools = catalog.tools
+    workers = pool_size(len(tools), workers, PARALLEL_MIN_TOOLS)
+    if workers > 1:
+        print(f"  ℹ Using {workers} worker processes")
+    
+    # Name/slug/domain lookups for every tool, built once
+    index = SignalIndex(tools, sources, load_aliases(), workers)
+    positions = {src: {id(item): n for n, item in enumerate(items)} for src, items in index.signals.items()}
+    found = fork_map(_match_chunk, len(tools), workers, (tools, index, positions))
+    
+    # Fingerprint every tool; only dirty ones go through the scoring math
+    state = ScoreState(SCORING_CONFIG)
+    now = datetime.now()
+    recency, decay = recency_points(now), decay_points(now)
+    windows = SignalWindows()
+    windows.advance(now.date())
+    repo_signals = {(r.get("full_name") or "").lower(): r for r in sources.get("github_repos", {}).get("repos", [])}
+    ledger = SignalLedger()
+    matches, signals, velocity, entries, dirty = {}, {}, {}, {}, []
+    logged = refreshed = 0
+    for tool, row in zip(tools, found):
+        (repo, repo_rule), (story, story_rule), (mention, _), (product, _) = (
+            (None if n is None else index.signals[src][n], rule) for src, (n, rule) in row.items())
+        matches[tool["id"]] = {"github": repo_rule, "hackernews": story_rule}
+        signals[tool["id"]] = (repo, story)
+        
+        # Every matched signal goes in the ledger; its latest keeps last_signal_date current
+        for src, item in (("github", repo), ("hackernews", story), ("producthunt", product), ("twitter", mention)):
+            if item is not None:
+                logged += ledger.record(tool["id"], src, signal_time(src, item, now))
+        latest = (ledger.latest(tool["id"]) or "")[:10]
+        if latest > (tool.get("last_signal_date") or ""):
+            tool["last_signal_date"] = latest
+            refreshed += 1
+        
+        windows.observe(tool["id"], repo, story, mention, repo_signals.get(tool.repo_full_name))
+        velocity[tool["id"]] = windows.velocity(tool["id"], VELOCITY_WINDOW)
+        entry = [fingerprint(tool, repo, story, SCORING_CONFIG, velocity[tool["id"]]),
+                 recency(repo.get("updated_at", "")) if repo is not None else 0,
+                 decay(tool.get("last_signal_date"))]
+        entries[tool["id"]] = entry
+        if state.check(tool, entry) or full:
+            dirty.append(tool)
     
     scores = []
     state_changes = []
+    rules_fired = {}
     
-    for tool in db.get("tools", []):
-        activity = calculate_activity_score(tool, sources)
-        relevance = calculate_relevance_score(tool)
-        combined = (activity * 0.6) + (relevance * 0.4)
-        
+    results = fork_map(_score_chunk, len(dirty), workers, (dirty, sources, index, now, velocity, batch))
+    
+    for tool, (activity, relevance, combined, new_state) in zip(dirty, results):
         old_state = tool.get("state", "ACTIVE")
         
-        # Determine new state
-        if combined >= 40:
-            new_state = "ACTIVE"
-        elif combined >= 25:
-            new_state = "WATCHLIST"
-        else:
-            new_state = "GRAVEYARD"
-        
         # Update tool
         tool["scores"] = {
             "activity": round(activity, 1),
@@ -163,35 +286,55 @@ def score_all_tools():
                 "score": round(combined, 1)
             })
             tool["state"] = new_state
+    
+    for tool in tools:
+        matched = {src: rule for src, rule in matches[tool["id"]].items() if rule}
+        for src, rule in matched.items():
+            rules_fired[f"{src}:{rule}"] = rules_fired.get(f"{src}:{rule}", 0) + 1
         
         scores.append({
             "id": tool["id"],
             "name": tool["name"],
-            "combined": round(combined, 1)
+            "combined": tool["scores"]["combined"],
+            "matched": matched
         })
     
     # Sort by combined score
-    db["tools"].sort(key=lambda x: x.get("scores", {}).get("combined", 0), reverse=True)
+    tools.sort(key=lambda x: x.combined, reverse=True)
     
-    # Save updated database
-    with open(TOOLS_FILE, "w") as f:
-        json.dump(db, f, indent=2)
+    # Save updated database; nothing rescored means nothing to rewrite
+    if dirty:
+        storage.save(catalog, changed=dirty)
+    state.save(entries)
+    windows.retain(t["id"] for t in tools)
+    windows.save()
+    ledger.flush()
+    HistoryStore().record(now.strftime("%Y-%m-%d"), [row_for(t, *signals[t["id"]]) for t in tools])
     
-    # Save scores summary
-    with open(SCORES_FILE, "w") as f:
-        json.dump({
-            "timestamp": datetime.now().isoformat(),
-            "scores": sorted(scores, key=lambda x: x["combined"], reverse=True),
-            "state_changes": state_changes
-        }, f, indent=2)
+    # Save scores summary; an unchanged one is left as is (when it last changed is in meta.json)
+    summary = {
+        "scores": sorted(scores, key=lambda x: x["combined"], reverse=True),
+        "state_changes": state_changes
+    }
+    if write_if_changed(SCORES_FILE, json.dumps(summary, indent=2)):
+        touch("scored_at")
+    if ctx is not None:
+        ctx.scores = summary
     
-    print(f"  ✓ Scored {len(db['tools'])} tools")
+    stats = state.stats
+    why = "full rescore" if full else (f"{stats['new']} new, {stats['changed']} changed inputs, "
+                                       f"{stats['decayed']} decay buckets")
+    print(f"  ✓ Scored {len(dirty)} of {len(tools)} tools, skipped {len(tools) - len(dirty)} unchanged ({why})")
+    print(f"  ℹ Signal ledger: {logged} new signals, last_signal_date moved on {refreshed} tools")
+    if rules_fired:
+        print("  ℹ Signal matches: " + ", ".join(f"{k} ×{v}" for k, v in sorted(rules_fired.items())))
     if state_changes:
         print(f"  ⚠ {len(state_changes)} state changes:")
         for change in state_changes:
             print(f"    - {change['name']}: {change['old_state']} → {change['new_state']}")
     
-    return db
+    return catalog
 
 if __name__ == "__main__":
-    score_all_tools()
+    workers = int(sys.argv[sys.argv.index("--workers") + 1]) if "--workers" in sys.argv else None
+    score_all_tools(batch=False if "--per-tool" in sys.argv else None, full="--full" in sys.argv, workers=workers)
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Search Index - Word-prefix inverted index over the catalog, built at generate time
+The page's search runs in a Web Worker against this index and only shows or
+hides cards by id, instead of reading every card's text on each keystroke
+"""
+
+import json
+import re
+from bisect import bisect_left
+from pathlib import Path
+
+from manifest import write_hashed
+
+BASE_DIR = Path(__file__).parent.parent
+ASSETS_DIR = BASE_DIR / "assets"
+
+WORD = re.compile(r"[a-z0-9]+")   # The worker splits queries the same way
+MAX_TERMS = 8                     # Query words past this are ignored
+
+def words(text):
+    return WORD.findall(text.lower())
+
+def tool_words(tool, categories):
+    """Words a tool is found by: name, description, tags and category (id and label)"""
+    label = categories.get(tool.get("category"), ("", ""))[1]
+    fields = [tool.get("name", ""), tool.get("description", ""), " ".join(tool.get("tags", [])),
+              tool.get("category", ""), label]
+    return words(" ".join(f or "" for f in fields))
+
+def build_index(tools, categories):
+    """{"ids": [tool ids], "words": [sorted vocabulary], "postings": [[gaps between doc numbers]],
+        "categories": [category ids], "cats": [category number per tool]}
+
+    A query word matches every vocabulary word it is a prefix of, found by
+    binary search over the sorted list; a tool must match every query word.
+    Categories let the worker count matches per section, including tools
+    the page hasn't rendered.
+    """
+    vocab = {}
+    numbers = {}
+    cats = []
+    for doc, tool in enumerate(tools):
+        for word in set(tool_words(tool, categories)):
+            vocab.setdefault(word, []).append(doc)
+        cats.append(numbers.setdefault(tool.get("category", "other"), len(numbers)))
+    vocabulary = sorted(vocab)
+    postings = []
+    for word in vocabulary:
+        docs = vocab[word]
+        postings.append([docs[0]] + [b - a for a, b in zip(docs, docs[1:])])
+    return {"ids": [tool["id"] for tool in tools], "words": vocabulary, "postings": postings,
+            "categories": list(numbers), "cats": cats}
+
+def write_search_index(tools, categories, directory=ASSETS_DIR, stem="search"):
+    """Write the index as assets/<stem>-<hash>.json; returns its path relative to the page
+
+    Each generator passes its own stem, so neither prunes the other's index.
+    """
+    text = json.dumps(build_index(tools, categories), separators=(",", ":"))
+    return f"{Path(directory).name}/{write_hashed(directory, stem, text)}"
+
+def search(index, query):
+    """Matching ids, in index order (None for an empty query): what the worker returns"""
+    terms = words(query)[:MAX_TERMS]
+    if not terms:
+        return None
+    hits = [0] * len(index["ids"])
+    for n, term in enumerate(terms):
+        i = bisect_left(index["words"], term)
+        while i < len(index["words"]) and index["words"][i].startswith(term):
+            doc = 0
+            for gap in index["postings"][i]:
+                doc += gap
+                if hits[doc] == n:
+                    hits[doc] = n + 1
+            i += 1
+    return [tool_id for tool_id, hit in zip(index["ids"], hits) if hit == len(terms)]
+
+# Search worker (runs off the main thread) and the page code that drives it.
+# Cards carry data-id; sections with data-category hide when nothing in their
+# category matches. Results are also sent as a "search" event on document,
+# for lists the page renders itself (category shards).
+
+SEARCH_WORKER = """
+let ids = [], vocabulary = [], postings = [], categories = [], cats = [], hits = new Uint8Array(0);
+let loaded = null, skip = 0;
+
+function load(data) {
+    ids = data.ids;
+    vocabulary = data.words;
+    postings = data.postings;
+    categories = data.categories;
+    cats = data.cats;
+    hits = new Uint8Array(ids.length);
+}
+
+function lowerBound(prefix) {
+    let lo = 0, hi = vocabulary.length;
+    while (lo < hi) {
+        const mid = (lo + hi) >> 1;
+        if (vocabulary[mid] < prefix) lo = mid + 1; else hi = mid;
+    }
+    return lo;
+}
+
+function match(query) {
+    const terms = query.toLowerCase().split(/[^a-z0-9]+/).filter(Boolean).slice(0, %(max_terms)d);
+    if (!terms.length) return null;
+    hits.fill(0);
+    terms.forEach((term, n) => {
+        for (let i = lowerBound(term); i < vocabulary.length && vocabulary[i].startsWith(term); i++) {
+            let doc = 0;
+            for (const gap of postings[i]) {
+                doc += gap;
+                if (hits[doc] === n) hits[doc] = n + 1;
+            }
+        }
+    });
+    const docs = [];
+    for (let doc = 0; doc < ids.length; doc++) {
+        if (hits[doc] === terms.length) docs.push(doc);
+    }
+    return docs;
+}
+
+// Matches per category, leaving out the first `skip` tools (ones the page shows outside sections)
+function sections(docs) {
+    const counts = {};
+    for (const doc of docs) {
+        if (doc >= skip) counts[categories[cats[doc]]] = (counts[categories[cats[doc]]] || 0) + 1;
+    }
+    return counts;
+}
+
+onmessage = (e) => {
+    if (e.data.index) {
+        skip = e.data.skip || 0;
+        loaded = fetch(e.data.index).then(r => r.json()).then(load);
+        return;
+    }
+    loaded.then(() => {
+        const docs = match(e.data.q);
+        postMessage({ seq: e.data.seq, ids: docs && docs.map(doc => ids[doc]), sections: docs && sections(docs) });
+    });
+};
+""" % {"max_terms": MAX_TERMS}
+
+SEARCH_SCRIPT = """<script id="search-worker" type="text/plain">%s</script>
+    <script>
+        // Search: debounced queries go to a worker holding the prebuilt index;
+        // results come back as ids, and only cards whose visibility changes are touched
+        (() => {
+            const input = document.getElementById('search');
+            const sections = Array.from(document.querySelectorAll('[data-category]'), el => ({ el, shown: true }));
+            const cards = Array.from(document.querySelectorAll('[data-id]'), el => ({ el, id: el.dataset.id, shown: true }));
+            const source = document.getElementById('search-worker').textContent;
+            const worker = new Worker(URL.createObjectURL(new Blob([source], { type: 'text/javascript' })));
+            worker.postMessage({
+                index: new URL(input.dataset.index, location.href).href,
+                skip: Number(input.dataset.skip || 0)
+            });
+
+            let seq = 0, timer = null;
+            input.addEventListener('input', () => {
+                clearTimeout(timer);
+                timer = setTimeout(() => worker.postMessage({ seq: ++seq, q: input.value }), 80);
+            });
+
+            const show = (item, visible) => {
+                if (item.shown !== visible) {
+                    item.el.style.display = visible ? '' : 'none';
+                    item.shown = visible;
+                }
+            };
+            worker.onmessage = (e) => {
+                if (e.data.seq !== seq) return;  // A newer query is already on its way
+                const found = e.data.ids && new Set(e.data.ids);
+                for (const card of cards) show(card, !found || found.has(card.id));
+                sections.forEach(section => show(section, !found || e.data.sections[section.el.dataset.category] > 0));
+                document.dispatchEvent(new CustomEvent('search', { detail: { found, sections: e.data.sections } }));
+            };
+        })();
+    </script>""" % SEARCH_WORKER
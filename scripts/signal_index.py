@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Signal Index - Map normalized tool names, slugs and domains to source signals
+Built once per scoring run; each tool lookup is a few dict hits
+"""
+
+from catalog import as_tool, normalize, registered_domain
+from fuzzy_index import TrigramIndex
+from matcher import KeywordMatcher
+from parallel import fork_map
+
+MIN_NAME_LENGTH = 3   # Shorter names are too ambiguous to find in free text
+
+# source -> (payload key, field resolved to tools, free text?)
+SIGNALS = {"github": ("repos", "name", False), "hackernews": ("stories", "title", True),
+           "twitter": ("mentions", "text", True), "producthunt": ("products", "name", False)}
+
+def _title_terms(shared, start, end):
+    matcher, stories = shared
+    return [matcher.terms(story.get("title") or "") for story in stories[start:end]]
+
+def _resolve(shared, start, end):
+    """Fuzzy hits for each (source, signal) in the range"""
+    fuzzy, signals = shared
+    hits = []
+    for source, signal in signals[start:end]:
+        _, field, text = SIGNALS[source]
+        if text:
+            hits.append(fuzzy.resolve_text(signal.get(field), MIN_NAME_LENGTH))
+        else:
+            hit = fuzzy.resolve(signal.get(field))
+            hits.append([hit] if hit else [])
+    return hits
+
+# Hosts shared by many unrelated projects; their domain says nothing about a tool
+SHARED_HOSTS = {
+    "github.com", "github.io", "gitlab.com", "medium.com", "substack.com", "youtube.com",
+    "x.com", "twitter.com", "vercel.app", "netlify.app", "huggingface.co", "google.com",
+    "microsoft.com", "apple.com", "amazon.com", "news.ycombinator.com", "arxiv.org",
+}
+
+class SignalIndex:
+    """First matching GitHub repo and HN story per tool, with the rule that fired
+
+    GitHub rules, in order: "repo" (tool's github field or github.com URL),
+    "name" (normalized repo name == tool name), "slug" (== tool id).
+    HN rules: "domain" (story links to the tool's own domain), "title"
+    (tool name appears as a whole word in the title). Product Hunt:
+    "domain" (product links to the tool's domain).
+    All then fall back to "alias" / "fuzzy": the signal resolved to this
+    tool through the trigram index over names and the alias table. That is
+    also the only rule for tweets.
+    """
+
+    def __init__(self, tools, sources, aliases=None, workers=1):
+        """Title matching and fuzzy resolution of signals run on `workers` forked processes"""
+        self.signals = {source: sources.get(source, {}).get(key, []) for source, (key, _, _) in SIGNALS.items()}
+        repos, stories, products = self.signals["github"], self.signals["hackernews"], self.signals["producthunt"]
+
+        # Keep the first signal per key, matching the old scan-and-break order
+        self.repos_by_full_name = {}
+        self.repos_by_name = {}
+        for repo in repos:
+            self.repos_by_full_name.setdefault((repo.get("full_name") or "").lower(), repo)
+            self.repos_by_name.setdefault(normalize(repo.get("name")), repo)
+
+        self.stories_by_domain = {}
+        for story in stories:
+            domain = registered_domain(story.get("url") or "")
+            if domain and domain not in SHARED_HOSTS:
+                self.stories_by_domain.setdefault(domain, story)
+        self.products_by_domain = {}
+        for product in products:
+            domain = registered_domain(product.get("url") or "")
+            if domain and domain not in SHARED_HOSTS:
+                self.products_by_domain.setdefault(domain, product)
+
+        # One pass over all titles with a matcher compiled from every tool name
+        names = {t.get("name", "").lower(): 1.0 for t in tools if len(normalize(t.get("name"))) >= MIN_NAME_LENGTH}
+        title_matcher = KeywordMatcher(names, plurals=False)
+        self.stories_by_name = {}
+        for story, terms in zip(stories, fork_map(_title_terms, len(stories), workers, (title_matcher, stories))):
+            for term in terms:
+                self.stories_by_name.setdefault(term, story)
+
+        # Fallback: resolve each signal to its closest tool, keeping the best per tool
+        # (hits are kept in signal order, so the pool changes nothing about ties)
+        self.fuzzy = TrigramIndex.from_tools(tools, aliases)
+        self.fuzzy_repos, self.fuzzy_stories, self.fuzzy_mentions, self.fuzzy_products = {}, {}, {}, {}
+        best = {"github": self.fuzzy_repos, "hackernews": self.fuzzy_stories,
+                "twitter": self.fuzzy_mentions, "producthunt": self.fuzzy_products}
+        signals = [(source, signal) for source in SIGNALS for signal in self.signals[source]]
+        for (source, signal), hits in zip(signals, fork_map(_resolve, len(signals), workers, (self.fuzzy, signals))):
+            for hit in hits:
+                self._keep(best[source], hit, signal)
+
+    @staticmethod
+    def _keep(best, hit, signal):
+        tool_id, similarity, rule = hit
+        if tool_id not in best or similarity > best[tool_id][1]:
+            best[tool_id] = (signal, similarity, rule)
+
+    def _fuzzy(self, best, tool):
+        signal, _, rule = best.get(tool.get("id"), (None, None, None))
+        return signal, rule
+
+    def match_github(self, tool):
+        tool = as_tool(tool)
+        full_name = tool.repo_full_name
+        if full_name and full_name in self.repos_by_full_name:
+            return self.repos_by_full_name[full_name], "repo"
+        name = tool.name_key
+        if name and name in self.repos_by_name:
+            return self.repos_by_name[name], "name"
+        slug = tool.slug_key
+        if slug and slug in self.repos_by_name:
+            return self.repos_by_name[slug], "slug"
+        return self._fuzzy(self.fuzzy_repos, tool)
+
+    def match_hackernews(self, tool):
+        tool = as_tool(tool)
+        domain = tool.domain
+        if domain and domain not in SHARED_HOSTS and domain in self.stories_by_domain:
+            return self.stories_by_domain[domain], "domain"
+        story = self.stories_by_name.get(tool.name_lower)
+        if story is not None:
+            return story, "title"
+        return self._fuzzy(self.fuzzy_stories, tool)
+
+    def match_twitter(self, tool):
+        return self._fuzzy(self.fuzzy_mentions, tool)
+
+    def match_producthunt(self, tool):
+        tool = as_tool(tool)
+        domain = tool.domain
+        if domain and domain not in SHARED_HOSTS and domain in self.products_by_domain:
+            return self.products_by_domain[domain], "domain"
+        return self._fuzzy(self.fuzzy_products, tool)
+
+    def similarity(self, source, tool):
+        """Trigram similarity behind a fuzzy/alias match, else None"""
+        best = {"github": self.fuzzy_repos, "hackernews": self.fuzzy_stories, "twitter": self.fuzzy_mentions,
+                "producthunt": self.fuzzy_products}
+        return best[source].get(tool.get("id"), (None, None))[1]
+
+    def match(self, tool):
+        """{"github": (repo, rule), "hackernews": (story, rule), "twitter": (mention, rule),
+        "producthunt": (product, rule)}
+
+        (None, None) where nothing matched.
+        """
+        return {"github": self.match_github(tool), "hackernews": self.match_hackernews(tool),
+                "twitter": self.match_twitter(tool), "producthunt": self.match_producthunt(tool)}
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Signal Ledger - Append-only log of matched signals per tool
+One JSON line per observation (tool, source, timestamp), with a per-tool
+index of the latest signal and per-source counts kept next to it
+"""
+
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from manifest import write_if_changed
+
+BASE_DIR = Path(__file__).parent.parent
+LEDGER_FILE = BASE_DIR / "data" / "signals.jsonl"
+INDEX_FILE = BASE_DIR / "data" / "signals_index.json"
+
+RETENTION_DAYS = 180   # Older events are folded into one summary line per tool and source
+COMPACT_SLACK = 30     # ...once the oldest event is this many days past retention
+
+def _utc(value):
+    """ISO UTC timestamp ("...Z") from an ISO string, epoch seconds or datetime; None if unparseable"""
+    try:
+        if isinstance(value, (int, float)):
+            value = datetime.fromtimestamp(value, timezone.utc)
+        elif isinstance(value, str) and value:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        if not isinstance(value, datetime):
+            return None
+    except (OverflowError, OSError, ValueError):
+        return None
+    if value.tzinfo is None:
+        value = value.astimezone()   # Naive times are local, as datetime.now() gives
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def signal_time(source, item, now):
+    """When a matched signal happened: the repo's last push, the story's post time...
+
+    Signals without a timestamp of their own count as observed `now`.
+    """
+    if source == "github":
+        value = item.get("pushed_at") or item.get("updated_at")
+    elif source == "hackernews":
+        value = item.get("time")
+    else:
+        value = item.get("created_at") or item.get("featured_at") or item.get("date")
+    at = _utc(value) or _utc(now)
+    return min(at, _utc(now))   # Clock skew never puts a signal in the future
+
+class SignalLedger:
+    """data/signals.jsonl plus its index, data/signals_index.json
+
+    An observation is appended only if it is newer than the last one from
+    the same source for that tool, so a repo or story seen on every scan is
+    one event. The index is rebuilt from the ledger whenever it doesn't
+    match it; otherwise only lines appended since it was written are read.
+    """
+
+    def __init__(self, path=LEDGER_FILE, index_path=INDEX_FILE):
+        self.path = Path(path)
+        self.index_path = Path(index_path)
+        self.tools = {}      # tool id -> {"last": at, "sources": {source: [count, last at]}}
+        self.oldest = None
+        self.pending = []
+        self._load()
+
+    def _head(self):
+        """First ledger line; a compaction rewrites it, which invalidates the index"""
+        if not self.path.exists():
+            return ""
+        with open(self.path) as f:
+            return f.readline()
+
+    def _load(self):
+        offset = 0
+        try:
+            with open(self.index_path) as f:
+                data = json.load(f)
+            size = self.path.stat().st_size if self.path.exists() else 0
+            if data.get("head") == self._head() and data.get("offset", 0) <= size:
+                self.tools = data.get("tools", {})
+                self.oldest = data.get("oldest")
+                offset = data.get("offset", 0)
+        except (OSError, ValueError):
+            pass
+        if self.path.exists():
+            with open(self.path) as f:
+                f.seek(offset)
+                for line in f:
+                    if line.strip():
+                        self._apply(json.loads(line))
+
+    def _apply(self, event):
+        tool = self.tools.setdefault(event["tool"], {"last": None, "sources": {}})
+        count, last = tool["sources"].get(event["source"], (0, None))
+        tool["sources"][event["source"]] = [count + event.get("count", 1), max(last or "", event["at"])]
+        tool["last"] = max(tool["last"] or "", event["at"])
+        if "count" not in event:   # Summaries from an earlier compaction never expire again
+            self.oldest = min(self.oldest or event["at"], event["at"])
+
+    def record(self, tool_id, source, at):
+        """Log a signal at `at` (ISO UTC); False if not newer than the last from that source"""
+        _, last = self.tools.get(tool_id, {}).get("sources", {}).get(source, (0, None))
+        if last is not None and at <= last:
+            return False
+        event = {"tool": tool_id, "source": source, "at": at}
+        self._apply(event)
+        self.pending.append(event)
+        return True
+
+    def latest(self, tool_id):
+        """ISO UTC time of the tool's most recent signal, or None"""
+        return self.tools.get(tool_id, {}).get("last")
+
+    def counts(self, tool_id):
+        """{source: signals logged}"""
+        return {source: count for source, (count, _) in self.tools.get(tool_id, {}).get("sources", {}).items()}
+
+    def flush(self, now=None):
+        """Append pending events, compact if due, and write the index"""
+        if self.pending:
+            with open(self.path, "a") as f:
+                f.write("".join(json.dumps(event) + "\n" for event in self.pending))
+            self.pending = []
+        now = now or datetime.now(timezone.utc)
+        cutoff = _utc(now - timedelta(days=RETENTION_DAYS + COMPACT_SLACK))
+        if self.oldest is not None and self.oldest < cutoff:
+            self.compact(now)
+        self._write_index()
+
+    def compact(self, now=None):
+        """Fold events older than RETENTION_DAYS into one summary line per tool and source"""
+        now = now or datetime.now(timezone.utc)
+        cutoff = _utc(now - timedelta(days=RETENTION_DAYS))
+        folded, kept = {}, []
+        with open(self.path) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                event = json.loads(line)
+                if event["at"] >= cutoff:
+                    kept.append(line)
+                    continue
+                key = (event["tool"], event["source"])
+                summary = folded.setdefault(key, {"tool": event["tool"], "source": event["source"],
+                                                  "at": event["at"], "count": 0})
+                summary["at"] = max(summary["at"], event["at"])
+                summary["count"] += event.get("count", 1)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            f.write("".join(json.dumps(summary) + "\n" for summary in folded.values()))
+            f.write("".join(kept))
+        os.replace(tmp, self.path)
+
+        self.tools, self.oldest = {}, None
+        with open(self.path) as f:
+            for line in f:
+                self._apply(json.loads(line))
+        self._write_index()
+        return len(folded)
+
+    def _write_index(self):
+        text = json.dumps({
+            "head": self._head(),
+            "offset": self.path.stat().st_size if self.path.exists() else 0,
+            "oldest": self.oldest,
+            "tools": self.tools
+        })
+        write_if_changed(self.index_path, text)
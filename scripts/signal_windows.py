@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Signal Windows - Rolling per-tool signal totals over the last HORIZON days
+Each tool keeps a ring of running totals, one slot per day, so recording a
+day is O(1) per tool and any window up to HORIZON days is one subtraction
+"""
+
+import json
+from datetime import date
+from pathlib import Path
+
+from manifest import write_if_changed
+
+BASE_DIR = Path(__file__).parent.parent
+WINDOWS_FILE = BASE_DIR / "data" / "signal_windows.json"
+
+HORIZON = 90          # Longest window that can be asked for, in days
+SIZE = HORIZON + 1    # Ring slots: today plus HORIZON days back
+
+# Daily counts, summed over a window; "stars" is a level, read as the gain across one
+COUNTS = ("commits", "hn_mentions", "twitter_mentions")
+
+def _event_key(item):
+    """Stable key for a story or tweet, so one seen on several days counts once"""
+    if item.get("id") is not None:
+        return str(item["id"])
+    return item.get("url") or item.get("text") or ""
+
+class SignalWindows:
+    """tool id -> {metric: ring of running totals}, plus recently counted events
+
+    ring[d % SIZE] is the running total at the end of day d (a date
+    ordinal). Days between runs carry the last total forward. Recording a
+    day again (another run the same day) replaces that day's figures.
+    """
+
+    def __init__(self, path=WINDOWS_FILE):
+        self.path = Path(path)
+        self.day = None
+        self.rings = {}
+        self.seen = {}    # tool id -> {event key: day first counted}
+        if self.path.exists():
+            try:
+                with open(self.path) as f:
+                    data = json.load(f)
+                if data.get("horizon") == HORIZON:
+                    self.day = date.fromisoformat(data["day"]).toordinal()
+                    self.rings = data.get("tools", {})
+                    self.seen = data.get("seen", {})
+            except (OSError, ValueError, KeyError):
+                pass
+
+    def advance(self, day):
+        """Move to `day` (a date), carrying every total over the days in between"""
+        day = day.toordinal()
+        if self.day is not None:
+            if day <= self.day:
+                return  # Same day again (or the clock went back): keep today's slot
+            gap = min(day - self.day, SIZE)
+            last = self.day % SIZE
+            for rings in self.rings.values():
+                for ring in rings.values():
+                    total = ring[last]
+                    for d in range(day - gap + 1, day + 1):
+                        ring[d % SIZE] = total
+        self.day = day
+
+    def _ring(self, tool_id, metric, fill=0):
+        rings = self.rings.setdefault(tool_id, {})
+        if metric not in rings:
+            rings[metric] = [fill] * SIZE
+        return rings[metric]
+
+    def set_level(self, tool_id, metric, value):
+        """Today's reading of a level such as stars; the first reading fills the ring"""
+        self._ring(tool_id, metric, value)[self.day % SIZE] = value
+
+    def set_count(self, tool_id, metric, count):
+        """Today's count of a daily metric such as commits"""
+        ring = self._ring(tool_id, metric)
+        ring[self.day % SIZE] = ring[(self.day - 1) % SIZE] + count
+
+    def set_events(self, tool_id, metric, items):
+        """Today's count is the events in `items` not counted on an earlier day"""
+        seen = self.seen.setdefault(tool_id, {})
+        count = 0
+        for item in items:
+            key = f"{metric}:{_event_key(item)}"
+            if seen.setdefault(key, self.day) == self.day:
+                count += 1
+        self.set_count(tool_id, metric, count)
+
+    def observe(self, tool_id, repo=None, story=None, mention=None, repo_signals=None):
+        """Record today's matched signals for one tool"""
+        if repo is not None and "stars" in repo:
+            self.set_level(tool_id, "stars", repo["stars"])
+        self.set_count(tool_id, "commits", (repo_signals or {}).get("commits_1d", 0))
+        self.set_events(tool_id, "hn_mentions", [story] if story is not None else [])
+        self.set_events(tool_id, "twitter_mentions", [mention] if mention is not None else [])
+
+    def window(self, tool_id, metric, days):
+        """Total of a count, or change in a level, over the last `days` days"""
+        if not 0 < days <= HORIZON:
+            raise ValueError(f"window must be 1..{HORIZON} days, got {days}")
+        ring = self.rings.get(tool_id, {}).get(metric)
+        if ring is None:
+            return 0
+        return ring[self.day % SIZE] - ring[(self.day - days) % SIZE]
+
+    def velocity(self, tool_id, days=30):
+        """{"commits", "stars_gained", "hn_mentions", "twitter_mentions"} over `days`"""
+        return {
+            "commits": self.window(tool_id, "commits", days),
+            "stars_gained": self.window(tool_id, "stars", days),
+            "hn_mentions": self.window(tool_id, "hn_mentions", days),
+            "twitter_mentions": self.window(tool_id, "twitter_mentions", days),
+        }
+
+    def retain(self, tool_ids):
+        """Forget tools that left the catalog"""
+        tool_ids = set(tool_ids)
+        self.rings = {k: v for k, v in self.rings.items() if k in tool_ids}
+        self.seen = {k: v for k, v in self.seen.items() if k in tool_ids}
+
+    def save(self):
+        """Write the rings, dropping ones with nothing left in the horizon"""
+        for tool_id in list(self.rings):
+            rings = self.rings[tool_id]
+            for metric in [m for m in COUNTS if m in rings and min(rings[m]) == max(rings[m])]:
+                del rings[metric]
+            if not rings:
+                del self.rings[tool_id]
+        for tool_id in list(self.seen):
+            self.seen[tool_id] = {k: d for k, d in self.seen[tool_id].items() if self.day - d < SIZE}
+            if not self.seen[tool_id]:
+                del self.seen[tool_id]
+        text = json.dumps({
+            "day": date.fromordinal(self.day).isoformat(),
+            "horizon": HORIZON,
+            "tools": self.rings,
+            "seen": self.seen
+        })
+        write_if_changed(self.path, text)
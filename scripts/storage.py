@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Storage - Catalog backends behind one interface
+"json" keeps tools.json as the only store; "sqlite" adds an indexed
+database with per-tool upserts and exports a byte-identical tools.json.
+Pick one with the CATALOG_BACKEND environment variable.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from catalog import TOOLS_FILE, Catalog
+
+BASE_DIR = Path(__file__).parent.parent
+DB_FILE = BASE_DIR / "data" / "catalog.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tools (
+    id TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    state TEXT,
+    category TEXT,
+    combined REAL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tools_state ON tools (state);
+CREATE INDEX IF NOT EXISTS tools_category ON tools (category, combined DESC, position);
+CREATE INDEX IF NOT EXISTS tools_combined ON tools (combined DESC, position);
+CREATE TABLE IF NOT EXISTS graveyard (position INTEGER PRIMARY KEY, id TEXT, data TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS graveyard_id ON graveyard (id);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+def _digest(text):
+    return hashlib.sha1(text.encode()).hexdigest()
+
+def _ranked(tools):
+    """Best combined score first; ties keep catalog order"""
+    return sorted(tools, key=lambda t: t.combined, reverse=True)
+
+class JsonStorage:
+    """tools.json read once per run and rewritten in full on save"""
+
+    name = "json"
+
+    def __init__(self, tools_file=TOOLS_FILE):
+        self.tools_file = Path(tools_file)
+        self._catalog = None
+
+    def load(self):
+        if self._catalog is None:
+            self._catalog = Catalog.load(self.tools_file)
+        return self._catalog
+
+    def save(self, catalog, changed=None):
+        """Persist the catalog; `changed` (tools rescored) doesn't matter here"""
+        self._catalog = catalog
+        catalog.save(self.tools_file)
+
+    def active(self, category=None, limit=None):
+        """Non-graveyard tools by combined score, optionally in one category"""
+        tools = [t for t in self.load().tools
+                 if t.get("state") != "GRAVEYARD" and (category is None or t.get("category") == category)]
+        return _ranked(tools)[:limit]
+
+    def graveyard(self):
+        return self.load().graveyard
+
+    def close(self):
+        pass
+
+class SQLiteStorage:
+    """Catalog rows in SQLite, indexed on id, state, category and combined score
+
+    tools.json stays the file people edit and the site reads: it is exported
+    after every save, and re-imported whenever it no longer matches the last
+    export (someone edited it by hand).
+    """
+
+    name = "sqlite"
+
+    def __init__(self, db_file=DB_FILE, tools_file=TOOLS_FILE):
+        self.tools_file = Path(tools_file)
+        self.conn = sqlite3.connect(db_file)
+        self.conn.executescript(SCHEMA)
+        self._catalog = None
+        self._by_id = {}
+        self._positions = {}
+
+    def _meta(self, key, default=None):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def _set_meta(self, key, value):
+        self.conn.execute("INSERT INTO meta (key, value) VALUES (?, ?) "
+                          "ON CONFLICT (key) DO UPDATE SET value = excluded.value", (key, json.dumps(value)))
+
+    def _in_sync(self):
+        if not self.tools_file.exists():
+            return self._meta("export_sha1") is not None
+        return _digest(self.tools_file.read_text()) == self._meta("export_sha1")
+
+    def import_json(self):
+        """Replace the database contents with tools.json"""
+        catalog = Catalog.load(self.tools_file)
+        with self.conn:
+            self.conn.execute("DELETE FROM tools")
+            self.conn.execute("DELETE FROM graveyard")
+            self._positions = {}
+            self._write(catalog, catalog.tools)
+            self._set_meta("export_sha1", _digest(catalog.to_json()))
+        return catalog
+
+    def load(self):
+        if self._catalog is not None:
+            return self._catalog
+        if not self._in_sync():
+            return self._loaded(self.import_json())
+        rows = self.conn.execute("SELECT id, position, data FROM tools ORDER BY position").fetchall()
+        self._positions = {tool_id: position for tool_id, position, _ in rows}
+        parts = {
+            "tools": [json.loads(data) for _, _, data in rows],
+            "graveyard": [json.loads(data) for (data,) in
+                          self.conn.execute("SELECT data FROM graveyard ORDER BY position")]
+        }
+        extra = self._meta("extra", {})
+        keys = self._meta("keys", ["tools", "graveyard"])
+        return self._loaded(Catalog.from_dict({k: parts[k] if k in parts else extra[k] for k in keys}))
+
+    def _loaded(self, catalog):
+        self._catalog = catalog
+        self._by_id = {t["id"]: t for t in catalog.tools}
+        return catalog
+
+    def _write(self, catalog, changed):
+        """Upsert changed tools, renumber moved ones, drop removed ones"""
+        self.conn.executemany(
+            "INSERT INTO tools (id, position, state, category, combined, data) VALUES (?, 0, ?, ?, ?, ?) "
+            "ON CONFLICT (id) DO UPDATE SET state = excluded.state, category = excluded.category, "
+            "combined = excluded.combined, data = excluded.data",
+            [(t["id"], t.get("state"), t.get("category"), t.combined, json.dumps(t.to_dict())) for t in changed])
+
+        positions = {t["id"]: n for n, t in enumerate(catalog.tools)}
+        self.conn.executemany("UPDATE tools SET position = ? WHERE id = ?",
+                              [(n, tool_id) for tool_id, n in positions.items()
+                               if self._positions.get(tool_id) != n])
+        self.conn.executemany("DELETE FROM tools WHERE id = ?",
+                              [(tool_id,) for tool_id in self._positions if tool_id not in positions])
+        self._positions = positions
+
+        self.conn.execute("DELETE FROM graveyard")
+        self.conn.executemany("INSERT INTO graveyard (position, id, data) VALUES (?, ?, ?)",
+                              [(n, g.get("id"), json.dumps(g)) for n, g in enumerate(catalog.graveyard)])
+        self._set_meta("keys", list(catalog.keys()))
+        self._set_meta("extra", catalog.extra)
+
+    def save(self, catalog, changed=None):
+        """Upsert `changed` tools (all if None) in one transaction, then export tools.json"""
+        self.load()
+        with self.conn:
+            self._write(catalog, catalog.tools if changed is None else changed)
+            text = catalog.save(self.tools_file)
+            self._set_meta("export_sha1", _digest(text))
+        self._loaded(catalog)
+
+    def active(self, category=None, limit=None):
+        """Non-graveyard tools by combined score, optionally in one category (index scan)"""
+        self.load()
+        sql = "SELECT id FROM tools WHERE state IS NOT 'GRAVEYARD'"
+        params = []
+        if category is not None:
+            sql += " AND category = ?"
+            params.append(category)
+        sql += " ORDER BY combined DESC, position"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [self._by_id[tool_id] for (tool_id,) in self.conn.execute(sql, params)]
+
+    def graveyard(self):
+        return self.load().graveyard
+
+    def close(self):
+        self.conn.close()
+
+BACKENDS = {"json": JsonStorage, "sqlite": SQLiteStorage}
+
+def get_storage(backend=None):
+    """Storage for `backend`, else $CATALOG_BACKEND, else "json" """
+    backend = backend or os.environ.get("CATALOG_BACKEND", "json")
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown catalog backend {backend!r} (expected one of {', '.join(BACKENDS)})")
+    return BACKENDS[backend]()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Synthetic - Deterministic stand-in data for the tests and benchmarks
+Shaped like the real catalog, sources and history, at any size
+"""
+
+import json
+import random
+from datetime import datetime, timedelta
+
+from catalog import TOOLS_FILE
+from history import ABSENT
+
+STATES = ("ACTIVE", "WATCHLIST", "GRAVEYARD")
+
+def synthetic_catalog(size, seed=11):
+    """Catalog plus sources shaped like the real data, with every branch exercised"""
+    rng = random.Random(seed)
+    today = datetime.now()
+    categories = ["coding", "automation", "agents", "productivity", "writing", "design", "research"]
+    pricings = ["Free", "Freemium", "$20/month", "$29/mo", "Enterprise", "Contact sales", "$99/mo", ""]
+    tags = ["hot", "trending", "new", "ai-native", "open-source", "api", "cli"]
+    tools, repos, stories, velocity = [], [], [], {}
+    for n in range(size):
+        days = rng.choice([0, 5, 20, 31, 45, 61, 90])
+        tool = {
+            "id": f"tool-{n}",
+            "name": f"Tool {n}",
+            "url": f"https://tool{n}.example.com",
+            "category": rng.choice(categories),
+            "description": rng.choice(["An AI assistant", "Join the waitlist", "Agents for teams"]),
+            "pricing": rng.choice(pricings),
+            "state": rng.choice(STATES),
+            "tags": rng.sample(tags, rng.randint(0, 3)),
+            "last_signal_date": rng.choice(["", (today - timedelta(days=days)).strftime("%Y-%m-%d")])
+        }
+        tools.append(tool)
+        if rng.random() < 0.5:
+            velocity[tool["id"]] = {"commits": rng.choice([0, 1, 4, 10, 11, 60]),
+                                    "stars_gained": rng.choice([-3, 0, 150, 2000, 2001, 9000]),
+                                    "hn_mentions": rng.choice([0, 2]),
+                                    "twitter_mentions": rng.choice([0, 1, 3, 4])}
+        if rng.random() < 0.4:
+            repos.append({
+                "name": f"tool-{n}",
+                "full_name": f"org/tool-{n}",
+                "stars": rng.choice([0, 500, 24999, 25000, 25001, 90000]),
+                "updated_at": (today - timedelta(days=rng.choice([1, 10, 40]))).strftime("%Y-%m-%dT%H:%M:%SZ")
+            })
+        if rng.random() < 0.3:
+            stories.append({"title": f"Show HN: {tool['name']}", "url": f"https://tool{n}.example.com/launch",
+                            "score": rng.choice([1, 120, 350, 351, 2000]),
+                            "time": int((today - timedelta(days=days)).timestamp())})
+    return tools, {"github": {"repos": repos}, "hackernews": {"stories": stories}}, velocity
+
+def synthetic_data(size, path=TOOLS_FILE):
+    """size tools cloned from the real catalog with unique ids and names"""
+    with open(path) as f:
+        real = json.load(f)
+    base = real.get("tools", [])
+    tools = []
+    for n in range(size):
+        tool = json.loads(json.dumps(base[n % len(base)]))
+        tool["id"] = f"{tool['id']}-{n}"
+        tool["name"] = f"{tool['name']} {n}"
+        tools.append(tool)
+    return {"tools": tools, "graveyard": real.get("graveyard", [])}
+
+def synthetic_rows(size, day, seed=0):
+    rng = random.Random(f"{seed}-{day}")
+    rows = []
+    for n in range(size):
+        activity = rng.randint(0, 1000) / 10
+        relevance = rng.randint(0, 1000) / 10
+        repo = rng.random() < 0.3
+        rows.append({
+            "id": f"tool-{n}", "state": rng.choice(STATES),
+            "activity": activity, "relevance": relevance, "combined": round((activity + relevance) / 2, 1),
+            "stars": rng.randint(0, 200000) if repo else ABSENT,
+            "forks": rng.randint(0, 20000) if repo else ABSENT,
+            "hn_score": rng.randint(1, 900) if rng.random() < 0.1 else ABSENT,
+        })
+    return rows
+
+def typed(text):
+    """Every prefix of `text`, as a query per keystroke"""
+    return [text[:n] for n in range(1, len(text) + 1)]
+
+def synthetic_queries(tools, vocabulary, seed=5):
+    """Search queries: a few typed out keystroke by keystroke, plus random one- and two-word prefixes"""
+    rng = random.Random(seed)
+    queries = typed("code review agent") + typed("ai image") + typed(tools[123 % len(tools)]["name"])
+    queries += [rng.choice(vocabulary)[:rng.randint(1, 6)] for _ in range(200)]
+    queries += [f"{rng.choice(vocabulary)[:3]} {rng.choice(vocabulary)[:3]}" for _ in range(100)]
+    return queries
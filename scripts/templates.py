@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Templates - Compile-once page templates that render as a stream of chunks
+Same placeholder syntax as str.format ({name}, {score:.0f}, {{ for a brace);
+a slot can take a stream of chunks, so pages never sit whole in memory
+"""
+
+from collections.abc import Iterator
+from pathlib import Path
+from string import Formatter
+
+from manifest import replace_if_changed
+
+WRITE_BUFFER = 1 << 16
+
+class Template:
+    """A template parsed once into literal text and named slots
+
+    render(**values) returns a small piece (a card) in one str.format call.
+    stream(**values) yields a large one (a section, the page) chunk by
+    chunk; a value that is an iterator of strings, such as a generator of
+    rendered cards, is streamed in its slot. Other values are formatted as
+    an f-string would.
+    """
+
+    __slots__ = ("source", "parts")
+
+    def __init__(self, source):
+        self.source = source
+        self.parts = []
+        for literal, field, spec, conversion in Formatter().parse(source):
+            if conversion:
+                raise ValueError(f"template field {{{field}!{conversion}}}: conversions aren't supported")
+            if field is not None and not field.isidentifier():
+                raise ValueError(f"template field {{{field}}}: use a plain name and pass the value in")
+            self.parts.append((literal, field, spec or ""))
+
+    def render(self, **values):
+        return self.source.format_map(values)
+
+    def stream(self, **values):
+        for literal, field, spec in self.parts:
+            if literal:
+                yield literal
+            if field is not None:
+                value = values[field]
+                if isinstance(value, Iterator):
+                    yield from value
+                else:
+                    yield format(value, spec)
+
+def write_stream(path, chunks, buffer_size=WRITE_BUFFER):
+    """Write chunks through a buffered file as they are produced; True if `path` changed
+
+    The page goes to a temporary file first and only replaces `path` if
+    its bytes differ, so an unchanged page keeps its file untouched.
+    """
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", buffering=buffer_size) as f:
+        f.writelines(chunks)
+    return replace_if_changed(tmp, path)
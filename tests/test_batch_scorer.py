@@ -0,0 +1,28 @@
+"""Batch scoring gives exactly scorer.score_tool's results"""
+
+import pytest
+
+pytest.importorskip("numpy")
+
+import scorer
+from batch_scorer import score_batch
+from catalog import Catalog
+from fuzzy_index import load_aliases
+from signal_index import SignalIndex
+from synthetic import synthetic_catalog
+
+def assert_parity(tools, sources, index, velocity):
+    batch = score_batch(tools, sources, index, velocity=velocity)
+    for tool, got in zip(tools, batch):
+        want = scorer.score_tool(tool, sources, index, velocity.get(tool["id"]))
+        assert got == want, tool["id"]
+        assert [type(v) for v in got] == [type(v) for v in want], tool["id"]
+
+def test_parity_on_synthetic_catalog():
+    tools, sources, velocity = synthetic_catalog(5000)
+    tools = Catalog.from_dict({"tools": tools}).tools
+    assert_parity(tools, sources, SignalIndex(tools, sources), velocity)
+
+def test_parity_on_real_catalog():
+    tools, sources = scorer.load_tools().tools, scorer.load_sources()
+    assert_parity(tools, sources, SignalIndex(tools, sources, load_aliases()), {})
@@ -0,0 +1,16 @@
+"""Catalog round-trips tools.json exactly"""
+
+import json
+
+from catalog import TOOLS_FILE, Catalog
+from synthetic import synthetic_data
+
+def test_tools_json_round_trips_byte_for_byte():
+    text = TOOLS_FILE.read_text()
+    assert json.dumps(Catalog.from_dict(json.loads(text)).to_dict(), indent=2) == text
+
+def test_synthetic_tools_round_trip():
+    data = synthetic_data(2000)
+    raw = json.dumps(data)
+    catalog = Catalog.from_dict(json.loads(raw))
+    assert [t.to_dict() for t in catalog.tools] == data["tools"]
@@ -0,0 +1,54 @@
+"""Fragments are reused while their inputs hold, re-rendered when they change, pruned when unused"""
+
+from types import SimpleNamespace
+
+from fragment_cache import FragmentCache, template_version
+
+def renderer(text):
+    """render() that counts its calls"""
+    def render():
+        render.calls += 1
+        return text
+    render.calls = 0
+    return render
+
+def rerun(tmp_path, version="v1"):
+    """The next run's cache for the same page"""
+    return FragmentCache("page", version, tmp_path)
+
+def test_unchanged_inputs_are_read_back(tmp_path):
+    rerun(tmp_path).fragment(("hero", ["cursor"]), renderer("<b>cursor</b>"))
+    cache = rerun(tmp_path)
+    render = renderer("<b>cursor</b>")
+    assert cache.fragment(("hero", ["cursor"]), render) == "<b>cursor</b>"
+    assert render.calls == 0
+    assert (cache.hits, cache.misses) == (1, 0)
+
+def test_changed_inputs_render_again(tmp_path):
+    rerun(tmp_path).fragment(("hero", ["cursor"]), renderer("<b>cursor</b>"))
+    cache = rerun(tmp_path)
+    render = renderer("<b>cursor</b><b>zed</b>")
+    assert cache.fragment(("hero", ["cursor", "zed"]), render) == "<b>cursor</b><b>zed</b>"
+    assert render.calls == 1
+    assert cache.hit_ratio == 0.0
+
+def test_template_edit_renders_again(tmp_path):
+    old = template_version(SimpleNamespace(source="<b>{{ name }}</b>"))
+    new = template_version(SimpleNamespace(source="<i>{{ name }}</i>"))
+    assert old != new
+    rerun(tmp_path, old).fragment(("hero", ["cursor"]), renderer("<b>cursor</b>"))
+    cache = rerun(tmp_path, new)
+    assert cache.fragment(("hero", ["cursor"]), renderer("<i>cursor</i>")) == "<i>cursor</i>"
+    assert cache.misses == 1
+
+def test_finish_prunes_fragments_this_run_did_not_use(tmp_path):
+    first = rerun(tmp_path)
+    first.fragment(("hero", ["cursor"]), renderer("a"))
+    first.fragment(("graveyard", ["copy-ai"]), renderer("b"))
+    first.finish()
+    assert len(list(first.dir.glob("*.html"))) == 2
+
+    second = rerun(tmp_path)
+    second.fragment(("hero", ["cursor"]), renderer("a"))
+    second.finish()
+    assert [p.stem for p in second.dir.glob("*.html")] == [second.key(("hero", ["cursor"]))]
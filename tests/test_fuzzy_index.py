@@ -0,0 +1,38 @@
+"""Repo names resolve to the right tool, and package repos for a product to none"""
+
+import pytest
+
+from catalog import Catalog
+from fuzzy_index import TrigramIndex, load_aliases, variants
+
+@pytest.fixture(scope="module")
+def index():
+    return TrigramIndex.from_tools(Catalog.load().tools, load_aliases())
+
+def resolved(index, name):
+    hit = index.resolve(name)
+    return hit and hit[0]
+
+@pytest.mark.parametrize("name, tool_id", [
+    ("reclaim-ai", "reclaim"),
+    ("Reclaim.ai", "reclaim"),
+    ("cursor-app", "cursor"),
+    ("v0-sdk", "v0"),         # Through aliases.json, not by trimming "sdk"
+    ("notion-ai", "notion-ai"),
+])
+def test_names_resolve(index, name, tool_id):
+    assert resolved(index, name) == tool_id
+
+@pytest.mark.parametrize("name", [
+    "notion-sdk-py",          # A client library for Notion, not Notion AI
+    "notion-client",
+    "notion-js",
+    "cursor-cli",
+    "reclaim-api",
+])
+def test_package_repos_do_not_resolve_to_the_product(index, name):
+    assert resolved(index, name) is None
+
+def test_only_brand_tokens_are_trimmed():
+    assert variants("Notion AI") == ["notionai", "notion"]
+    assert variants("notion-sdk-py") == ["notionsdkpy"]
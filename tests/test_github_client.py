@@ -0,0 +1,40 @@
+"""GitHubClient against the replay stand-in: Link pagination and batched GraphQL"""
+
+import pytest
+
+import github_client
+import replay
+from github_client import GitHubClient
+
+@pytest.fixture(scope="module")
+def server():
+    server = replay.StandInServer(replay.Dataset.synthetic(repos=250)).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def client(server):
+    client = GitHubClient(token="test", base_url=f"{server.base_url}/github")
+    yield client
+    client.close()
+
+def test_search_follows_link_next(server, client):
+    items = client.search_repositories("topic:ai", max_pages=5)
+    assert [r["full_name"] for r in items] == [r["full_name"] for r in server.repos()]
+    assert client.requests == 3     # 100 + 100 + 50, the last page has no rel="next"
+
+def test_search_stops_at_max_pages(client):
+    items = client.search_repositories("topic:ai", max_pages=2)
+    assert len(items) == 2 * github_client.SEARCH_PAGE_SIZE
+    assert client.requests == 2
+
+def test_repo_signals_batches_aliases(server, client):
+    names = [r["full_name"] for r in server.repos()][:github_client.GRAPHQL_BATCH * 2 + 7]
+    signals = client.repo_signals(names + names[:5])   # Duplicates are looked up once
+    assert client.requests == 3
+    assert list(signals) == names
+    repo = server.dataset.repos_by_name[names[-1]]
+    assert signals[names[-1]]["stars"] == repo["stargazers_count"]
+    assert signals[names[-1]]["forks"] == repo["forks_count"]
+    assert "commits_30d" in signals[names[-1]]
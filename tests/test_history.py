@@ -0,0 +1,48 @@
+"""HistoryStore gives back exactly the rows it recorded"""
+
+from datetime import date, timedelta
+
+import pytest
+
+from history import HistoryStore
+from synthetic import synthetic_rows
+
+TOOLS = 1000
+
+@pytest.fixture(scope="module")
+def recorded(tmp_path_factory):
+    workdir = tmp_path_factory.mktemp("history")
+    store = HistoryStore(workdir)
+    days = [str(date(2026, 1, 1) + timedelta(days=n)) for n in range(5)]
+    written = {}
+    for day in days:
+        written[day] = synthetic_rows(TOOLS, day)
+        store.record(day, written[day])
+    return workdir, days, written
+
+def test_snapshot_round_trips(recorded):
+    workdir, days, written = recorded
+    middle = days[len(days) // 2]
+    assert HistoryStore(workdir).snapshot(middle) == (middle, {row["id"]: row for row in written[middle]})
+
+def test_snapshot_falls_back_to_the_latest_earlier_day(recorded):
+    workdir, days, _ = recorded
+    later = str(date.fromisoformat(days[-1]) + timedelta(days=3))
+    assert HistoryStore(workdir).snapshot(later)[0] == days[-1]
+
+def test_series_for_one_tool(recorded):
+    workdir, days, written = recorded
+    tool_id = f"tool-{TOOLS * 2 // 3}"
+    want = [(day, next(r for r in written[day] if r["id"] == tool_id)) for day in days]
+    assert HistoryStore(workdir).series(tool_id) == want
+
+def test_recording_the_same_rows_again_leaves_the_segment_alone(tmp_path):
+    store = HistoryStore(tmp_path)
+    rows = synthetic_rows(50, "2026-03-01")
+    store.record("2026-03-01", rows)
+    segment = tmp_path / "2026-03-01.seg"
+    before = segment.stat()
+    store.record("2026-03-01", rows)
+    assert (segment.stat().st_ino, segment.stat().st_mtime_ns) == (before.st_ino, before.st_mtime_ns)
+    store.record("2026-03-01", synthetic_rows(50, "2026-03-01", seed=1))
+    assert segment.stat().st_ino != before.st_ino
@@ -0,0 +1,34 @@
+"""HNItemStore keeps listed stories and unranked ones for RETENTION_DAYS"""
+
+import time
+
+from hn_store import RETENTION_DAYS, HNItemStore
+
+def story(story_id, days_old, score=1):
+    return {"id": story_id, "title": f"AI story {story_id}", "score": score,
+            "time": int(time.time() - days_old * 86400)}
+
+def test_prune_keeps_listed_and_recent_stories(tmp_path):
+    store = HNItemStore(tmp_path / "hn_items.json")
+    store.add(story(1, RETENTION_DAYS + 5), keep=True)   # Old but still on a list
+    store.add(story(2, RETENTION_DAYS - 5), keep=True)   # Unranked, within retention
+    store.add(story(3, RETENTION_DAYS + 5), keep=True)   # Unranked and too old
+    store.add(story(4, 0), keep=False)
+    store.prune({1: ["topstories"]})
+    assert sorted(store.items) == [1, 2]
+    assert store.skipped == set()
+
+def test_stories_are_ranked_first_then_by_score(tmp_path):
+    store = HNItemStore(tmp_path / "hn_items.json")
+    for story_id, score in ((1, 10), (2, 50), (3, 30)):
+        store.add(story(story_id, 1, score), keep=True)
+    assert [s["id"] for s in store.stories({1: ["newstories"]})] == [1, 2, 3]
+
+def test_save_and_reload(tmp_path):
+    store = HNItemStore(tmp_path / "hn_items.json")
+    store.add(story(1, 1), keep=True)
+    store.add(story(2, 1), keep=False)
+    store.save()
+    reloaded = HNItemStore(store.path)
+    assert reloaded.items == store.items and reloaded.skipped == {2}
+    assert reloaded.unseen([1, 2, 3]) == [3]
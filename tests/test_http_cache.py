@@ -0,0 +1,22 @@
+"""ResponseCache validators: what a 304 refreshes"""
+
+from http_cache import ResponseCache
+
+KEY = "https://api.example.com/items"
+
+def test_304_updates_validators(tmp_path):
+    cache = ResponseCache(tmp_path)
+    cache.store(KEY, {"etag": '"a"', "last-modified": "Mon, 05 Oct 2026 10:00:00 GMT"}, b"[]")
+    cache.refresh(KEY, {"etag": '"b"', "last-modified": "Fri, 16 Oct 2026 10:00:00 GMT"})
+    entry, _ = cache.lookup(KEY)
+    assert cache.conditional_headers(entry) == {"If-None-Match": '"b"',
+                                                "If-Modified-Since": "Fri, 16 Oct 2026 10:00:00 GMT"}
+
+def test_304_without_validators_keeps_the_old_ones(tmp_path):
+    cache = ResponseCache(tmp_path)
+    cache.store(KEY, {"etag": '"a"', "last-modified": "Mon, 05 Oct 2026 10:00:00 GMT"}, b"[]")
+    cache.refresh(KEY, {"cache-control": "max-age=60"})
+    entry, _ = cache.lookup(KEY)
+    assert entry["etag"] == '"a"'
+    assert entry["last_modified"] == "Mon, 05 Oct 2026 10:00:00 GMT"
+    assert cache.is_fresh(entry)
@@ -0,0 +1,36 @@
+"""ConnectionPool bookkeeping across dropped keep-alive connections"""
+
+import http.server
+import threading
+
+import pytest
+
+from http_client import ConnectionPool
+
+class Closing(http.server.BaseHTTPRequestHandler):
+    """Answers every request with Connection: close"""
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def url():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Closing)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+def test_discarded_connections_leave_the_open_list(url):
+    pool = ConnectionPool()
+    for _ in range(20):
+        assert pool.request(url).status == 200
+    assert pool._open == []
+    pool.close()
@@ -0,0 +1,24 @@
+"""Stage inputs cover every module a stage runs"""
+
+from pathlib import Path
+
+from manifest import source_files
+
+SCRIPTS = Path(__file__).parent.parent / "scripts"
+
+def test_source_files_follow_local_imports(tmp_path):
+    (tmp_path / "stage.py").write_text("import json\nfrom helper import render\n")
+    (tmp_path / "helper.py").write_text("import os\nimport leaf\n")
+    (tmp_path / "leaf.py").write_text("")
+    (tmp_path / "unused.py").write_text("")
+    assert [p.name for p in source_files(tmp_path / "stage.py")] == ["helper.py", "leaf.py", "stage.py"]
+
+def test_generate_stage_inputs_include_its_imports():
+    names = {p.name for p in source_files(SCRIPTS / "generator_elite.py")}
+    assert {"generator_elite.py", "search_index.py", "templates.py", "fragment_cache.py",
+            "manifest.py", "storage.py", "catalog.py"} <= names
+
+def test_score_stage_inputs_include_its_imports():
+    names = {p.name for p in source_files(SCRIPTS / "scorer.py")}
+    assert {"scorer.py", "matcher.py", "signal_index.py", "fuzzy_index.py", "batch_scorer.py",
+            "score_state.py"} <= names
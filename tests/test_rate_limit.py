@@ -0,0 +1,51 @@
+"""Token buckets follow server hints only for their window, and waits can be cancelled"""
+
+import threading
+import time
+
+import pytest
+
+from rate_limit import RequestCancelled, RequestScheduler, TokenBucket
+
+URL = "http://api.example.com/items"
+
+def test_observed_rate_lasts_until_the_window_resets():
+    bucket = TokenBucket(10, 10)
+    bucket.observe(remaining=1, reset_in=2, retry_after=None)
+    assert bucket.rate == 0.5
+    now = time.monotonic()
+    bucket.wait_time(now + 1)
+    assert bucket.rate == 0.5
+    bucket.wait_time(now + 3)
+    assert bucket.rate == 10
+
+def test_observed_rate_never_exceeds_the_configured_one():
+    bucket = TokenBucket(1, 10)
+    bucket.observe(remaining=5000, reset_in=60, retry_after=None)
+    assert bucket.rate == 1
+
+def test_acquire_stops_waiting_when_cancelled():
+    scheduler = RequestScheduler({("api.example.com", "core"): (0.01, 1)})
+    scheduler.acquire(URL)   # Takes the only token; the next one is 100s away
+    cancel = threading.Event()
+    threading.Timer(0.2, cancel.set).start()
+    started = time.monotonic()
+    with pytest.raises(RequestCancelled):
+        scheduler.acquire(URL, cancel=cancel)
+    assert time.monotonic() - started < 1
+    assert scheduler.buckets[("api.example.com", "core")].waiting == []
+
+def test_waiters_on_one_bucket_go_in_priority_order():
+    scheduler = RequestScheduler({("api.example.com", "core"): (20, 1)})
+    scheduler.acquire(URL)
+    order = []
+    def request(priority):
+        scheduler.acquire(URL, priority)
+        order.append(priority)
+    threads = [threading.Thread(target=request, args=(p,)) for p in (2, 1, 0)]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.01)   # All queue up before the next token arrives at 50ms
+    for thread in threads:
+        thread.join()
+    assert order == [0, 1, 2]
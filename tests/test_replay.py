@@ -0,0 +1,35 @@
+"""Recording a tape leaves the repo's sources, catalog and meta.json alone"""
+
+import json
+
+import pytest
+
+import github_client
+import manifest
+import replay
+import scanner
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    """Stand-in for the repo's data files, with the scanner aimed at a local server"""
+    server = replay.StandInServer(replay.Dataset.synthetic(stories=50, repos=50), latency=0.0).start()
+    for module, name in [(scanner, "HN_API"), (scanner, "HN_SEARCH_API"), (github_client, "GITHUB_API")]:
+        monkeypatch.setattr(module, name, getattr(module, name))
+    server.point_scanner()
+    monkeypatch.setattr(scanner, "HN_STORY_LIMIT", 50)
+    monkeypatch.setattr(scanner, "SOURCES_DIR", tmp_path / "sources")
+    monkeypatch.setattr(scanner, "TOOLS_FILE", tmp_path / "tools.json")
+    monkeypatch.setattr(manifest, "META_FILE", tmp_path / "meta.json")
+    scanner.SOURCES_DIR.mkdir()
+    scanner.TOOLS_FILE.write_text(json.dumps({"tools": [], "graveyard": []}))
+    yield tmp_path
+    server.shutdown()
+    server.server_close()
+
+def test_record_writes_only_the_tape(repo):
+    before = set(repo.rglob("*"))
+    tape = replay.record(repo / "tape.json")
+    assert tape.entries
+    assert set(repo.rglob("*")) - before == {repo / "tape.json"}
+    assert scanner.SOURCES_DIR == repo / "sources"
+    assert manifest.META_FILE == repo / "meta.json"
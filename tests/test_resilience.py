@@ -0,0 +1,74 @@
+"""Retry backoff, Retry-After, bounded hedging and the per-host hedge limit"""
+
+import time
+from collections import deque
+
+import pytest
+
+import resilience
+from http_client import Response
+from resilience import Resilience
+
+URL = "http://api.example.com/items"
+
+@pytest.fixture(autouse=True)
+def quick_backoff(monkeypatch):
+    monkeypatch.setattr(resilience, "BACKOFF_BASE", 0.01)
+
+def responses(*statuses, headers=None):
+    """send() that answers with each status in turn"""
+    pending = list(statuses)
+    def send():
+        return Response(URL, pending.pop(0), dict(headers or {}), b"")
+    return send
+
+def warmed(policy, latency=0.01):
+    """Enough latency samples for the host that hedging kicks in at ~latency"""
+    for _ in range(resilience.HEDGE_MIN_SAMPLES):
+        policy._latencies.setdefault("api.example.com", deque()).append(latency)
+    return policy
+
+def test_retries_until_success():
+    policy = Resilience(hedge=False)
+    assert policy.call(URL, responses(503, 502, 200)).status == 200
+    assert policy.stats["retried"] == 2
+
+def test_429_waits_as_long_as_retry_after_asks():
+    policy = Resilience(hedge=False)
+    started = time.monotonic()
+    assert policy.call(URL, responses(429, 200, headers={"retry-after": "0.3"})).status == 200
+    assert time.monotonic() - started >= 0.3
+
+def test_retry_after_past_the_cap_gives_up():
+    policy = Resilience(hedge=False)
+    resp = policy.call(URL, responses(429, 200, headers={"retry-after": "3600"}))
+    assert resp.status == 429
+    assert policy.stats["retried"] == 0
+
+def test_hedge_wait_is_bounded_when_the_first_copy_fails():
+    policy = warmed(Resilience(max_retries=0))
+    calls = []
+    def send():
+        calls.append(None)
+        if len(calls) == 1:
+            time.sleep(0.05)
+            raise ConnectionResetError("reset")
+        time.sleep(5)   # The hedge hangs
+    started = time.monotonic()
+    with pytest.raises(ConnectionResetError):
+        policy.call(URL, send, timeout=0.3)
+    assert time.monotonic() - started < 1
+    policy.close()
+
+def test_hedges_are_limited_per_host():
+    def slow():
+        time.sleep(0.1)
+        return Response(URL, 200, {}, b"")
+    limited = warmed(Resilience(hedge_per_host=1))
+    assert limited.call(URL, slow).status == 200
+    assert limited.stats["hedged"] == 0     # The host's one slot is held by the first copy
+    unlimited = warmed(Resilience())
+    assert unlimited.call(URL, slow).status == 200
+    assert unlimited.stats["hedged"] == 1
+    limited.close()
+    unlimited.close()
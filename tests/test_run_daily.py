@@ -0,0 +1,18 @@
+"""What the daily pipeline hands PUBLISH when SCORE is skipped"""
+
+import json
+from types import SimpleNamespace
+
+import run_daily
+
+def test_skipped_score_reports_no_state_changes(tmp_path, monkeypatch):
+    scores = tmp_path / "scores.json"
+    scores.write_text(json.dumps({
+        "scores": [{"id": "cursor", "name": "Cursor", "combined": 87.0, "matched": {}}],
+        "state_changes": [{"name": "Cursor", "old_state": "WATCHLIST", "new_state": "ACTIVE", "score": 87.0}]
+    }))
+    monkeypatch.setattr(run_daily, "SCORES_FILE", scores)
+    ctx = SimpleNamespace(scores=None)
+    run_daily.scores_unchanged(ctx)
+    assert ctx.scores["scores"][0]["id"] == "cursor"
+    assert ctx.scores["state_changes"] == []
@@ -0,0 +1,52 @@
+"""run_scan falls back to last good data for failed and over-budget sources"""
+
+import json
+import threading
+
+import pytest
+
+import manifest
+import scanner
+
+@pytest.fixture
+def sources(tmp_path, monkeypatch):
+    monkeypatch.setattr(scanner, "SOURCES_DIR", tmp_path / "sources")
+    monkeypatch.setattr(manifest, "META_FILE", tmp_path / "meta.json")
+    monkeypatch.setattr(scanner, "SOURCES", {})
+    scanner.SOURCES_DIR.mkdir()
+    return scanner.SOURCES_DIR
+
+def write_last_good(sources, name, key, items):
+    (sources / f"{name}.json").write_text(json.dumps({key: items}))
+
+def test_failed_source_keeps_last_good_data(sources):
+    @scanner.register_source("down", "items", budget=5)
+    def fetch_down(**kwargs):
+        raise RuntimeError("HTTP 503")
+
+    @scanner.register_source("up", "items", budget=5)
+    def fetch_up(**kwargs):
+        return ["fresh"]
+
+    write_last_good(sources, "down", "items", ["yesterday"])
+    results = scanner.run_scan()
+    assert results["down"] == ["yesterday"]
+    assert results["up"] == ["fresh"]
+    assert results["stale"] == ["down"]
+    assert json.loads((sources / "down.json").read_text()) == {"items": ["yesterday"]}
+
+def test_over_budget_source_is_cancelled_and_joined(sources):
+    stopped = threading.Event()
+
+    @scanner.register_source("slow", "items", budget=0.2)
+    def fetch_slow(cancel=None, **kwargs):
+        while not cancel.wait(0.01):
+            pass
+        stopped.set()
+        raise RuntimeError("cancelled, over time budget")
+
+    write_last_good(sources, "slow", "items", ["yesterday"])
+    results = scanner.run_scan()
+    assert results["slow"] == ["yesterday"]
+    assert results["stale"] == ["slow"]
+    assert stopped.is_set()     # run_scan waited for the fetcher to wind down
@@ -0,0 +1,66 @@
+"""Incremental scoring: which tools ScoreState sends back through the scoring math"""
+
+from datetime import datetime, timedelta
+
+from batch_scorer import decay_points, recency_points
+from score_state import ScoreState, fingerprint
+
+CONFIG = "abc123"
+NOW = datetime(2026, 10, 17, 6)
+REPO = {"stars": 1200, "updated_at": "2026-10-12T09:00:00Z"}
+
+def scored_tool(days_inactive=10):
+    return {"id": "cursor", "name": "Cursor", "category": "coding", "state": "ACTIVE",
+            "pricing": "Free tier", "tags": ["hot"], "description": "AI-first code editor",
+            "last_signal_date": (NOW - timedelta(days=days_inactive)).strftime("%Y-%m-%d"),
+            "scores": {"activity": 80, "relevance": 70, "combined": 76}}
+
+def entry(tool, repo=REPO, config=CONFIG, now=NOW):
+    """What scorer.score_all_tools stores per tool"""
+    return [fingerprint(tool, repo, None, config),
+            recency_points(now)(repo["updated_at"]),
+            decay_points(now)(tool["last_signal_date"])]
+
+def saved_state(tmp_path, tool, **kwargs):
+    state = ScoreState(CONFIG, tmp_path / "score_state.json")
+    state.check(tool, entry(tool, **kwargs))
+    state.save({tool["id"]: entry(tool, **kwargs)})
+    return ScoreState(CONFIG, tmp_path / "score_state.json")
+
+def test_unchanged_tool_is_skipped(tmp_path):
+    tool = scored_tool()
+    state = saved_state(tmp_path, tool)
+    assert not state.check(tool, entry(tool))
+    assert state.stats["skipped"] == 1
+
+def test_new_signals_rescore(tmp_path):
+    tool = scored_tool()
+    state = saved_state(tmp_path, tool)
+    assert state.check(tool, entry(tool, repo=dict(REPO, stars=1500)))
+    assert state.stats["changed"] == 1
+
+def test_catalog_edit_rescores(tmp_path):
+    tool = scored_tool()
+    state = saved_state(tmp_path, tool)
+    tool["pricing"] = "$20/month"
+    assert state.check(tool, entry(tool))
+    assert state.stats["changed"] == 1
+
+def test_new_scoring_config_rescores_everything(tmp_path):
+    tool = scored_tool()
+    saved_state(tmp_path, tool)
+    state = ScoreState("def456", tmp_path / "score_state.json")
+    assert state.check(tool, entry(tool, config="def456"))
+    assert state.stats["new"] == 1
+
+def test_crossing_a_decay_bucket_rescores(tmp_path):
+    tool = scored_tool(days_inactive=30)   # 0 decay today, 25 tomorrow
+    state = saved_state(tmp_path, tool)
+    tomorrow = NOW + timedelta(days=1)
+    assert state.check(tool, entry(tool, now=tomorrow))
+    assert state.stats["decayed"] == 1
+
+def test_a_day_inside_the_same_buckets_skips(tmp_path):
+    tool = scored_tool(days_inactive=10)
+    state = saved_state(tmp_path, tool)
+    assert not state.check(tool, entry(tool, now=NOW + timedelta(days=1)))
@@ -0,0 +1,54 @@
+"""score_all_tools writes the same files on one worker, many, or without fork"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import parallel
+from synthetic import synthetic_catalog
+
+SCRIPTS = Path(__file__).parent.parent / "scripts"
+
+@pytest.fixture(scope="module")
+def catalog():
+    tools, sources, _ = synthetic_catalog(600)
+    return tools, sources
+
+def score(root, catalog, workers, fork=True):
+    """Score `catalog` in a scratch copy of the repo; every file it leaves under data/, by path"""
+    shutil.copytree(SCRIPTS, root / "scripts", ignore=shutil.ignore_patterns("__pycache__"))
+    data = root / "data"
+    (data / "sources").mkdir(parents=True)
+    tools, sources = catalog
+    (data / "tools.json").write_text(json.dumps({"tools": tools, "graveyard": []}))
+    for name, payload in sources.items():
+        (data / "sources" / f"{name}.json").write_text(json.dumps(payload))
+    code = (f"import parallel, scorer\n"
+            f"parallel.can_fork = lambda: {fork}\n"
+            f"scorer.score_all_tools(workers={workers})\n")
+    env = {k: v for k, v in os.environ.items() if k != "CATALOG_BACKEND"}
+    run = subprocess.run([sys.executable, "-c", code], cwd=root / "scripts", env=env,
+                         check=True, capture_output=True, text=True)
+    files = {str(p.relative_to(data)): p.read_bytes() for p in sorted(data.rglob("*")) if p.is_file()}
+    return files, run.stdout
+
+@pytest.mark.skipif(not parallel.can_fork(), reason="needs the fork start method")
+def test_workers_match_a_serial_run(tmp_path, catalog):
+    serial, _ = score(tmp_path / "serial", catalog, workers=1)
+    forked, out = score(tmp_path / "forked", catalog, workers=4)
+    assert "Using 4 worker processes" in out
+    assert {"scores.json", "tools.json", "signals.jsonl", "signals_index.json"} <= set(serial)
+    assert serial.keys() == forked.keys()
+    for path in serial:
+        assert forked[path] == serial[path], path
+
+def test_without_fork_scoring_runs_serially(tmp_path, catalog):
+    serial, _ = score(tmp_path / "serial", catalog, workers=1)
+    fallback, out = score(tmp_path / "fallback", catalog, workers=4, fork=False)
+    assert "worker processes" not in out
+    assert fallback == serial
@@ -0,0 +1,62 @@
+"""Index search, in Python and in the page's worker, agrees with a scan of every tool"""
+
+import json
+import shutil
+import subprocess
+
+import pytest
+
+from generator_elite import CATEGORIES
+from search_index import MAX_TERMS, SEARCH_WORKER, build_index, search, tool_words, words, write_search_index
+from synthetic import synthetic_data, synthetic_queries
+
+# Loads the worker source outside a browser and prints the ids each query matches
+NODE_HARNESS = """
+const fs = require('fs');
+const [src, indexPath, queriesPath] = process.argv.slice(2);
+const worker = new Function('fetch', 'postMessage', fs.readFileSync(src, 'utf8') + '\\nreturn { load, match, ids: () => ids };')();
+worker.load(JSON.parse(fs.readFileSync(indexPath, 'utf8')));
+const queries = JSON.parse(fs.readFileSync(queriesPath, 'utf8'));
+console.log(JSON.stringify(queries.map(q => { const docs = worker.match(q); return docs && docs.map(d => worker.ids()[d]); })));
+"""
+
+@pytest.fixture(scope="module")
+def catalog():
+    tools = synthetic_data(2000)["tools"]
+    index = build_index(tools, CATEGORIES)
+    return tools, index, synthetic_queries(tools, index["words"])
+
+def test_search_matches_a_full_scan(catalog):
+    tools, index, queries = catalog
+    docs = [set(tool_words(tool, CATEGORIES)) for tool in tools]
+    for query in queries:
+        terms = words(query)[:MAX_TERMS]
+        # Every query word must be a prefix of some word of the tool
+        want = [t["id"] for t, ws in zip(tools, docs) if all(any(w.startswith(q) for w in ws) for q in terms)]
+        assert search(index, query) == want, query
+
+def test_query_without_words_returns_none(catalog):
+    assert search(catalog[1], " -- ") is None
+
+def test_each_generator_keeps_its_own_index(catalog, tmp_path):
+    tools = catalog[0]
+    elite = write_search_index(tools[:10], CATEGORIES, tmp_path)
+    basic = write_search_index(tools[10:20], CATEGORIES, tmp_path, stem="search-basic")
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(p.split("/")[-1] for p in (elite, basic))
+    # A new version replaces only the index with the same stem
+    write_search_index(tools[:11], CATEGORIES, tmp_path)
+    assert (tmp_path / basic.split("/")[-1]).exists()
+    assert not (tmp_path / elite.split("/")[-1]).exists()
+
+def test_worker_agrees_with_search(catalog, tmp_path):
+    node = shutil.which("node")
+    if node is None:
+        pytest.skip("node not installed")
+    _, index, queries = catalog
+    (tmp_path / "worker.js").write_text(SEARCH_WORKER)
+    (tmp_path / "index.json").write_text(json.dumps(index))
+    (tmp_path / "queries.json").write_text(json.dumps(queries))
+    (tmp_path / "harness.js").write_text(NODE_HARNESS)
+    result = subprocess.run([node, tmp_path / "harness.js", tmp_path / "worker.js", tmp_path / "index.json",
+                             tmp_path / "queries.json"], capture_output=True, text=True, check=True)
+    assert json.loads(result.stdout) == [search(index, q) for q in queries]
@@ -0,0 +1,54 @@
+"""The ledger's index keeps exact counts through compaction and rebuilds from the ledger"""
+
+import random
+import shutil
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from signal_ledger import RETENTION_DAYS, SignalLedger
+
+SOURCES = ["github", "hackernews", "producthunt", "twitter"]
+
+@pytest.fixture(scope="module")
+def ledger_run(tmp_path_factory):
+    """A year of daily runs over 500 tools, long enough to compact"""
+    workdir = tmp_path_factory.mktemp("ledger")
+    path, index_path = workdir / "signals.jsonl", workdir / "signals_index.json"
+    rng = random.Random(3)
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    want = {}
+    for n in range(RETENTION_DAYS * 2):
+        now = start + timedelta(days=n)
+        ledger = SignalLedger(path, index_path)   # Reopened every day, as the scorer does
+        for tool in rng.sample(range(500), 25):
+            tool_id, source = f"tool-{tool}", rng.choice(SOURCES)
+            at = (now - timedelta(hours=rng.randint(0, 48))).strftime("%Y-%m-%dT%H:%M:%SZ")
+            if ledger.record(tool_id, source, at):
+                counts = want.setdefault(tool_id, {})
+                counts[source] = counts.get(source, 0) + 1
+        ledger.flush(now)
+    return path, index_path, want
+
+def test_counts_survive_compaction(ledger_run):
+    path, index_path, want = ledger_run
+    ledger = SignalLedger(path, index_path)
+    assert len(path.read_text().splitlines()) < sum(sum(c.values()) for c in want.values())
+    assert {tool_id: ledger.counts(tool_id) for tool_id in want} == want
+
+def test_index_rebuilds_from_ledger(ledger_run, tmp_path):
+    path = shutil.copy(ledger_run[0], tmp_path)
+    ledger = SignalLedger(ledger_run[0], ledger_run[1])
+    assert SignalLedger(path, tmp_path / "signals_index.json").tools == ledger.tools
+
+def test_flush_without_new_signals_leaves_the_index_alone(tmp_path):
+    path, index_path = tmp_path / "signals.jsonl", tmp_path / "signals_index.json"
+    now = datetime(2026, 10, 17, tzinfo=timezone.utc)
+    ledger = SignalLedger(path, index_path)
+    ledger.record("cursor", "github", "2026-10-16T09:00:00Z")
+    ledger.flush(now)
+    before = index_path.stat()
+    ledger = SignalLedger(path, index_path)
+    assert not ledger.record("cursor", "github", "2026-10-16T09:00:00Z")
+    ledger.flush(now)
+    assert (index_path.stat().st_ino, index_path.stat().st_mtime_ns) == (before.st_ino, before.st_mtime_ns)
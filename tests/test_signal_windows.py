@@ -0,0 +1,44 @@
+"""Rolling windows agree with a brute-force sum over the daily counts"""
+
+import random
+from datetime import date
+
+import pytest
+
+from signal_windows import SignalWindows
+
+@pytest.fixture
+def recorded(tmp_path):
+    rng = random.Random(7)
+    windows = SignalWindows(tmp_path / "signal_windows.json")
+    daily = {f"tool-{n}": [] for n in range(20)}
+    start = date(2026, 1, 1).toordinal()
+    for n in range(120):
+        windows.advance(date.fromordinal(start + n + (n // 30)))   # Skip a day every month
+        for tool_id, counts in daily.items():
+            commits = rng.randint(0, 5)
+            windows.set_count(tool_id, "commits", commits)
+            counts.append((windows.day, commits))
+    return windows, daily
+
+def assert_windows(windows, daily):
+    for days in (1, 7, 30, 90):
+        for tool_id, counts in daily.items():
+            want = sum(c for d, c in counts if d > windows.day - days)
+            assert windows.window(tool_id, "commits", days) == want, (tool_id, days)
+
+def test_windows_match_brute_force(recorded):
+    assert_windows(*recorded)
+
+def test_windows_survive_save_and_reload(recorded):
+    windows, daily = recorded
+    windows.save()
+    assert_windows(SignalWindows(windows.path), daily)
+
+def test_event_seen_on_several_days_counts_once(tmp_path):
+    windows = SignalWindows(tmp_path / "signal_windows.json")
+    story = {"id": 1, "title": "Show HN: Tool"}
+    for day in (1, 2, 3):
+        windows.advance(date(2026, 3, day))
+        windows.set_events("tool", "hn_mentions", [story])
+    assert windows.window("tool", "hn_mentions", 7) == 1
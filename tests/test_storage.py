@@ -0,0 +1,42 @@
+"""The SQLite backend stores the catalog exactly as tools.json does"""
+
+import pytest
+
+from catalog import TOOLS_FILE
+from storage import JsonStorage, SQLiteStorage
+
+@pytest.fixture
+def tools_file(tmp_path):
+    path = tmp_path / "tools.json"
+    path.write_text(TOOLS_FILE.read_text())
+    return path
+
+@pytest.fixture
+def db(tmp_path, tools_file):
+    db = SQLiteStorage(tmp_path / "catalog.db", tools_file)
+    db.save(db.load())
+    yield db
+    db.close()
+
+def test_import_export_is_byte_identical(db, tools_file):
+    assert tools_file.read_text() == TOOLS_FILE.read_text()
+
+def test_database_round_trip(db, tmp_path, tools_file):
+    # A second instance reads from the database, not the JSON
+    reopened = SQLiteStorage(tmp_path / "catalog.db", tools_file)
+    assert reopened.load().to_json() == TOOLS_FILE.read_text()
+    reopened.close()
+
+def test_queries_agree_across_backends(db, tools_file):
+    json_storage = JsonStorage(tools_file)
+    for category in [None] + sorted({t.get("category") for t in db.load().tools}):
+        assert [t["id"] for t in db.active(category)] == [t["id"] for t in json_storage.active(category)]
+
+def test_upsert_of_one_tool_is_exported(db, tools_file):
+    catalog = db.load()
+    tool = next(t for t in reversed(catalog.tools) if t.get("state") != "GRAVEYARD")
+    tool["scores"] = dict(tool["scores"], combined=99.9)
+    db.save(catalog, changed=[tool])
+    assert db.active()[0]["id"] == tool["id"]
+    exported = {t["id"]: t for t in JsonStorage(tools_file).load().tools}
+    assert exported[tool["id"]]["scores"]["combined"] == 99.9